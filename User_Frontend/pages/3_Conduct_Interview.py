@@ -7,6 +7,7 @@ import json
 from datetime import datetime
 from pathlib import Path   # FIXED
 import os
+import time
 
 st.set_page_config(page_title="Conduct Interview", page_icon="🎙️")
 
@@ -73,6 +74,29 @@ def post_json(url: str, payload: dict, timeout: int = 25):
         raise RuntimeError(str(e))
 
 
+def run_evaluation_job(url: str, poll_every: float = 1.0, max_wait: int = 600):
+    """Start evaluate-all as a background job and poll it until done, showing progress."""
+    job = post_json(url, {})
+    if "job_id" not in job:
+        return job  # backend answered inline
+
+    status_url = f"{BACKEND_HOST}/api/jobs/{job['job_id']}"
+    progress = st.progress(0.0, text="Scoring answers...")
+    waited = 0.0
+    while waited < max_wait:
+        resp = requests.get(status_url, timeout=10)
+        resp.raise_for_status()
+        job = resp.json()
+        progress.progress(min(1.0, job.get("progress", 0.0)), text=f"Scored {job.get('done', 0)} / {job.get('total', 0)} answers")
+        if job.get("status") == "completed":
+            return {"evaluations": job.get("results", [])}
+        if job.get("status") == "failed":
+            raise RuntimeError(job.get("error") or "evaluation job failed")
+        time.sleep(poll_every)
+        waited += poll_every
+    raise RuntimeError("Evaluation is taking too long; please try again shortly.")
+
+
 def save_answer_to_backend(session_id: str, question_text: str, answer_text: str):
     """Save raw answer."""
     url = f"{BACKEND_HOST}/api/sessions/{session_id}/save-answer"
@@ -172,10 +196,10 @@ else:
     # -------------------------------------------
     if st.button("🎯 Evaluate My Answers"):
         session_id = st.session_state.session_id
-        eval_url = f"{BACKEND_HOST}/api/sessions/{session_id}/evaluate-all"
+        eval_url = f"{BACKEND_HOST}/api/sessions/{session_id}/evaluate-all?background=true"
         with st.spinner("Evaluating your answers..."):
             try:
-                data = post_json(eval_url, {})
+                data = run_evaluation_job(eval_url)
             except Exception as e:
                 st.error(f"Evaluation failed: {e}")
                 st.stop()
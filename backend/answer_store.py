@@ -0,0 +1,420 @@
+"""
+Answers and evaluations of a session, stored as rows (sql_models.Answer / Evaluation).
+
+Saving an answer is one INSERT and scoring it one more, instead of rewriting the
+session's whole interview_results JSON list each time. Rows are converted to and
+from the same entry dicts the API has always returned (see session_entries).
+
+Every write also bumps InterviewSession.results_revision, which invalidates the
+materialized results report, and keeps the session's summary columns
+(answer_count, evaluated_count, score_sum, average_score) in step. Nothing here commits: callers commit, so a batch
+of writes (e.g. a chunk of evaluate-all) lands in one transaction.
+
+Writes are safe against concurrent writers on the same session without
+locking it: answers are plain appends, an answer's evaluation is inserted
+with ON CONFLICT DO NOTHING on its unique answer_id (the first scorer wins,
+later ones get the stored result back), and state changes are conditional
+updates. Only the revision counter and the summary touch the session row, as
+SQL-side increments.
+
+migrate_legacy_results() moves the entries of sessions saved before these
+tables existed out of interview_results, once, at startup.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import case, exists, func, insert, null, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import session_entries
+from feedback import normalize
+from session_entries import STATE_EVALUATED, STATE_FAILED, STATE_PENDING
+from sql_models import Answer, Evaluation, InterviewSession
+
+LOG = logging.getLogger("answer_store")
+
+
+def bump_revision(db: Session, session_ids: Iterable[int]) -> None:
+    ids = list(set(session_ids))
+    if ids:
+        # SQL-side increment, so concurrent writers never hand out the same revision
+        db.execute(
+            update(InterviewSession)
+            .where(InterviewSession.id.in_(ids))
+            .values(results_revision=InterviewSession.results_revision + 1)
+        )
+
+
+def update_summary(db: Session, session_id: int, answers: int = 0, evaluations: int = 0, score: float = 0.0) -> None:
+    """
+    Bump the revision and add these deltas to the session's summary columns, SQL-side.
+    Sessions that predate the columns hold NULLs, which stay NULL here until
+    backfill_session_summaries computes them from the rows.
+    """
+    S = InterviewSession
+    values = {S.results_revision: S.results_revision + 1}
+    if answers:
+        values[S.answer_count] = S.answer_count + answers
+    if evaluations or score:
+        evaluated = S.evaluated_count + evaluations
+        total = S.score_sum + score
+        values[S.evaluated_count] = evaluated
+        values[S.score_sum] = total
+        # Right-hand columns are the values before this update
+        values[S.average_score] = case((evaluated > 0, total / evaluated), else_=None)
+    db.execute(update(S).where(S.id == session_id).values(values))
+
+
+def _evaluation_values(session_id: int, entry: Dict, answer_id: Optional[int] = None) -> Dict:
+    return {
+        "session_id": session_id,
+        "answer_id": answer_id,
+        "question": entry.get("question", ""),
+        "engine_version": entry.get("engine_version"),
+        "score": normalize(entry.get("score", 0)),
+        "data": entry,
+    }
+
+
+def _new_evaluation(session_id: int, entry: Dict, answer_id: Optional[int] = None) -> Evaluation:
+    return Evaluation(**_evaluation_values(session_id, entry, answer_id))
+
+
+_UPSERT_DIALECTS = {"sqlite": sqlite, "postgresql": postgresql}
+
+
+def _insert_evaluation_once(db: Session, values: Dict) -> bool:
+    """Insert an answer's evaluation unless it already has one; True if this call inserted it."""
+    dialect = _UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    if dialect is not None:
+        stmt = dialect.insert(Evaluation).values(**values).on_conflict_do_nothing(index_elements=["answer_id"])
+        return db.execute(stmt).rowcount == 1
+    # Other backends: let the unique constraint decide, inside a savepoint
+    try:
+        with db.begin_nested():
+            db.execute(insert(Evaluation).values(**values))
+        return True
+    except IntegrityError:
+        return False
+
+
+# -----------------------------
+# Writes
+# -----------------------------
+def add_answer(db: Session, session_id: int, question: str, answer: str) -> Dict:
+    """Append a pending raw answer; returns its entry."""
+    entry = session_entries.new_raw_entry(question, answer)
+    db.add(Answer(
+        entry_id=entry["id"],
+        session_id=session_id,
+        question=entry["question"],
+        answer=entry["answer"],
+        state=entry["state"],
+        timestamp=entry["timestamp"],
+    ))
+    update_summary(db, session_id, answers=1)
+    return entry
+
+
+def add_evaluation(db: Session, session_id: int, entry: Dict) -> Dict:
+    """Append an evaluation that belongs to no saved answer (evaluate-answer)."""
+    evaluation = _new_evaluation(session_id, entry)
+    db.add(evaluation)
+    update_summary(db, session_id, evaluations=1, score=evaluation.score)
+    return entry
+
+
+def record_evaluations(db: Session, session_id: int, entries: Iterable[Dict]) -> List[Dict]:
+    """
+    Store evaluated entries and mark their answers evaluated. An answer that was
+    already evaluated meanwhile (eager scoring, another worker) keeps its
+    existing result. Returns the evaluation now on record for each entry.
+    """
+    entries = list(entries)
+    if not entries:
+        return []
+    rows = (
+        db.query(Answer, Evaluation)
+        .outerjoin(Evaluation, Evaluation.answer_id == Answer.id)
+        .filter(Answer.session_id == session_id, Answer.entry_id.in_([e.get("raw_id") for e in entries]))
+        .all()
+    )
+    by_entry_id = {answer.entry_id: (answer, evaluation) for answer, evaluation in rows}
+
+    recorded = []
+    inserted = []
+    added, added_score = 0, 0.0
+    for entry in entries:
+        answer, existing = by_entry_id.get(entry.get("raw_id"), (None, None))
+        if existing is not None:
+            recorded.append(existing.to_entry())
+            continue
+        values = _evaluation_values(session_id, entry, answer.id if answer is not None else None)
+        if answer is None:
+            db.add(Evaluation(**values))
+        elif _insert_evaluation_once(db, values):
+            inserted.append(answer.id)
+        else:
+            # Lost the race to a concurrent scorer: report the result on record
+            recorded.append(db.query(Evaluation).filter(Evaluation.answer_id == answer.id).one().to_entry())
+            continue
+        added += 1
+        added_score += values["score"]
+        recorded.append(entry)
+    if inserted:
+        db.query(Answer).filter(Answer.id.in_(inserted)).update(
+            {Answer.state: STATE_EVALUATED, Answer.error: None}, synchronize_session=False
+        )
+    update_summary(db, session_id, evaluations=added, score=added_score)
+    return recorded
+
+
+def record_failures(db: Session, session_id: int, errors: Dict[str, str]) -> List[Dict]:
+    """Mark answers failed (unless already evaluated). Returns a summary per failed answer."""
+    if not errors:
+        return []
+    rows = (
+        db.query(Answer.id, Answer.entry_id, Answer.question)
+        .filter(Answer.session_id == session_id, Answer.entry_id.in_(list(errors)))
+        .order_by(Answer.id)
+        .all()
+    )
+    failed = []
+    for answer_id, entry_id, question in rows:
+        # Conditional, so an evaluation that a concurrent scorer committed meanwhile wins
+        marked = db.execute(
+            update(Answer)
+            .where(Answer.id == answer_id, ~exists().where(Evaluation.answer_id == answer_id))
+            .values(state=STATE_FAILED, error=errors[entry_id])
+        ).rowcount
+        if marked:
+            failed.append({"raw_id": entry_id, "question": question, "error": errors[entry_id]})
+    if failed:
+        bump_revision(db, [session_id])
+    return failed
+
+
+def reset_for_reevaluation(db: Session, session_id: int, entry_ids: Iterable[str]) -> None:
+    """Drop the evaluations of these answers and mark them pending again."""
+    ids = list(set(entry_ids))
+    if not ids:
+        return
+    answer_ids = [
+        row.id for row in
+        db.query(Answer.id).filter(Answer.session_id == session_id, Answer.entry_id.in_(ids))
+    ]
+    dropped = db.query(Evaluation.score).filter(Evaluation.answer_id.in_(answer_ids)).all()
+    db.query(Evaluation).filter(Evaluation.answer_id.in_(answer_ids)).delete(synchronize_session=False)
+    db.query(Answer).filter(Answer.id.in_(answer_ids)).update(
+        {Answer.state: STATE_PENDING, Answer.error: None}, synchronize_session=False
+    )
+    update_summary(db, session_id, evaluations=-len(dropped), score=-sum(score or 0.0 for (score,) in dropped))
+
+
+# -----------------------------
+# Reads
+# -----------------------------
+def get_answer(db: Session, session_id: int, entry_id: str) -> Optional[Dict]:
+    answer = db.query(Answer).filter(Answer.session_id == session_id, Answer.entry_id == entry_id).first()
+    return answer.to_entry() if answer is not None else None
+
+
+def count_answers(db: Session, session_id: int) -> int:
+    return db.query(Answer).filter(Answer.session_id == session_id).count()
+
+
+def pending_answers(db: Session, session_id: int) -> List[Dict]:
+    """Answers with no evaluation (pending or failed), in the order they were saved."""
+    return pending_answers_by_session(db, [session_id]).get(session_id, [])
+
+
+def pending_answers_by_session(db: Session, session_ids: List[int]) -> Dict[int, List[Dict]]:
+    rows = (
+        db.query(Answer)
+        .outerjoin(Evaluation, Evaluation.answer_id == Answer.id)
+        .filter(Answer.session_id.in_(session_ids), Evaluation.id.is_(None))
+        .order_by(Answer.session_id, Answer.id)
+        .all()
+    )
+    pending: Dict[int, List[Dict]] = {}
+    for answer in rows:
+        pending.setdefault(answer.session_id, []).append(answer.to_entry())
+    return pending
+
+
+def collected_evaluations(db: Session, session_id: int) -> List[Dict]:
+    """Evaluations that already exist for the saved answers, in answer order."""
+    rows = (
+        db.query(Evaluation)
+        .join(Answer, Evaluation.answer_id == Answer.id)
+        .filter(Answer.session_id == session_id)
+        .order_by(Answer.id)
+        .all()
+    )
+    return [evaluation.to_entry() for evaluation in rows]
+
+
+def count_collected_by_session(db: Session, session_ids: List[int]) -> Dict[int, int]:
+    rows = (
+        db.query(Evaluation.session_id, func.count(Evaluation.id))
+        .filter(Evaluation.session_id.in_(session_ids), Evaluation.answer_id.isnot(None))
+        .group_by(Evaluation.session_id)
+        .all()
+    )
+    return dict(rows)
+
+
+def evaluations(db: Session, session_id: int) -> List[Dict]:
+    """Every evaluation of the session (linked or not), oldest first."""
+    rows = db.query(Evaluation).filter(Evaluation.session_id == session_id).order_by(Evaluation.id).all()
+    return [evaluation.to_entry() for evaluation in rows]
+
+
+def stale_answers(db: Session, session_id: int, engine_version: str) -> List[Dict]:
+    """Answers whose evaluation was produced by a different engine version."""
+    rows = (
+        db.query(Answer)
+        .join(Evaluation, Evaluation.answer_id == Answer.id)
+        .filter(
+            Answer.session_id == session_id,
+            (Evaluation.engine_version.is_(None)) | (Evaluation.engine_version != engine_version),
+        )
+        .order_by(Answer.id)
+        .all()
+    )
+    return [answer.to_entry() for answer in rows]
+
+
+def all_answers(db: Session, session_id: int) -> List[Dict]:
+    rows = db.query(Answer).filter(Answer.session_id == session_id).order_by(Answer.id).all()
+    return [answer.to_entry() for answer in rows]
+
+
+def answered_questions(db: Session, session_id: int) -> Set[str]:
+    """Question texts the session already has an answer or an evaluation for."""
+    answered = {q for (q,) in db.query(Answer.question).filter(Answer.session_id == session_id)}
+    answered |= {q for (q,) in db.query(Evaluation.question).filter(Evaluation.session_id == session_id)}
+    return {q.strip() for q in answered if q}
+
+
+# -----------------------------
+# Migration from interview_results
+# -----------------------------
+def _migrate_session(db: Session, session_id: int, results: List) -> int:
+    """Insert one session's legacy entries as rows; returns the duplicate evaluations dropped."""
+    results = [r for r in results if isinstance(r, dict)]
+    dropped = session_entries.drop_duplicate_evaluations(results)
+    session_entries.adopt_legacy_entries(results)
+
+    answers = {}
+    for raw in session_entries.raw_entries(results):
+        answer = Answer(
+            entry_id=raw["id"],
+            session_id=session_id,
+            question=raw.get("question") or "",
+            answer=raw.get("answer") or "",
+            state=raw.get("state") or STATE_PENDING,
+            error=raw.get("error"),
+            timestamp=raw.get("timestamp"),
+        )
+        db.add(answer)
+        answers[raw["id"]] = answer
+    db.flush()
+
+    linked = set()
+    evaluations = []
+    for entry in results:
+        if entry.get("type") != "evaluated":
+            continue
+        answer = answers.get(entry.get("raw_id"))
+        answer_id = None
+        if answer is not None and answer.id not in linked:
+            answer_id = answer.id
+            linked.add(answer_id)
+        evaluations.append(_new_evaluation(session_id, entry, answer_id))
+    db.add_all(evaluations)
+    update_summary(
+        db, session_id,
+        answers=len(answers),
+        evaluations=len(evaluations),
+        score=sum(evaluation.score for evaluation in evaluations),
+    )
+    return dropped
+
+
+def migrate_legacy_results(session_factory) -> int:
+    """
+    Move entries still in InterviewSession.interview_results into the answers /
+    evaluations tables and clear the column. Each session is claimed by
+    clearing its column in the same transaction that inserts its rows, so
+    several workers starting at once migrate every session exactly once.
+    Repeated evaluations of one answer, left by an old evaluate-all bug, are
+    dropped on the way (see session_entries.drop_duplicate_evaluations).
+    Returns the number of sessions migrated.
+    """
+    db = session_factory()
+    migrated = dropped = 0
+    try:
+        ids = [row.id for row in db.query(InterviewSession.id).filter(InterviewSession.interview_results.isnot(None))]
+        for session_id in ids:
+            try:
+                results = db.query(InterviewSession.interview_results).filter(InterviewSession.id == session_id).scalar()
+                claimed = db.execute(
+                    update(InterviewSession)
+                    .where(InterviewSession.id == session_id, InterviewSession.interview_results.isnot(None))
+                    .values(interview_results=null())
+                ).rowcount
+                if not claimed:
+                    db.rollback()
+                    continue
+                duplicates = _migrate_session(db, session_id, results) if results else 0
+                db.commit()
+                migrated += 1
+                dropped += duplicates
+            except Exception as e:
+                db.rollback()
+                LOG.exception("Migrating the answers of session %s failed: %s", session_id, e)
+    finally:
+        db.close()
+    if migrated:
+        LOG.info("Moved the answers of %d session(s) from interview_results to the answers table.", migrated)
+    if dropped:
+        LOG.info("Dropped %d duplicate legacy evaluation(s), keeping the latest per answer.", dropped)
+    return migrated
+
+
+def backfill_session_summaries(session_factory) -> int:
+    """
+    Compute the summary columns of sessions that predate them (answer_count IS
+    NULL) from their answers and evaluations, in one UPDATE. Safe to run from
+    every worker at startup; returns the number of sessions filled in.
+    """
+    S = InterviewSession
+    evaluations_of = Evaluation.session_id == S.id
+    stmt = (
+        update(S)
+        .where(S.answer_count.is_(None))
+        .values(
+            answer_count=select(func.count(Answer.id)).where(Answer.session_id == S.id).scalar_subquery(),
+            evaluated_count=select(func.count(Evaluation.id)).where(evaluations_of).scalar_subquery(),
+            score_sum=select(func.coalesce(func.sum(Evaluation.score), 0.0)).where(evaluations_of).scalar_subquery(),
+            average_score=select(func.avg(Evaluation.score)).where(evaluations_of).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db = session_factory()
+    try:
+        filled = db.execute(stmt).rowcount
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        LOG.exception("Backfilling session summaries failed: %s", e)
+        return 0
+    finally:
+        db.close()
+    if filled:
+        LOG.info("Filled in the summary columns of %d session(s).", filled)
+    return filled
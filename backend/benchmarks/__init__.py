@@ -0,0 +1,10 @@
+"""
+Performance / quality benchmarks for the backend.
+
+Run from the backend directory so the flat module imports resolve, e.g.:
+
+    python -m benchmarks.evaluation        # latency, RSS and correlation with human scores
+    python -m benchmarks.spacy_pipeline
+    python -m benchmarks.preload_memory    # per-worker RSS / PSS and cold start, serve.py preload vs not
+    python -m benchmarks.db_contention     # concurrent save-answer throughput, SQLite journal modes / DATABASE_URL
+"""
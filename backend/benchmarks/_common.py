@@ -0,0 +1,129 @@
+"""Shared helpers for the benchmark scripts."""
+
+import csv
+import json
+import queue
+import re
+import resource
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+EVALUATION_CSV = Path("interview_evaluation.csv")
+
+_READY_RE = re.compile(r"Worker (\d+) ready ([\d.]+)s after launch")
+
+
+def git_commit() -> Optional[str]:
+    """Short hash of HEAD, to label reports; None outside a git checkout."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def load_evaluation_rows(path: Path = EVALUATION_CSV) -> List[Dict]:
+    """Rows of interview_evaluation.csv: question, benchmark_answer, user_answer, human_score."""
+    with open(path, "r", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process right now (Linux /proc), falling back to the peak."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes everywhere else
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean in milliseconds."""
+    ms = [s * 1000.0 for s in seconds]
+    return {
+        "count": len(ms),
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def post_json(port: int, path: str, payload: Dict, timeout: float = 60.0) -> Dict:
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{port}{path}",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read())
+
+
+@contextmanager
+def running_server(workers: int, extra_args: List[str] = (), env: Optional[Dict[str, str]] = None,
+                   timeout: float = 300.0) -> Iterator[Tuple[subprocess.Popen, int, Dict[int, float]]]:
+    """
+    Start serve.py with `workers` workers on a free port and wait until every
+    worker is ready. Yields (process, port, {worker pid: seconds from launch
+    until ready}); the server is stopped on exit.
+    """
+    port = free_port()
+    cmd = [sys.executable, "serve.py", "--workers", str(workers), "--port", str(port), "--log-level", "warning", *extra_args]
+
+    launched = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=env)
+    lines: "queue.Queue[str]" = queue.Queue()
+    threading.Thread(target=lambda: [lines.put(line) for line in proc.stderr], daemon=True).start()
+
+    ready: Dict[int, float] = {}
+    try:
+        deadline = time.perf_counter() + timeout
+        while len(ready) < workers:
+            if proc.poll() is not None:
+                raise RuntimeError(f"serve.py exited with {proc.returncode} before all workers were ready")
+            try:
+                line = lines.get(timeout=max(0.1, deadline - time.perf_counter()))
+            except queue.Empty:
+                raise RuntimeError(f"only {len(ready)}/{workers} workers ready after {timeout:g}s")
+            match = _READY_RE.search(line)
+            if match:
+                ready[int(match.group(1))] = time.perf_counter() - launched
+        yield proc, port, ready
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
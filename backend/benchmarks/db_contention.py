@@ -0,0 +1,159 @@
+"""
+Write contention on the sessions database under concurrent save-answer traffic.
+
+Starts serve.py with several workers once per storage mode, each on a fresh
+database, and has --clients threads post save-answer requests as fast as
+the server takes them. Modes:
+
+  - rollback-journal: SQLite's defaults (journal_mode=DELETE, synchronous=FULL)
+  - wal:              the defaults of database.py (WAL, synchronous=NORMAL, mmap)
+  - url:              DATABASE_URL=--database-url as given (e.g. PostgreSQL); only
+                      run when --database-url is passed
+
+Reported per mode: throughput, latency percentiles, failed requests (e.g.
+"database is locked" once the busy timeout runs out) and the connection-pool
+counters of the worker that answered /api/diagnostics/database.
+
+Eager scoring is off, so the requests measure storage, not the NLP engine.
+
+    python -m benchmarks.db_contention [--workers 4] [--clients 16] [--requests 50] [--database-url URL]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy.engine import make_url
+
+from benchmarks._common import git_commit, latency_summary, post_json, running_server
+
+RESULTS_DIR = Path("cache") / "benchmarks"
+
+SQLITE_MODES = {
+    "rollback-journal": {"SQLITE_JOURNAL_MODE": "DELETE", "SQLITE_SYNCHRONOUS": "FULL", "SQLITE_MMAP_SIZE": "0"},
+    "wal": {"SQLITE_JOURNAL_MODE": "WAL", "SQLITE_SYNCHRONOUS": "NORMAL"},
+}
+
+_ANSWER = "We split the data, fit the model on the training part and check it on the held-out part."
+
+
+def _get_json(port: int, path: str) -> Dict:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=30) as resp:
+        return json.loads(resp.read())
+
+
+def _create_sessions(port: int, count: int) -> List[int]:
+    return [
+        post_json(port, "/api/sessions", {
+            "selected_domain": "Data Science",
+            "difficulty_level": "Easy",
+            "resume_analysis_result": {"filename": "benchmark.pdf", "top_domains": []},
+        })["id"]
+        for _ in range(count)
+    ]
+
+
+def _client(port: int, session_id: int, requests: int, latencies: List[float], errors: Dict[str, int], lock: threading.Lock) -> None:
+    for i in range(requests):
+        t0 = time.perf_counter()
+        try:
+            post_json(port, f"/api/sessions/{session_id}/save-answer", {"question": f"Question {i}", "answer": _ANSWER})
+        except urllib.error.HTTPError as e:
+            with lock:
+                key = f"HTTP {e.code}"
+                errors[key] = errors.get(key, 0) + 1
+            continue
+        except Exception as e:
+            with lock:
+                key = type(e).__name__
+                errors[key] = errors.get(key, 0) + 1
+            continue
+        elapsed = time.perf_counter() - t0
+        with lock:
+            latencies.append(elapsed)
+
+
+def measure(mode: str, env_overrides: Dict[str, str], workers: int, clients: int, sessions: int,
+            requests: int, timeout: float) -> Dict:
+    env = dict(os.environ, EAGER_SCORING="0", **env_overrides)
+    with running_server(workers, env=env, timeout=timeout) as (_, port, _ready):
+        session_ids = _create_sessions(port, max(1, sessions))
+        latencies: List[float] = []
+        errors: Dict[str, int] = {}
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=_client, args=(port, session_ids[i % len(session_ids)], requests, latencies, errors, lock))
+            for i in range(clients)
+        ]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+        return {
+            "mode": mode,
+            "settings": env_overrides,
+            "requests": clients * requests,
+            "succeeded": len(latencies),
+            "errors": errors,
+            "wall_s": round(wall, 3),
+            "requests_per_s": round(len(latencies) / wall, 1) if wall else 0.0,
+            "latency": latency_summary(latencies),
+            "database": _get_json(port, "/api/diagnostics/database"),
+        }
+
+
+def run(workers: int = 4, clients: int = 16, sessions: int = 4, requests: int = 50,
+        modes: List[str] = ("rollback-journal", "wal"), database_url: Optional[str] = None, timeout: float = 300.0) -> Dict:
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "workers": workers,
+        "clients": clients,
+        "sessions": sessions,
+        "requests_per_client": requests,
+        "modes": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="db-contention-") as tmp:
+        for mode in modes:
+            settings = dict(SQLITE_MODES[mode], DATABASE_URL=f"sqlite:///{Path(tmp) / (mode + '.db')}")
+            report["modes"][mode] = measure(mode, settings, workers, clients, sessions, requests, timeout)
+    if database_url:
+        result = measure("url", {"DATABASE_URL": database_url}, workers, clients, sessions, requests, timeout)
+        # Keep the password out of the report
+        result["settings"] = {"DATABASE_URL": make_url(database_url).render_as_string(hide_password=True)}
+        report["modes"]["url"] = result
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=16, help="concurrent client threads")
+    parser.add_argument("--sessions", type=int, default=4, help="sessions the clients write to (round-robin)")
+    parser.add_argument("--requests", type=int, default=50, help="save-answer requests per client")
+    parser.add_argument("--modes", default="rollback-journal,wal")
+    parser.add_argument("--database-url", help="also measure this database (e.g. postgresql+psycopg2://...); use an empty one")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds to wait for all workers")
+    parser.add_argument("--out", help=f"report path (default {RESULTS_DIR}/db-contention-<commit>.json)")
+    args = parser.parse_args()
+
+    modes = [m for m in args.modes.split(",") if m]
+    unknown = [m for m in modes if m not in SQLITE_MODES]
+    if unknown:
+        parser.error(f"unknown mode(s) {unknown}; choose from {sorted(SQLITE_MODES)}")
+    report = run(args.workers, args.clients, args.sessions, args.requests, modes, args.database_url, args.timeout)
+    out = Path(args.out) if args.out else RESULTS_DIR / f"db-contention-{report['commit'] or 'local'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    text = json.dumps(report, indent=2)
+    out.write_text(text, encoding="utf-8")
+    print(text)
+    print(f"Report written to {out}")
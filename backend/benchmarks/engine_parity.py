@@ -0,0 +1,128 @@
+"""
+Semantic engine parity check.
+
+Replays interview_evaluation.csv through the reference "torch" engine and a
+candidate engine ("onnx" or "onnx-int8") and reports:
+
+  - score drift: mean / max absolute difference of semantic_score and final_score
+  - how many answers change feedback band (final_score crossing 0.35 / 0.6 / 0.8)
+  - speedup: per-answer encode latency and batched throughput, torch vs candidate
+  - load time and RSS added by loading each engine
+
+Each engine runs in its own interpreter so memory numbers are comparable.
+
+    python -m benchmarks.engine_parity --engine onnx-int8 [--repeat 3] [--out parity.json]
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import time
+
+from benchmarks._common import current_rss_mb, latency_summary, load_evaluation_rows
+
+_BANDS = (0.35, 0.6, 0.8)
+
+
+def _band(score: float) -> int:
+    return sum(1 for b in _BANDS if score >= b)
+
+
+def _run_engine(engine: str, rows, repeat: int, out):
+    try:
+        out.put(_measure_engine(engine, rows, repeat))
+    except Exception as e:
+        out.put({"engine": engine, "error": f"{type(e).__name__}: {e}"})
+
+
+def _measure_engine(engine: str, rows, repeat: int):
+    import nlp_evaluation_engine as nlp_engine
+
+    rss_before = current_rss_mb()
+    t0 = time.perf_counter()
+    nlp_engine.init_models(force=True, semantic_engine=engine)
+    load_s = time.perf_counter() - t0
+    rss_loaded = current_rss_mb()
+
+    texts = [r["user_answer"] for r in rows]
+    nlp_engine.encode_texts(texts[:2])  # warm-up
+
+    single = []
+    for _ in range(repeat):
+        for text in texts:
+            t = time.perf_counter()
+            nlp_engine.encode_texts([text])
+            single.append(time.perf_counter() - t)
+
+    batched = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        nlp_engine.encode_texts(texts)
+        batched.append(time.perf_counter() - t)
+
+    results = nlp_engine.evaluate_answers_batch([
+        {"user_answer": r["user_answer"], "benchmark_answer": r["benchmark_answer"]}
+        for r in rows
+    ])
+    return {
+        "engine": engine,
+        "load_s": round(load_s, 3),
+        "rss_added_mb": round(rss_loaded - rss_before, 1),
+        "encode_single": latency_summary(single),
+        "encode_batch_texts_per_s": round(len(texts) / min(batched), 1),
+        "semantic": [r["semantic_score"] for r in results],
+        "final": [r["final_score"] for r in results],
+    }
+
+
+def _drift(ref, cand):
+    diffs = [abs(a - b) for a, b in zip(ref, cand)]
+    return {"mean_abs": round(sum(diffs) / max(1, len(diffs)), 4), "max_abs": round(max(diffs, default=0.0), 4)}
+
+
+def run(candidate: str, repeat: int = 3):
+    rows = load_evaluation_rows()
+    ctx = mp.get_context("spawn")
+    measured = {}
+    for engine in ("torch", candidate):
+        q = ctx.Queue()
+        p = ctx.Process(target=_run_engine, args=(engine, rows, repeat, q))
+        p.start()
+        measured[engine] = q.get()
+        p.join()
+
+    ref, cand = measured["torch"], measured[candidate]
+    report = {"answers": len(rows), "repeat": repeat, "reference": "torch", "candidate": candidate}
+    if "error" in ref or "error" in cand:
+        report["errors"] = {e: m["error"] for e, m in measured.items() if "error" in m}
+        return report
+
+    report["drift"] = {
+        "semantic_score": _drift(ref["semantic"], cand["semantic"]),
+        "final_score": _drift(ref["final"], cand["final"]),
+        "feedback_band_changes": sum(1 for a, b in zip(ref["final"], cand["final"]) if _band(a) != _band(b)),
+    }
+    report["speedup"] = {
+        "encode_single_p50": round(ref["encode_single"]["p50_ms"] / max(cand["encode_single"]["p50_ms"], 1e-9), 2),
+        "encode_batch": round(cand["encode_batch_texts_per_s"] / max(ref["encode_batch_texts_per_s"], 1e-9), 2),
+    }
+    for m in (ref, cand):
+        m.pop("semantic")
+        m.pop("final")
+    report["engines"] = [ref, cand]
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engine", default="onnx-int8", choices=("onnx", "onnx-int8"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = run(args.engine, args.repeat)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
@@ -0,0 +1,202 @@
+"""
+Evaluation benchmark and calibration harness.
+
+Replays interview_evaluation.csv through the engine, one answer at a time
+(evaluate_answer) and in batches (evaluate_answers_batch), and reports:
+
+  - throughput and p50/p95/p99 latency, overall and per engine stage
+  - model load time and peak RSS
+  - Pearson / Spearman correlation of final_score (and each component) with human_score
+
+The report is written as JSON so runs can be compared across commits:
+
+    python -m benchmarks.evaluation [--repeat 3] [--batch-size 32] [--out report.json]
+    python -m benchmarks.evaluation --compare cache/benchmarks/evaluation-<old>.json
+
+The CSV carries no keyword lists, so keyword_score is the engine's
+"no keywords" value for every row; calibration numbers are comparable
+between runs, not with production sessions that have keywords.
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmarks._common import git_commit, latency_summary, load_evaluation_rows, peak_rss_mb
+
+RESULTS_DIR = Path("cache") / "benchmarks"
+
+_SCORE_FIELDS = ("final_score", "semantic_score", "keyword_score", "structure_score", "coherence", "delivery_score")
+
+
+# -----------------------------
+# Correlation
+# -----------------------------
+def _ranks(values: np.ndarray) -> np.ndarray:
+    """Average ranks (ties share the mean rank), as Spearman requires."""
+    order = np.argsort(values, kind="mergesort")
+    ranks = np.empty(len(values), dtype=np.float64)
+    sorted_vals = values[order]
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and sorted_vals[j + 1] == sorted_vals[i]:
+            j += 1
+        ranks[order[i:j + 1]] = (i + j) / 2.0
+        i = j + 1
+    return ranks
+
+def pearson(x: List[float], y: List[float]) -> Optional[float]:
+    a, b = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    if len(a) < 2 or a.std() == 0 or b.std() == 0:
+        return None
+    return round(float(np.corrcoef(a, b)[0, 1]), 4)
+
+def spearman(x: List[float], y: List[float]) -> Optional[float]:
+    return pearson(_ranks(np.asarray(x, dtype=np.float64)), _ranks(np.asarray(y, dtype=np.float64)))
+
+
+# -----------------------------
+# Runs
+# -----------------------------
+class _StageRecorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def __call__(self, stage: str, seconds: float) -> None:
+        self.samples[stage].append(seconds)
+
+    def summary(self) -> Dict[str, Dict]:
+        return {stage: latency_summary(values) for stage, values in sorted(self.samples.items())}
+
+
+def _run_single(engine, rows: List[Dict], repeat: int):
+    recorder = _StageRecorder()
+    engine.set_stage_timer(recorder)
+    latencies, results = [], []
+    t_start = time.perf_counter()
+    try:
+        for r in range(repeat):
+            for row in rows:
+                t = time.perf_counter()
+                res = engine.evaluate_answer(row["user_answer"], row["benchmark_answer"])
+                latencies.append(time.perf_counter() - t)
+                if r == 0:
+                    results.append(res)
+    finally:
+        engine.set_stage_timer(None)
+    wall = time.perf_counter() - t_start
+    return {
+        "answers_per_s": round(len(latencies) / wall, 2) if wall else None,
+        "latency_per_answer": latency_summary(latencies),
+        "stages_per_answer": recorder.summary(),
+    }, results
+
+
+def _run_batched(engine, rows: List[Dict], repeat: int, batch_size: int):
+    recorder = _StageRecorder()
+    engine.set_stage_timer(recorder)
+    latencies, results = [], []
+    items = [{"user_answer": row["user_answer"], "benchmark_answer": row["benchmark_answer"]} for row in rows]
+    t_start = time.perf_counter()
+    try:
+        for r in range(repeat):
+            for start in range(0, len(items), batch_size):
+                t = time.perf_counter()
+                res = engine.evaluate_answers_batch(items[start:start + batch_size])
+                latencies.append(time.perf_counter() - t)
+                if r == 0:
+                    results.extend(res)
+    finally:
+        engine.set_stage_timer(None)
+    wall = time.perf_counter() - t_start
+    return {
+        "batch_size": batch_size,
+        "answers_per_s": round(len(items) * repeat / wall, 2) if wall else None,
+        "latency_per_batch": latency_summary(latencies),
+        "stages_per_batch": recorder.summary(),
+    }, results
+
+
+def _calibration(results: List[Dict], human: List[float]) -> Dict:
+    report = {}
+    for field in _SCORE_FIELDS:
+        values = [float(r.get(field, 0.0)) for r in results]
+        report[field] = {"pearson": pearson(values, human), "spearman": spearman(values, human)}
+    return report
+
+
+def run(repeat: int = 3, batch_size: int = 32) -> Dict:
+    import nlp_evaluation_engine as engine
+
+    rows = load_evaluation_rows()
+    human = [float(row["human_score"]) for row in rows]
+
+    t0 = time.perf_counter()
+    engine.init_models()
+    load_s = time.perf_counter() - t0
+    engine.evaluate_answer(rows[0]["user_answer"], rows[0]["benchmark_answer"])  # warm-up
+
+    single, single_results = _run_single(engine, rows, repeat)
+    batched, batched_results = _run_batched(engine, rows, repeat, batch_size)
+
+    drift = [abs(a["final_score"] - b["final_score"]) for a, b in zip(single_results, batched_results)]
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "engine_version": engine.engine_version(),
+        "answers": len(rows),
+        "repeat": repeat,
+        "model_load_s": round(load_s, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "single": single,
+        "batched": batched,
+        "batch_vs_single_max_final_drift": round(max(drift, default=0.0), 4),
+        "calibration": _calibration(single_results, human),
+    }
+
+
+def compare(old: Dict, new: Dict) -> Dict:
+    """Deltas (new - old) of the headline numbers of two reports."""
+    def delta(path):
+        a, b = old, new
+        for key in path:
+            a, b = (a or {}).get(key), (b or {}).get(key)
+        return round(b - a, 4) if isinstance(a, (int, float)) and isinstance(b, (int, float)) else None
+
+    return {
+        "old": old.get("commit"),
+        "new": new.get("commit"),
+        "single_answers_per_s": delta(("single", "answers_per_s")),
+        "single_p95_ms": delta(("single", "latency_per_answer", "p95_ms")),
+        "batched_answers_per_s": delta(("batched", "answers_per_s")),
+        "peak_rss_mb": delta(("peak_rss_mb",)),
+        "final_score_pearson": delta(("calibration", "final_score", "pearson")),
+        "final_score_spearman": delta(("calibration", "final_score", "spearman")),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--out", help=f"report path (default {RESULTS_DIR}/evaluation-<commit>.json)")
+    parser.add_argument("--compare", help="previous report to diff against")
+    args = parser.parse_args()
+
+    report = run(args.repeat, args.batch_size)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            report["compared_to"] = compare(json.load(f), report)
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"evaluation-{report['commit'] or 'local'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    text = json.dumps(report, indent=2)
+    out.write_text(text, encoding="utf-8")
+    print(text)
+    print(f"Report written to {out}")
@@ -0,0 +1,119 @@
+"""
+Memory and cold-start cost of multi-worker serving, with and without preloading.
+
+Launches serve.py twice on a free port, once per mode:
+
+  - preload:    models loaded once in the parent, workers forked afterwards
+  - per-worker: workers forked first, each loads its own models (= uvicorn --workers)
+
+and reports, per mode:
+
+  - cold start: seconds from launch until the first / the last worker is ready
+  - RSS and PSS of the parent and every worker (Linux /proc/<pid>/smaps_rollup).
+    RSS counts shared pages in full for every process; PSS splits them between
+    the processes sharing them, so total PSS is the real footprint.
+
+Workers are measured after --warm-requests evaluate-answer calls, so pages
+touched by inference are included.
+
+    python -m benchmarks.preload_memory [--workers 4] [--warm-requests 20] [--out report.json]
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks._common import git_commit, post_json, running_server
+
+RESULTS_DIR = Path("cache") / "benchmarks"
+
+_SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def _smaps_mb(pid: int) -> Optional[Dict[str, float]]:
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            values = {}
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in _SMAPS_FIELDS:
+                    values[name.lower() + "_mb"] = round(int(rest.split()[0]) / 1024.0, 1)
+            return values
+    except OSError:
+        return None
+
+
+def _warm(port: int, requests: int) -> None:
+    """A few evaluations, spread by the kernel over the workers, so inference pages are counted."""
+    if requests <= 0:
+        return
+    session = post_json(port, "/api/sessions", {
+        "selected_domain": "Data Science",
+        "difficulty_level": "Easy",
+        "resume_analysis_result": {"filename": "benchmark.pdf", "top_domains": []},
+    })
+    questions = post_json(port, f"/api/sessions/{session['id']}/generate-questions", {})["questions"]
+    answer = "It is a core idea of the field: we collect data, fit a model, validate it and explain the results clearly."
+    for i in range(requests):
+        # Distinct answers, so the evaluation cache never short-circuits the engine
+        post_json(port, f"/api/sessions/{session['id']}/evaluate-answer", {
+            "question": questions[i % len(questions)]["question"],
+            "answer": f"{answer} Example {i}.",
+        })
+
+
+def measure(mode: str, workers: int, warm_requests: int, timeout: float) -> Dict:
+    extra_args = ["--no-preload"] if mode == "per-worker" else []
+    with running_server(workers, extra_args, timeout=timeout) as (proc, port, ready):
+        _warm(port, warm_requests)
+
+        parent = _smaps_mb(proc.pid)
+        per_worker = {pid: _smaps_mb(pid) for pid in ready}
+        processes = [p for p in [parent, *per_worker.values()] if p]
+        return {
+            "mode": mode,
+            "workers": workers,
+            "first_worker_ready_s": round(min(ready.values()), 3),
+            "all_workers_ready_s": round(max(ready.values()), 3),
+            "parent": parent,
+            "per_worker": list(per_worker.values()),
+            "total_rss_mb": round(sum(p.get("rss_mb", 0.0) for p in processes), 1),
+            "total_pss_mb": round(sum(p.get("pss_mb", 0.0) for p in processes), 1),
+        }
+
+
+def run(workers: int = 4, warm_requests: int = 20, modes: List[str] = ("preload", "per-worker"), timeout: float = 300.0) -> Dict:
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        raise SystemExit("This benchmark reads /proc/<pid>/smaps_rollup (Linux 4.14+).")
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "warm_requests": warm_requests,
+        "modes": {mode: measure(mode, workers, warm_requests, timeout) for mode in modes},
+    }
+    if {"preload", "per-worker"} <= set(report["modes"]):
+        a, b = report["modes"]["preload"], report["modes"]["per-worker"]
+        report["pss_saved_mb"] = round(b["total_pss_mb"] - a["total_pss_mb"], 1)
+        report["cold_start_saved_s"] = round(b["all_workers_ready_s"] - a["all_workers_ready_s"], 3)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--warm-requests", type=int, default=20)
+    parser.add_argument("--modes", default="preload,per-worker")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds to wait for all workers")
+    parser.add_argument("--out", help=f"report path (default {RESULTS_DIR}/preload-<commit>.json)")
+    args = parser.parse_args()
+
+    report = run(args.workers, args.warm_requests, args.modes.split(","), args.timeout)
+    out = Path(args.out) if args.out else RESULTS_DIR / f"preload-{report['commit'] or 'local'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    text = json.dumps(report, indent=2)
+    out.write_text(text, encoding="utf-8")
+    print(text)
+    print(f"Report written to {out}")
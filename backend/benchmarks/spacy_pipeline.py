@@ -0,0 +1,110 @@
+"""
+spaCy pipeline benchmark for coherence scoring.
+
+Compares the NLP_SPACY_MODE options ("full", "parser", "sentencizer") on the
+answers in interview_evaluation.csv:
+
+  - load time and RSS added by loading the pipeline
+  - per-answer latency of nlp(text) (the old per-answer path)
+  - total time of one nlp.pipe() run over all answers (the batched path)
+  - whether sentence counts agree with the full pipeline
+
+Each mode is measured in a fresh interpreter so RSS numbers don't leak between runs.
+
+    python -m benchmarks.spacy_pipeline [--repeat 3] [--batch-size 64] [--n-process 1]
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import time
+
+from benchmarks._common import current_rss_mb, latency_summary, load_evaluation_rows
+
+
+def _measure(mode: str, texts, repeat: int, batch_size: int, n_process: int, out):
+    try:
+        out.put(_measure_mode(mode, texts, repeat, batch_size, n_process))
+    except Exception as e:
+        out.put({"mode": mode, "error": f"{type(e).__name__}: {e}"})
+
+
+def _measure_mode(mode: str, texts, repeat: int, batch_size: int, n_process: int):
+    import nlp_evaluation_engine as engine
+
+    rss_before = current_rss_mb()
+    t0 = time.perf_counter()
+    nlp = engine._load_spacy(mode)
+    load_s = time.perf_counter() - t0
+    rss_loaded = current_rss_mb()
+
+    per_answer = []
+    for _ in range(repeat):
+        for text in texts:
+            t = time.perf_counter()
+            nlp(text)
+            per_answer.append(time.perf_counter() - t)
+
+    piped = []
+    sentence_counts = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        docs = list(nlp.pipe(texts, batch_size=batch_size, n_process=n_process))
+        piped.append(time.perf_counter() - t)
+        sentence_counts = [len(list(d.sents)) for d in docs]
+
+    return {
+        "mode": mode,
+        "load_s": round(load_s, 3),
+        "rss_added_mb": round(rss_loaded - rss_before, 1),
+        "rss_after_mb": round(current_rss_mb(), 1),
+        "per_answer": latency_summary(per_answer),
+        "pipe_total_ms": round(min(piped) * 1000.0, 2),
+        "sentence_counts": sentence_counts,
+    }
+
+
+def run(repeat: int = 3, batch_size: int = 64, n_process: int = 1):
+    texts = [r["user_answer"] for r in load_evaluation_rows()]
+    ctx = mp.get_context("spawn")
+    results = []
+    for mode in ("full", "parser", "sentencizer"):
+        q = ctx.Queue()
+        p = ctx.Process(target=_measure, args=(mode, texts, repeat, batch_size, n_process, q))
+        p.start()
+        results.append(q.get())
+        p.join()
+
+    full = results[0] if "error" not in results[0] else None
+    for r in results:
+        if "error" in r or full is None:
+            continue
+        r["sentence_agreement_vs_full"] = round(
+            sum(1 for a, b in zip(r["sentence_counts"], full["sentence_counts"]) if a == b)
+            / max(1, len(r["sentence_counts"])), 3
+        )
+        r["pipe_speedup_vs_full_loop"] = round(
+            (full["per_answer"]["mean_ms"] * len(texts)) / max(r["pipe_total_ms"], 1e-9), 2
+        )
+    for r in results:
+        r.pop("sentence_counts", None)
+    return {"answers": len(texts), "repeat": repeat, "batch_size": batch_size,
+            "n_process": n_process, "modes": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+
+    report = run(args.repeat, args.batch_size, args.n_process)
+    print(f"{'mode':<12} {'load s':>7} {'+RSS MB':>8} {'nlp() p50 ms':>13} {'pipe total ms':>14} {'speedup':>8} {'sent agree':>10}")
+    for r in report["modes"]:
+        if "error" in r:
+            print(f"{r['mode']:<12} failed: {r['error']}")
+            continue
+        print(f"{r['mode']:<12} {r['load_s']:>7} {r['rss_added_mb']:>8} {r['per_answer']['p50_ms']:>13} "
+              f"{r['pipe_total_ms']:>14} {r.get('pipe_speedup_vs_full_loop', '-'):>8} {r.get('sentence_agreement_vs_full', '-'):>10}")
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,101 @@
+"""
+Small persistent key -> JSON cache on top of SQLite.
+
+One file can be shared by every uvicorn worker on a host: SQLite serializes the
+writers, WAL mode lets readers proceed concurrently, and entries survive restarts.
+Eviction is least-recently-used once max_entries is exceeded; entries older
+than ttl_seconds (when set) are treated as missing.
+
+Every call is blocking file I/O: async code should run it in a thread. To keep
+each call to a single indexed statement where possible, the size limit is
+enforced every prune_every writes (so the file may briefly hold up to ~1% more
+than max_entries per writing process) and access times are only refreshed when
+they are more than TOUCH_INTERVAL seconds old.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+LOG = logging.getLogger("disk_cache")
+
+# get() refreshes accessed_at at most this often per entry; LRU order is only this precise
+TOUCH_INTERVAL = 60.0
+
+
+class DiskCache:
+    def __init__(self, path: Path, max_entries: int = 10000, ttl_seconds: Optional[float] = None):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.prune_every = max(1, max_entries // 100)
+        self._local = threading.local()
+        self._writes_lock = threading.Lock()
+        self._writes = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite3 connections must not cross threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._connect()
+        row = conn.execute("SELECT value, created_at, accessed_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return None
+        if now - row[2] > TOUCH_INTERVAL:
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> int:
+        """Store value; returns how many entries were evicted to make room."""
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now, now),
+        )
+        with self._writes_lock:
+            self._writes += 1
+            if self._writes < self.prune_every:
+                return 0
+            self._writes = 0
+        return self.prune()
+
+    def prune(self) -> int:
+        """Evict least-recently-used entries beyond max_entries; returns how many went."""
+        conn = self._connect()
+        overflow = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+        if overflow <= 0:
+            return 0
+        conn.execute(
+            "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed_at LIMIT ?)",
+            (overflow,),
+        )
+        return overflow
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -0,0 +1,136 @@
+"""
+Precomputed benchmark embeddings for the question bank.
+
+Benchmark texts never change between requests, so every bank entry is encoded
+once into an on-disk artifact:
+
+    cache/embeddings/benchmarks-<fingerprint>.npy       (N x dim matrix, memory-mapped)
+    cache/embeddings/benchmarks-<fingerprint>.ids.json  (question id -> row)
+
+The fingerprint covers the embedding model and the (id, text) pairs of the bank,
+so editing the bank or switching models produces a new artifact instead of
+silently serving stale vectors.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+LOG = logging.getLogger("embedding_store")
+
+EMBEDDING_CACHE_DIR = Path("cache") / "embeddings"
+
+# float16 halves the artifact; rows are re-normalized on read so cosines stay exact enough
+EMBEDDING_STORE_DTYPE = os.getenv("EMBEDDING_STORE_DTYPE", "float16")
+
+_ARTIFACT_PREFIX = "benchmarks-"
+
+
+class BenchmarkEmbeddingStore:
+    """
+    Lazily built / loaded embedding matrix keyed by question id.
+    Nothing is encoded or read from disk until the first get().
+    """
+
+    def __init__(self, questions: List[Dict], cache_dir: Optional[Path] = None, dtype: str = EMBEDDING_STORE_DTYPE):
+        self.cache_dir = Path(cache_dir or EMBEDDING_CACHE_DIR)
+        self.dtype = dtype
+        self._texts: Dict[str, str] = {}
+        for q in questions:
+            qid, text = q.get("id"), q.get("question")
+            if qid and isinstance(text, str) and text.strip():
+                self._texts[str(qid)] = text
+        self._matrix: Optional[np.ndarray] = None
+        self._index: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # -------------------- Fingerprint / paths --------------------
+    def fingerprint(self) -> str:
+        from nlp_evaluation_engine import model_fingerprint  # local import: engine loads lazily anyway
+
+        h = hashlib.sha256()
+        h.update(model_fingerprint().encode("utf-8"))
+        h.update(self.dtype.encode("utf-8"))
+        for qid in sorted(self._texts):
+            h.update(b"\0" + qid.encode("utf-8") + b"\0" + self._texts[qid].encode("utf-8"))
+        return h.hexdigest()[:16]
+
+    def _paths(self, fp: str):
+        name = f"{_ARTIFACT_PREFIX}{fp}"
+        return self.cache_dir / f"{name}.npy", self.cache_dir / f"{name}.ids.json"
+
+    # -------------------- Public API --------------------
+    def get(self, question_id) -> Optional[np.ndarray]:
+        """Return the normalized float32 embedding for a question id, or None if unknown."""
+        if question_id is None or str(question_id) not in self._texts:
+            return None
+        self._ensure_loaded()
+        row = self._index.get(str(question_id))
+        if row is None:
+            return None
+        vec = np.asarray(self._matrix[row], dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def is_built(self) -> bool:
+        """True if the artifact for the current bank and model is on disk (loading it encodes nothing)."""
+        return all(p.exists() for p in self._paths(self.fingerprint()))
+
+    def load(self) -> None:
+        """Map the artifact now instead of on the first get(), building it first if it is missing."""
+        if self._texts:
+            self._ensure_loaded()
+
+    # -------------------- Load / build --------------------
+    def _ensure_loaded(self) -> None:
+        if self._matrix is not None:
+            return
+        with self._lock:
+            if self._matrix is not None:
+                return
+            fp = self.fingerprint()
+            matrix_path, index_path = self._paths(fp)
+            if not (matrix_path.exists() and index_path.exists()):
+                self._build(fp, matrix_path, index_path)
+
+            with open(index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)["ids"]
+            self._matrix = np.load(matrix_path, mmap_mode="r")
+            LOG.info("Benchmark embeddings mapped from %s (%d rows)", matrix_path, len(self._index))
+
+    def _build(self, fp: str, matrix_path: Path, index_path: Path) -> None:
+        from nlp_evaluation_engine import encode_texts
+
+        ids = sorted(self._texts)
+        LOG.info("Encoding %d benchmark texts (fingerprint %s)...", len(ids), fp)
+        matrix = encode_texts([self._texts[qid] for qid in ids]).astype(self.dtype)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to temp names and rename, so a concurrent worker never maps a half-written file
+        tmp_matrix = matrix_path.with_name(matrix_path.name + f".{os.getpid()}.tmp")
+        tmp_index = index_path.with_name(index_path.name + f".{os.getpid()}.tmp")
+        with open(tmp_matrix, "wb") as f:
+            np.save(f, matrix)
+        with open(tmp_index, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fp, "ids": {qid: i for i, qid in enumerate(ids)}}, f)
+        os.replace(tmp_matrix, matrix_path)
+        os.replace(tmp_index, index_path)
+
+        self._remove_stale(fp)
+
+    def _remove_stale(self, fp: str) -> None:
+        for p in self.cache_dir.glob(f"{_ARTIFACT_PREFIX}*"):
+            if fp not in p.name and not p.name.endswith(".tmp"):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
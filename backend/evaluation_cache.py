@@ -0,0 +1,247 @@
+"""
+Two-tier cache for NLP evaluation results.
+
+Scoring is deterministic for a given (answer, benchmark, keywords, weights,
+engine version), so repeat submissions, retries and re-evaluations can skip the
+embedding and spaCy work entirely.
+
+  tier 1: in-process LRU with a TTL (per worker, no I/O)
+  tier 2: optional SQLite file shared by all workers on the host (disk_cache.DiskCache)
+
+Configuration (environment):
+    EVAL_CACHE_SIZE          in-process entries, 0 disables tier 1   (default 4096)
+    EVAL_CACHE_TTL           seconds an entry stays valid, 0 = never expires (default 86400)
+    EVAL_CACHE_DISK_PATH     SQLite file for tier 2, empty disables it (default disabled)
+    EVAL_CACHE_DISK_SIZE     max entries kept on disk              (default 100000)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import nlp_evaluation_engine as nlp_engine
+from disk_cache import DiskCache
+
+LOG = logging.getLogger("evaluation_cache")
+
+EVAL_CACHE_SIZE = int(os.getenv("EVAL_CACHE_SIZE", "4096"))
+EVAL_CACHE_TTL = float(os.getenv("EVAL_CACHE_TTL", "86400"))
+EVAL_CACHE_DISK_PATH = os.getenv("EVAL_CACHE_DISK_PATH", "")
+EVAL_CACHE_DISK_SIZE = int(os.getenv("EVAL_CACHE_DISK_SIZE", "100000"))
+
+
+# -----------------------------
+# Cache key
+# -----------------------------
+# Bump when the key payload changes, so entries stored under the old layout are never served
+CACHE_KEY_VERSION = 2
+
+def evaluation_cache_key(user_answer: str, benchmark_answer: str, question_keywords=None, weights: Dict[str, float] = None) -> str:
+    """
+    Stable key over everything that influences a score. Keywords are reduced to
+    the matcher's normalized tuple, so list / string / matcher inputs share entries.
+    Answer texts are keyed verbatim: whitespace changes sentence splitting and
+    the gibberish checks, so two spellings of an answer can score differently.
+    """
+    matcher = nlp_engine.get_keyword_matcher(question_keywords)
+    payload = json.dumps(
+        [
+            CACHE_KEY_VERSION,
+            nlp_engine.engine_version(),
+            user_answer or "",
+            benchmark_answer or "",
+            list(matcher.keywords),
+            matcher.source_count,
+            sorted((weights or {}).items()),
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# -----------------------------
+# Two-tier cache
+# -----------------------------
+class EvaluationCache:
+    def __init__(self, max_entries: int = EVAL_CACHE_SIZE, ttl_seconds: float = EVAL_CACHE_TTL,
+                 disk_path: str = EVAL_CACHE_DISK_PATH, disk_max_entries: int = EVAL_CACHE_DISK_SIZE):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds or None
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[DiskCache] = None
+        if disk_path:
+            try:
+                self._disk = DiskCache(disk_path, max_entries=disk_max_entries, ttl_seconds=self.ttl_seconds)
+            except Exception as e:
+                LOG.warning("Evaluation disk cache disabled (%s): %s", disk_path, e)
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+            "expired": 0,
+            "disk_errors": 0,
+        }
+
+    @property
+    def disk_enabled(self) -> bool:
+        return self._disk is not None
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += n
+
+    def _remember(self, key: str, result: Dict) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["memory_evictions"] += 1
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None:
+                stored_at, result = hit
+                if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                    del self._entries[key]
+                    self._counters["expired"] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return dict(result)
+
+        if self._disk is not None:
+            try:
+                result = self._disk.get(key)
+            except Exception as e:
+                LOG.warning("Evaluation disk cache read failed: %s", e)
+                self._count("disk_errors")
+                result = None
+            if result is not None:
+                self._count("disk_hits")
+                self._remember(key, result)
+                return dict(result)
+
+        self._count("misses")
+        return None
+
+    def put(self, key: str, result: Dict) -> None:
+        self._remember(key, dict(result))
+        if self._disk is not None:
+            try:
+                evicted = self._disk.set(key, result)
+                if evicted:
+                    self._count("disk_evictions", evicted)
+            except Exception as e:
+                LOG.warning("Evaluation disk cache write failed: %s", e)
+                self._count("disk_errors")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._entries)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        stats["memory_max_entries"] = self.max_entries
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["disk_enabled"] = self._disk is not None
+        if self._disk is not None:
+            try:
+                stats["disk_entries"] = len(self._disk)
+            except Exception:
+                stats["disk_entries"] = None
+        stats["engine_version"] = nlp_engine.engine_version()
+        return stats
+
+
+_cache: Optional[EvaluationCache] = None
+_cache_lock = threading.Lock()
+
+def get_evaluation_cache() -> EvaluationCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EvaluationCache()
+    return _cache
+
+
+# -----------------------------
+# Cached entry points (same signatures as the engine's)
+# -----------------------------
+def cached_evaluate_answer(
+    user_answer: str,
+    benchmark_answer: str,
+    question_keywords=None,
+    weights: Dict[str, float] = None,
+    benchmark_embedding=None
+) -> Dict:
+    cache = get_evaluation_cache()
+    key = evaluation_cache_key(user_answer, benchmark_answer, question_keywords, weights)
+    result = cache.get(key)
+    if result is None:
+        result = nlp_engine.evaluate_answer(
+            user_answer,
+            benchmark_answer,
+            question_keywords=question_keywords,
+            weights=weights,
+            benchmark_embedding=benchmark_embedding,
+        )
+        cache.put(key, result)
+    return result
+
+def lookup_batch(items: List[Dict], weights: Dict[str, float] = None) -> Tuple[List[Optional[Dict]], List[str], List[int]]:
+    """
+    Resolve what the cache already has for a batch.
+    Returns (results with None for misses, cache keys, indices of the misses).
+    """
+    cache = get_evaluation_cache()
+    results: List[Optional[Dict]] = [None] * len(items)
+    keys: List[str] = []
+    missing: List[int] = []
+    for i, item in enumerate(items):
+        key = evaluation_cache_key(
+            item.get("user_answer"),
+            item.get("benchmark_answer"),
+            item.get("question_keywords"),
+            item.get("weights", weights),
+        )
+        keys.append(key)
+        results[i] = cache.get(key)
+        if results[i] is None:
+            missing.append(i)
+    return results, keys, missing
+
+def store_batch(results: List[Optional[Dict]], keys: List[str], missing: List[int], fresh: List[Dict]) -> List[Dict]:
+    """Fill the misses from lookup_batch() with freshly computed results and cache them."""
+    cache = get_evaluation_cache()
+    for i, result in zip(missing, fresh):
+        cache.put(keys[i], result)
+        results[i] = result
+    return results
+
+def cached_evaluate_answers_batch(items: List[Dict], weights: Dict[str, float] = None) -> List[Dict]:
+    """Serve what the cache has; evaluate only the misses, in a single engine batch."""
+    results, keys, missing = lookup_batch(items, weights)
+    if missing:
+        fresh = nlp_engine.evaluate_answers_batch([items[i] for i in missing], weights=weights)
+        store_batch(results, keys, missing, fresh)
+    return results
+
+def evaluation_cache_stats() -> Dict:
+    return get_evaluation_cache().stats()
@@ -0,0 +1,255 @@
+"""
+Dedicated executor for NLP scoring.
+
+Evaluation is CPU-bound (textstat, spaCy, sentence embeddings). Running it on
+FastAPI's request threadpool lets a few finishing interviews starve cheap
+endpoints, so scoring is submitted here instead and awaited by async handlers.
+
+  - a process pool whose workers load the models once, at worker start
+  - a bounded number of in-flight tasks; beyond it callers get EvaluationQueueFull (-> 503)
+  - a per-task timeout (-> EvaluationTimeout, 504); the task itself cannot be
+    stopped, so it keeps its slot until it really ends and a backlog of timed-out
+    work still counts against the bound (and shows as saturated in readiness)
+  - the result cache is consulted in the API process, so hits never touch the pool;
+    with the disk tier enabled, lookups and stores run on the request threadpool
+  - nothing is submitted before the models are loaded and warmed up (prepare());
+    until then callers get EvaluationNotReady (-> 503), never a model load inside a request
+
+Configuration (environment):
+    EVAL_POOL_WORKERS       worker processes; 0 = run in a thread of the API process (default 2)
+    EVAL_QUEUE_DEPTH        max evaluation tasks in flight or waiting            (default 32)
+    EVAL_TASK_TIMEOUT       seconds before a submitted task is abandoned         (default 30)
+    EVAL_WARM_UP            run a throwaway evaluation after loading the models  (default 1)
+"""
+
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+import nlp_evaluation_engine as nlp_engine
+from evaluation_cache import evaluation_cache_key, get_evaluation_cache, lookup_batch, store_batch
+
+LOG = logging.getLogger("evaluation_executor")
+
+EVAL_POOL_WORKERS = int(os.getenv("EVAL_POOL_WORKERS", "2"))
+EVAL_QUEUE_DEPTH = int(os.getenv("EVAL_QUEUE_DEPTH", "32"))
+EVAL_TASK_TIMEOUT = float(os.getenv("EVAL_TASK_TIMEOUT", "30"))
+EVAL_WARM_UP = os.getenv("EVAL_WARM_UP", "1").lower() in ("1", "true", "yes")
+
+
+class EvaluationQueueFull(RuntimeError):
+    """Too many evaluations already queued; the caller should retry later."""
+
+
+class EvaluationTimeout(RuntimeError):
+    """An evaluation task did not finish within EVAL_TASK_TIMEOUT."""
+
+
+class EvaluationNotReady(RuntimeError):
+    """The models are still loading (or failed to load); the caller should retry later."""
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+def _init_worker() -> None:
+    logging.basicConfig(level=logging.INFO)
+    nlp_engine.init_models()
+    if EVAL_WARM_UP:
+        nlp_engine.warm_up()
+    LOG.info("Evaluation worker %d ready.", os.getpid())
+
+def _warm_up() -> int:
+    """
+    Runs once in a worker at pool start: makes sure the benchmark embedding
+    artifact exists, so the API process only ever memory-maps it and never
+    has to load the embedding model itself.
+    """
+    import question_bank_handler
+
+    question_bank_handler.build_benchmark_embeddings()
+    return os.getpid()
+
+
+# -----------------------------
+# API side
+# -----------------------------
+_pool: Optional[ProcessPoolExecutor] = None
+_in_flight = 0
+_abandoned = 0      # timed out for the caller, still running in the executor
+
+_ready = threading.Event()
+_load_lock = threading.Lock()
+_loading = False
+_load_error: Optional[str] = None
+
+
+def pool_enabled() -> bool:
+    return EVAL_POOL_WORKERS > 0
+
+def start_pool(warm_up: bool = True) -> None:
+    """Create the worker pool (no-op when EVAL_POOL_WORKERS=0). Blocks until one worker is warm."""
+    global _pool
+    if not pool_enabled() or _pool is not None:
+        return
+    # spawn: workers must not inherit torch / thread state from the API process
+    _pool = ProcessPoolExecutor(
+        max_workers=EVAL_POOL_WORKERS,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_worker,
+    )
+    LOG.info("Evaluation pool started with %d workers.", EVAL_POOL_WORKERS)
+    if warm_up:
+        _pool.submit(_warm_up).result()
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def prepare(warm_up: bool = EVAL_WARM_UP) -> None:
+    """
+    Load the models where scoring will run (pool workers, or this process) and
+    warm them up, then open the executor for submissions. Blocks until done;
+    raises if loading fails.
+    """
+    global _loading, _load_error
+    with _load_lock:
+        if _ready.is_set():
+            return
+        _loading = True
+        _load_error = None
+        try:
+            if pool_enabled():
+                start_pool()
+            else:
+                import question_bank_handler
+
+                nlp_engine.init_models()
+                if warm_up:
+                    LOG.info("NLP warm-up took %.2fs.", nlp_engine.warm_up())
+                # As the pool's _warm_up does: map (or build) the benchmark store before the first request
+                question_bank_handler.warm_benchmark_embeddings()
+            _ready.set()
+        except Exception as e:
+            _load_error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _loading = False
+
+def prepare_in_background(warm_up: bool = EVAL_WARM_UP) -> None:
+    """prepare() on a daemon thread; no-op while a load is already running or once ready."""
+    if _ready.is_set() or _loading:
+        return
+
+    def run():
+        try:
+            prepare(warm_up)
+            LOG.info("Evaluation models ready.")
+        except Exception as e:
+            LOG.exception("Loading evaluation models failed: %s", e)
+
+    threading.Thread(target=run, name="evaluation-model-load", daemon=True).start()
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+def readiness() -> Dict:
+    return {
+        "ready": _ready.is_set(),
+        "loading": _loading,
+        "error": _load_error,
+        "mode": "pool" if pool_enabled() else "inline",
+        "saturated": _in_flight >= EVAL_QUEUE_DEPTH,
+    }
+
+def _release(future) -> None:
+    # Runs on the event loop once the task has really finished (or was cancelled)
+    global _in_flight
+    _in_flight -= 1
+    if not future.cancelled():
+        future.exception()  # retrieved, so abandoned failures are not reported as never retrieved
+
+def _abandoned_done(future) -> None:
+    global _abandoned
+    _abandoned -= 1
+
+async def _submit(fn, *args, **kwargs):
+    global _in_flight, _abandoned, _pool
+    if not _ready.is_set():
+        raise EvaluationNotReady("evaluation models are still loading" if _loading or _load_error is None
+                                 else f"evaluation models failed to load ({_load_error})")
+    if _in_flight >= EVAL_QUEUE_DEPTH:
+        raise EvaluationQueueFull(f"{_in_flight} evaluations already queued")
+    loop = asyncio.get_running_loop()
+    # _pool is None when disabled: the loop's default thread executor runs it instead
+    future = loop.run_in_executor(_pool, partial(fn, *args, **kwargs))
+    _in_flight += 1
+    future.add_done_callback(_release)
+    try:
+        # Shielded: a timeout (or a disconnected caller) stops the wait, not the task
+        return await asyncio.wait_for(asyncio.shield(future), timeout=EVAL_TASK_TIMEOUT)
+    except asyncio.TimeoutError:
+        _abandoned += 1
+        future.add_done_callback(_abandoned_done)
+        raise EvaluationTimeout(f"evaluation did not finish within {EVAL_TASK_TIMEOUT:g}s")
+    except BrokenProcessPool:
+        # A worker died (OOM, segfault); replace the pool so later requests recover
+        LOG.error("Evaluation pool broken; restarting it.")
+        _pool = None
+        start_pool(warm_up=False)
+        raise
+
+async def _cache_io(fn, *args):
+    # The disk tier is blocking SQLite I/O, so it must not run on the event loop
+    if get_evaluation_cache().disk_enabled:
+        return await run_in_threadpool(fn, *args)
+    return fn(*args)
+
+async def evaluate_answer(
+    user_answer: str,
+    benchmark_answer: str,
+    question_keywords=None,
+    weights: Dict[str, float] = None,
+    benchmark_embedding=None
+) -> Dict:
+    cache = get_evaluation_cache()
+    key = evaluation_cache_key(user_answer, benchmark_answer, question_keywords, weights)
+    result = await _cache_io(cache.get, key)
+    if result is None:
+        result = await _submit(
+            nlp_engine.evaluate_answer,
+            user_answer,
+            benchmark_answer,
+            question_keywords=question_keywords,
+            weights=weights,
+            benchmark_embedding=benchmark_embedding,
+        )
+        await _cache_io(cache.put, key, result)
+    return result
+
+async def evaluate_answers_batch(items: List[Dict], weights: Dict[str, float] = None) -> List[Dict]:
+    results, keys, missing = await _cache_io(lookup_batch, items, weights)
+    if missing:
+        fresh = await _submit(nlp_engine.evaluate_answers_batch, [items[i] for i in missing], weights=weights)
+        await _cache_io(store_batch, results, keys, missing, fresh)
+    return results
+
+def executor_stats() -> Dict:
+    return {
+        "pool_workers": EVAL_POOL_WORKERS if _pool is not None else 0,
+        "in_flight": _in_flight,
+        "abandoned": _abandoned,
+        "queue_depth": EVAL_QUEUE_DEPTH,
+        "task_timeout_s": EVAL_TASK_TIMEOUT,
+        **readiness(),
+    }
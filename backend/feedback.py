@@ -27,6 +27,41 @@ Evaluator output:
 ---------------------------------------------------
 """
 
+def normalize(value):
+    """
+    Normalizes ANY incoming score into a 0–10 scale.
+    Handles:
+        - 0–1 scores → converted to 0–10
+        - 0–10 scores → kept as-is
+        - 10–100 → treated as percentage → scaled down (÷10)
+        - >100 → forced to 10
+        - negative → forced to 0
+    """
+    try:
+        v = float(value)
+    except:
+        return 0.0
+
+    # Case: 0–1 → scale to 0–10
+    if 0 <= v <= 1:
+        return round(v * 10, 2)
+
+    # Case: 1–10 → already correct
+    if 1 < v <= 10:
+        return round(v, 2)
+
+    # Case: 10–100 → assume percentage
+    if 10 < v <= 100:
+        return round(v / 10, 2)
+
+    # Garbage values above 100
+    if v > 100:
+        return 10.0
+
+    # Negative values
+    return 0.0
+
+
 def classify_performance(score: float) -> str:
     if score >= 7:
         return "high"
@@ -0,0 +1,214 @@
+"""
+Background job state, kept in a local SQLite file.
+
+A job runs inside the worker process that accepted it, but its progress lives
+here, so a poll to GET /api/jobs/{id} can be answered by any uvicorn worker.
+Finished items are rows of their own (job_items), so reporting a chunk is one
+insert no matter how many items the job already has.
+
+A job whose worker process is gone, or that has not reported progress for
+JOB_STALE_SECONDS, can never finish: it is marked failed ("interrupted") when a
+worker starts and when it is polled, so clients stop waiting for it. Finished
+jobs are deleted JOB_TTL_SECONDS after they last changed.
+
+    JOB_STORE_PATH      SQLite file for job state (default cache/jobs.db)
+    JOB_TTL_SECONDS     how long finished jobs are kept (default 86400)
+    JOB_STALE_SECONDS   queued / running jobs silent for this long are interrupted (default 1800)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+LOG = logging.getLogger("job_store")
+
+JOB_STORE_PATH = Path(os.getenv("JOB_STORE_PATH", str(Path("cache") / "jobs.db")))
+JOB_TTL_SECONDS = float(os.getenv("JOB_TTL_SECONDS", str(24 * 3600)))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "1800"))
+# create() prunes finished jobs at most this often
+JOB_PRUNE_INTERVAL = 600.0
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+JOB_INTERRUPTED_ERROR = "Interrupted: the worker running this job stopped before it finished. Start the job again."
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    def __init__(self, path: Path = JOB_STORE_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._last_prune = 0.0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " session_id INTEGER,"
+            " status TEXT NOT NULL,"
+            " done INTEGER NOT NULL DEFAULT 0,"
+            " total INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT,"
+            " worker_pid INTEGER,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_status_updated_at ON jobs (status, updated_at)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_items ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " job_id TEXT NOT NULL,"
+            " failed INTEGER NOT NULL DEFAULT 0,"
+            " data TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_job_items_job_id ON job_items (job_id, seq)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def create(self, kind: str, session_id: Optional[int] = None, total: int = 0) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        if now - self._last_prune > JOB_PRUNE_INTERVAL:
+            self.prune()
+        self._connect().execute(
+            "INSERT INTO jobs (id, kind, session_id, status, total, worker_pid, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, session_id, JOB_QUEUED, total, os.getpid(), now, now),
+        )
+        return job_id
+
+    def start(self, job_id: str, total: int) -> None:
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, total = ?, updated_at = ? WHERE id = ?",
+            (JOB_RUNNING, total, time.time(), job_id),
+        )
+
+    def add_results(self, job_id: str, results: List[Dict[str, Any]], failures: List[Dict[str, Any]] = ()) -> None:
+        """Append finished (and failed) items and advance the done counter, atomically."""
+        rows = [(job_id, 0, json.dumps(r)) for r in results] + [(job_id, 1, json.dumps(f)) for f in failures]
+        if not rows:
+            return
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            updated = conn.execute(
+                "UPDATE jobs SET done = done + ?, updated_at = ? WHERE id = ?",
+                (len(rows), time.time(), job_id),
+            ).rowcount
+            if updated:
+                conn.executemany("INSERT INTO job_items (job_id, failed, data) VALUES (?, ?, ?)", rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def finish(self, job_id: str, error: Optional[str] = None) -> None:
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+            (JOB_FAILED if error else JOB_COMPLETED, error, time.time(), job_id),
+        )
+
+    def _interrupted(self, row: sqlite3.Row, now: float) -> bool:
+        if row["status"] not in (JOB_QUEUED, JOB_RUNNING):
+            return False
+        return not _pid_alive(row["worker_pid"]) or now - row["updated_at"] > JOB_STALE_SECONDS
+
+    def _mark_interrupted(self, job_ids: List[str], now: float) -> None:
+        # The status guard keeps a job that finished in the meantime as it is
+        self._connect().executemany(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ? AND status IN (?, ?)",
+            [(JOB_FAILED, JOB_INTERRUPTED_ERROR, now, job_id, JOB_QUEUED, JOB_RUNNING) for job_id in job_ids],
+        )
+
+    def recover_interrupted(self) -> int:
+        """
+        Fail queued / running jobs whose worker is gone (or that went silent).
+        Call at worker startup: jobs recorded under this process's own pid belong
+        to an earlier process that had the same pid. Returns the number marked.
+        """
+        now = time.time()
+        rows = self._connect().execute(
+            "SELECT id, status, worker_pid, updated_at FROM jobs WHERE status IN (?, ?)",
+            (JOB_QUEUED, JOB_RUNNING),
+        ).fetchall()
+        stale = [row["id"] for row in rows if row["worker_pid"] == os.getpid() or self._interrupted(row, now)]
+        if stale:
+            self._mark_interrupted(stale, now)
+            LOG.warning("Marked %d interrupted job(s) as failed.", len(stale))
+        return len(stale)
+
+    def prune(self, ttl: float = None) -> int:
+        """Delete finished jobs (and their items) that last changed more than ttl seconds ago."""
+        ttl = JOB_TTL_SECONDS if ttl is None else ttl
+        self._last_prune = time.time()
+        cutoff = self._last_prune - ttl
+        finished = "SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?"
+        params = (JOB_COMPLETED, JOB_FAILED, cutoff)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"DELETE FROM job_items WHERE job_id IN ({finished})", params)
+            deleted = conn.execute(f"DELETE FROM jobs WHERE id IN ({finished})", params).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if deleted:
+            LOG.info("Pruned %d finished job(s).", deleted)
+        return deleted
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if self._interrupted(row, now):
+            self._mark_interrupted([job_id], now)
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        job = dict(row)
+        items = conn.execute("SELECT failed, data FROM job_items WHERE job_id = ? ORDER BY seq", (job_id,)).fetchall()
+        job["results"] = [json.loads(item["data"]) for item in items if not item["failed"]]
+        job["failures"] = [json.loads(item["data"]) for item in items if item["failed"]]
+        job["progress"] = round(job["done"] / job["total"], 3) if job["total"] else (1.0 if job["status"] == JOB_COMPLETED else 0.0)
+        return job
+
+
+_store: Optional[JobStore] = None
+_store_lock = threading.Lock()
+
+def get_job_store() -> JobStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = JobStore()
+    return _store
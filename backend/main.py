@@ -1,53 +1,167 @@
 # backend/main.py
 
 # 1. Import all the necessary tools from FastAPI and other libraries.
-from feedback import generate_feedback
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends
+from feedback import generate_feedback, normalize
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
-import fitz, docx, io
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+from collections import defaultdict
 import time
+import os
+import base64
+import asyncio
 import logging
 from pathlib import Path
 import json
+from typing import Optional
 # Local modules / project files
 import sql_models
 import models
-from database import SessionLocal, engine
-from resume_parser import get_ranked_domains
-from question_bank_handler import load_questions_from_file, select_questions, get_next_question
+from database import (
+    SessionLocal,
+    engine,
+    add_missing_columns,
+    add_missing_indexes,
+    get_async_sessionmaker,
+    dispose_async_engine,
+    pool_metrics,
+    async_pool_stats,
+    retry_on_conflict,
+)
+from resume_extraction import (
+    analyze_resume,
+    lookup_cached_domains,
+    store_domains,
+    read_upload_limited,
+    ResumeTooLarge,
+    UploadSizeLimit,
+    RESUME_MAX_BYTES,
+    PDF_MIMETYPE,
+    DOCX_MIMETYPE,
+)
+from job_store import get_job_store, JOB_QUEUED
+import answer_store
+from question_bank_handler import (
+    load_questions_from_file,
+    question_count,
+    select_questions,
+    get_next_question,
+    get_benchmark_embedding,
+    get_question_keyword_matcher,
+)
 
 # NLP evaluation engine (your provided engine file)
 # Ensure the file is placed as backend/nlp_evaluation_engine.py or adjust the import
-from nlp_evaluation_engine import init_models as nlp_init_models, evaluate_answer as nlp_evaluate_answer
+from nlp_evaluation_engine import (
+    init_models as nlp_init_models,
+    freeze_models as nlp_freeze_models,
+    engine_version as nlp_engine_version,
+)
+from evaluation_cache import evaluation_cache_stats
+# Scoring runs in the evaluation executor (process pool); cache hits are served in-process
+import evaluation_executor
+from evaluation_executor import (
+    evaluate_answer as nlp_evaluate_answer,
+    evaluate_answers_batch as nlp_evaluate_answers_batch,
+    EvaluationQueueFull,
+    EvaluationTimeout,
+    EvaluationNotReady,
+)
 
 # This line creates the database file and tables if they don't exist.
 sql_models.Base.metadata.create_all(bind=engine)
+# ...and adds columns introduced since an existing database file was created.
+add_missing_columns(engine)
+add_missing_indexes(engine)
+# ...and moves answers saved in the old interview_results blobs into their tables,
+# then fills the summary columns of sessions created before they existed.
+answer_store.migrate_legacy_results(SessionLocal)
+answer_store.backfill_session_summaries(SessionLocal)
 
 # App + logger
 app = FastAPI(title="Interview Coach API")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("main")
 
+# evaluate-all scores answers in chunks of this size, concurrently, persisting each as it lands
+EVALUATE_ALL_CHUNK_SIZE = int(os.getenv("EVALUATE_ALL_CHUNK_SIZE", "4"))
+# ...with at most this many chunks in flight per request
+EVALUATE_ALL_CONCURRENCY = int(os.getenv("EVALUATE_ALL_CONCURRENCY", "4"))
+
+# Cohort endpoints create / evaluate this many sessions per transaction
+COHORT_CHUNK_SIZE = int(os.getenv("COHORT_CHUNK_SIZE", "50"))
+# ...score answers from all sessions of a chunk together, this many per engine batch
+COHORT_EVAL_BATCH_SIZE = int(os.getenv("COHORT_EVAL_BATCH_SIZE", "32"))
+# ...and accept at most this many sessions per call
+COHORT_MAX_SESSIONS = int(os.getenv("COHORT_MAX_SESSIONS", "1000"))
+
+# Questions picked for every new session
+QUESTIONS_PER_SESSION = 10
+
+# "startup": load + warm up the NLP models before serving (default).
+# "background": serve immediately; evaluation endpoints answer 503 until the models are ready.
+MODEL_LOADING = os.getenv("MODEL_LOADING", "startup").lower()
+
+# Score each answer in the background as soon as it is saved (overridable per request with ?eager=)
+EAGER_SCORING = os.getenv("EAGER_SCORING", "0").lower() in ("1", "true", "yes")
+
+# Strong references to in-flight background jobs (asyncio only keeps weak ones)
+_background_tasks = set()
+# In-flight eager scoring tasks per session id
+_eager_tasks = {}
+
+# Set by serve.py when it loaded the question bank and models before forking this worker
+PRELOADED = False
+
 # ========= STARTUP: load question bank + initialize NLP models =========
 @app.on_event("startup")
 def on_startup():
-    # Load question bank into memory
+    # Jobs left queued / running by a worker that is gone never finish: fail them so
+    # pollers stop waiting, and drop finished jobs past their TTL
     try:
-        load_questions_from_file()
-        logger.info("Question bank loaded.")
+        jobs = get_job_store()
+        jobs.recover_interrupted()
+        jobs.prune()
     except Exception as e:
-        logger.exception("Failed to load question bank: %s", e)
-        # Not failing startup — but you can choose to raise if you want fail-fast.
-
-    # Initialize heavy NLP models (from your engine)
+        logger.exception("Job store maintenance failed: %s", e)
+
+    if PRELOADED:
+        logger.info("Question bank and NLP models preloaded by the launcher.")
+    else:
+        # Load question bank into memory
+        try:
+            load_questions_from_file()
+            logger.info("Question bank loaded.")
+        except Exception as e:
+            logger.exception("Failed to load question bank: %s", e)
+            # Not failing startup — but you can choose to raise if you want fail-fast.
+
+    # Load (or, when preloaded, just warm up) the NLP models where scoring runs:
+    # in the evaluation pool's workers when it is enabled, in this process otherwise.
+    if MODEL_LOADING == "background":
+        evaluation_executor.prepare_in_background()
+        logger.info("Loading NLP models in the background; evaluation endpoints return 503 until ready.")
+        return
     try:
-        nlp_init_models()
-        logger.info("NLP models initialized.")
+        evaluation_executor.prepare()
+        logger.info("NLP models ready.")
     except Exception as e:
         logger.exception("Failed to init NLP models at startup: %s", e)
         # Re-raise if you prefer to fail fast:
         # raise
 
+@app.on_event("shutdown")
+def on_shutdown():
+    evaluation_executor.shutdown_pool()
+
+@app.on_event("shutdown")
+async def close_async_database():
+    await dispose_async_engine()
+
 # Dependency: This function provides a database session for each API request
 def get_db():
     db = SessionLocal()
@@ -55,7 +169,63 @@ def get_db():
         yield db
     finally:
         db.close()
-        
+
+# Async dependency for the interview-flow endpoints: they await the database on
+# the event loop instead of each holding a threadpool thread while it answers
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+def _get_session_or_404(db: Session, session_id: int) -> sql_models.InterviewSession:
+    session = db.query(sql_models.InterviewSession).filter(sql_models.InterviewSession.id == session_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+async def _get_session_or_404_async(db: AsyncSession, session_id: int, fresh: bool = False) -> sql_models.InterviewSession:
+    # fresh: reload even if the session is already in the identity map (retries after a conflict)
+    session = await db.get(sql_models.InterviewSession, session_id, populate_existing=fresh)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+def _store(db: Session, write, *args):
+    """Run an answer_store write and commit it (through run_in_threadpool)."""
+    result = write(db, *args)
+    db.commit()
+    return result
+
+def _require_evaluation_ready() -> None:
+    """Dependency for scoring endpoints: 503 while the models load (and retry a failed load)."""
+    if not evaluation_executor.is_ready():
+        state = evaluation_executor.readiness()
+        evaluation_executor.prepare_in_background()
+        detail = "Evaluation models are still loading, retry shortly."
+        if state["error"] and not state["loading"]:
+            detail = f"Evaluation models failed to load ({state['error']}); retrying."
+        raise HTTPException(status_code=503, detail=detail, headers={"Retry-After": "10"})
+
+async def _run_evaluation(coro):
+    """Await an evaluation_executor call, mapping back-pressure to HTTP errors."""
+    try:
+        return await coro
+    except EvaluationNotReady as e:
+        raise HTTPException(status_code=503, detail=f"{e}, retry shortly.", headers={"Retry-After": "10"})
+    except EvaluationQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"Evaluation queue is full, retry shortly ({e}).", headers={"Retry-After": "5"})
+    except EvaluationTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
+# The engine reports similarity as "semantic_score"; older engines used the other two names
+_SIMILARITY_KEYS = ("semantic_score", "similarity_score", "similarity")
+
+def _similarity_of(result: dict) -> float:
+    """Semantic similarity (0–1) from an engine result, whichever key it uses."""
+    for key in _SIMILARITY_KEYS:
+        if key in result:
+            return float(result[key] or 0.0)
+    return 0.0
+
 def map_scores_for_feedback(details):
     # Convert NLP (0–1) metrics into 0–3 rubric scale
     accuracy = round(details.get("similarity", 0) * 3, 2)
@@ -70,74 +240,55 @@ def map_scores_for_feedback(details):
         "relevance": relevance
     }
 
-def normalize(value):
-    """
-    Normalizes ANY incoming score into a 0–10 scale.
-    Handles:
-        - 0–1 scores → converted to 0–10
-        - 0–10 scores → kept as-is
-        - 10–100 → treated as percentage → scaled down (÷10)
-        - >100 → forced to 10
-        - negative → forced to 0
-    """
-    try:
-        v = float(value)
-    except:
-        return 0.0
-
-    # Case: 0–1 → scale to 0–10
-    if 0 <= v <= 1:
-        return round(v * 10, 2)
-
-    # Case: 1–10 → already correct
-    if 1 < v <= 10:
-        return round(v, 2)
-
-    # Case: 10–100 → assume percentage
-    if 10 < v <= 100:
-        return round(v / 10, 2)
-
-    # Garbage values above 100
-    if v > 100:
-        return 10.0
-
-    # Negative values
-    return 0.0
-
-
 # --- Resume Analysis Endpoint ---
+# Counts the upload as it streams in and answers 413 once it passes RESUME_MAX_BYTES,
+# with or without a Content-Length, before the multipart body is spooled
+app.add_middleware(UploadSizeLimit, paths=("/api/get-domains",), max_bytes=RESUME_MAX_BYTES)
+
 @app.post("/api/get-domains", response_model=models.DomainResponse, tags=["Resume Processing"])
 async def get_domains_from_resume(resume: UploadFile = File(...)):
-    allowed_mimetypes = [
-        "application/pdf",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    ]
-    if resume.content_type not in allowed_mimetypes:
+    if resume.content_type not in (PDF_MIMETYPE, DOCX_MIMETYPE):
         raise HTTPException(status_code=400, detail="Invalid file type. Allowed: pdf, docx")
 
     try:
-        file_stream = io.BytesIO(await resume.read())
-
-        if resume.content_type == "application/pdf":
-            extracted_text = "".join([page.get_text() for page in fitz.open(stream=file_stream, filetype="pdf")])
-        else:
-            extracted_text = "\n".join([p.text for p in docx.Document(file_stream).paragraphs])
+        t0 = time.perf_counter()
+        data = await read_upload_limited(resume)
+        read_ms = (time.perf_counter() - t0) * 1000
+
+        # Same bytes + same skill map -> same domains; a re-upload skips parsing
+        cache_key, top_domains_data = await run_in_threadpool(lookup_cached_domains, data)
+        if top_domains_data is not None:
+            logger.info("Resume %r: %d bytes, read %.1f ms, served from cache", resume.filename, len(data), read_ms)
+            return {
+                "filename": resume.filename,
+                "top_domains": top_domains_data
+            }
 
-        top_domains_data = get_ranked_domains(extracted_text)
+        # Extraction and ranking run on the bounded resume parse pool, not the event loop
+        top_domains_data, info = await analyze_resume(data, resume.content_type)
+        await run_in_threadpool(store_domains, cache_key, top_domains_data)
+        logger.info(
+            "Resume %r: %d bytes, read %.1f ms, extract %.1f ms, rank %.1f ms, %d chars%s%s",
+            resume.filename, len(data), read_ms, info["extract_ms"], info["rank_ms"], info["chars"],
+            f", pages {info['pages_read']}/{info['total_pages']}" if "total_pages" in info else "",
+            " (truncated)" if info["truncated"] else "",
+        )
 
         return {
             "filename": resume.filename,
             "top_domains": top_domains_data
         }
+    except ResumeTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         logger.exception("Resume processing failed: %s", e)
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
 
 # --- Interview Session Endpoint ---
 @app.post("/api/sessions", response_model=models.SessionResponse, tags=["Interview Sessions"])
-def create_interview_session(
+async def create_interview_session(
     session_data: models.SessionCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Creates a new interview session and stores it in the database.
@@ -147,30 +298,31 @@ def create_interview_session(
         difficulty_level=session_data.difficulty_level,
         resume_analysis_result=session_data.resume_analysis_result.model_dump()
     )
+    if session_data.user_id:
+        new_session.user_id = session_data.user_id
 
-    # Ensure generated_questions and interview_results are initialized as empty lists
+    # Ensure generated_questions is initialized as an empty list (answers live in their own table)
     new_session.generated_questions = [] if new_session.generated_questions is None else new_session.generated_questions
-    new_session.interview_results = [] if new_session.interview_results is None else new_session.interview_results
 
     db.add(new_session)
-    db.commit()
-    db.refresh(new_session)
+    await db.commit()
+    # Loads the server-side defaults (session_date)
+    await db.refresh(new_session)
 
     return new_session
 
 # --- Generate questions for a session (phase 2) ---
 @app.post("/api/sessions/{session_id}/generate-questions", tags=["Interview Sessions"])
-def generate_interview_questions(session_id: int, db: Session = Depends(get_db)):
-    session = db.query(sql_models.InterviewSession).filter(sql_models.InterviewSession.id == session_id).first()
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+async def generate_interview_questions(session_id: int, db: AsyncSession = Depends(get_async_db)):
+    await _get_session_or_404_async(db, session_id)
 
-    try:
+    async def attempt():
+        session = await _get_session_or_404_async(db, session_id, fresh=True)
         # select_questions returns {"questions": [...], "meta": {...}}
         selection = select_questions(
             domain=session.selected_domain,
             difficulty=session.difficulty_level,
-            num_questions=10
+            num_questions=QUESTIONS_PER_SESSION
         )
 
         selected_questions = selection.get("questions", [])
@@ -181,12 +333,14 @@ def generate_interview_questions(session_id: int, db: Session = Depends(get_db))
                 detail=f"No questions found for domain '{session.selected_domain}' and difficulty '{session.difficulty_level}'."
             )
 
-        # Save only the actual questions list
+        # Save only the actual questions list (compare-and-swap on the session's version)
         session.generated_questions = selected_questions
-        session.interview_results = session.interview_results or []
 
-        db.commit()
-        db.refresh(session)
+        await db.commit()
+        return selected_questions
+
+    try:
+        selected_questions = await retry_on_conflict(db, attempt)
 
         # And return a clean structure
         return {
@@ -194,28 +348,22 @@ def generate_interview_questions(session_id: int, db: Session = Depends(get_db))
             "questions": selected_questions
         }
 
+    except StaleDataError:
+        raise HTTPException(status_code=409, detail="The session was modified by another request; try again.")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.exception("Error generating questions: %s", e)
         raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
 
 
 # ---------------------- Helper: determine next question respecting answered questions ----------------------
-def _get_next_unanswered_question(session_obj):
+def _get_next_unanswered_question(session_obj, answered_questions):
     """
     Determine the next question from session.generated_questions that has not been answered yet.
     We assume questions have unique 'id' or unique 'question' text.
-    This function reads session.interview_results and checks for 'raw' or 'evaluated' entries.
+    answered_questions: question texts with a saved answer or evaluation (answer_store.answered_questions).
     """
     generated = session_obj.generated_questions or []
-    answered_questions = set()
-    for entry in (session_obj.interview_results or []):
-        if not isinstance(entry, dict):
-            continue
-        # raw or evaluated entries store "question" key
-        qtext = entry.get("question")
-        if qtext:
-            answered_questions.add(qtext.strip())
 
     for q in generated:
         qtext = q.get("question") if isinstance(q, dict) else None
@@ -228,17 +376,18 @@ def _get_next_unanswered_question(session_obj):
 
 # --- Sequential Question Flow: get next question based on answered questions ---
 @app.post("/api/sessions/{session_id}/next-question", tags=["Interview Sessions"])
-def next_question(session_id: int, payload: dict, db: Session = Depends(get_db)):
+async def next_question(session_id: int, payload: dict, db: AsyncSession = Depends(get_async_db)):
     """
     Returns the next question in sequence using simple answered-question tracking.
     payload = { "current_question": {...} }  -- current_question optional
     """
-    session = db.query(sql_models.InterviewSession).filter(sql_models.InterviewSession.id == session_id).first()
+    session = await db.get(sql_models.InterviewSession, session_id)
     if not session or not session.generated_questions:
         raise HTTPException(status_code=404, detail="No questions found for this session. Generate questions first.")
 
     # If client passes current_question, we trust it but still compute next based on stored answers.
-    next_q = _get_next_unanswered_question(session)
+    answered = await db.run_sync(answer_store.answered_questions, session_id)
+    next_q = _get_next_unanswered_question(session, answered)
     if not next_q:
         return {"message": "No more questions."}
 
@@ -246,48 +395,79 @@ def next_question(session_id: int, payload: dict, db: Session = Depends(get_db))
 
 # ---------------------- Save raw user answer (no evaluation) ----------------------
 @app.post("/api/sessions/{session_id}/save-answer", tags=["Interview Sessions"])
-def save_user_answer(session_id: int, payload: dict, db: Session = Depends(get_db)):
+async def save_user_answer(session_id: int, payload: dict, eager: Optional[bool] = None, db: AsyncSession = Depends(get_async_db)):
     """
-    Saves the user's raw answer (no evaluation).
+    Saves the user's raw answer.
     payload = {"question": "What is AI?", "answer": "Artificial intelligence is..."}
-    We tag entries with "type": "raw" so they can be bulk-evaluated later.
+    We tag entries with "type": "raw", a unique "id" and "state": "pending" so they can be bulk-evaluated later.
+
+    With eager scoring (?eager=true, or EAGER_SCORING=1 by default) the answer is
+    also scored in the background right away, so evaluate-all only has to
+    collect results that already exist.
     """
-    session = db.query(sql_models.InterviewSession).filter(sql_models.InterviewSession.id == session_id).first()
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    await _get_session_or_404_async(db, session_id)
 
     try:
-        entry = {
-            "type": "raw",
-            "question": payload.get("question", ""),
-            "answer": payload.get("answer", ""),
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
-        }
+        # One INSERT (and the revision bump); the session row itself is not rewritten
+        entry = await db.run_sync(answer_store.add_answer, session_id, payload.get("question", ""), payload.get("answer", ""))
+        await db.commit()
 
-        current_results = session.interview_results or []
-        current_results.append(entry)
-        session.interview_results = current_results
+        scoring = EAGER_SCORING if eager is None else eager
+        if scoring:
+            _schedule_eager_scoring(session_id, entry["id"])
 
-        db.commit()
-        db.refresh(session)
-
-        return {"message": "✅ Answer saved successfully!", "entry": entry}
+        return {"message": "✅ Answer saved successfully!", "entry": entry, "eager_scoring": scoring}
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.exception("save_user_answer failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _score_saved_answer(session_id: int, raw_id: str) -> None:
+    """Eager scoring of one saved answer. Failures are left for evaluate-all to retry."""
+    db = SessionLocal()
+    try:
+        session = await run_in_threadpool(_get_session_or_404, db, session_id)
+        raw = next((r for r in await run_in_threadpool(answer_store.pending_answers, db, session_id) if r.get("id") == raw_id), None)
+        if raw is None:
+            return
+        async for _, failures in _iter_evaluated_chunks(db, session, [raw]):
+            if failures:
+                logger.warning("Eager scoring of answer %s (session %s) failed; evaluate-all will retry.", raw_id, session_id)
+    except Exception as e:
+        logger.warning("Eager scoring of answer %s (session %s) failed; evaluate-all will retry: %s", raw_id, session_id, e)
+        await run_in_threadpool(db.rollback)
+    finally:
+        await run_in_threadpool(db.close)
+
+def _schedule_eager_scoring(session_id: int, raw_id: str) -> None:
+    task = asyncio.create_task(_score_saved_answer(session_id, raw_id))
+    _eager_tasks.setdefault(session_id, set()).add(task)
+
+    def _done(t):
+        tasks = _eager_tasks.get(session_id)
+        if tasks is not None:
+            tasks.discard(t)
+            if not tasks:
+                _eager_tasks.pop(session_id, None)
+
+    task.add_done_callback(_done)
+
+async def _wait_for_eager_scoring(session_id: int) -> None:
+    """Let this worker's in-flight eager scoring for the session land before collecting results."""
+    tasks = list(_eager_tasks.get(session_id, ()))
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
 # ---------------------- Evaluate single answer (existing endpoint) ----------------------
-@app.post("/api/sessions/{session_id}/evaluate-answer", tags=["Interview Sessions"])
-def evaluate_answer(session_id: int, payload: models.AnswerPayload, db: Session = Depends(get_db)):
+@app.post("/api/sessions/{session_id}/evaluate-answer", tags=["Interview Sessions"], dependencies=[Depends(_require_evaluation_ready)])
+async def evaluate_answer(session_id: int, payload: models.AnswerPayload, db: Session = Depends(get_db)):
     """
     Evaluates a user's answer and saves the result to the database.
     This endpoint evaluates a single provided answer immediately and tags it as 'evaluated'.
+    Scoring is awaited on the evaluation executor; DB work runs in the threadpool.
     """
-    session = db.query(sql_models.InterviewSession).filter(sql_models.InterviewSession.id == session_id).first()
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    session = await run_in_threadpool(_get_session_or_404, db, session_id)
 
     try:
         # Fetch full question object from session.generated_questions
@@ -299,14 +479,19 @@ def evaluate_answer(session_id: int, payload: models.AnswerPayload, db: Session
 
         # NOTE: benchmark_answer should actually be the model/expected answer text if available.
         benchmark_answer = matched_q.get("expected_answer", matched_q.get("question", ""))
-        keywords = matched_q.get("keywords_str", "").split(",") if matched_q.get("keywords_str") else []
+        keywords = get_question_keyword_matcher(matched_q)
+        # The bank's precomputed vectors are for the question text only
+        benchmark_embedding = None
+        if "expected_answer" not in matched_q:
+            benchmark_embedding = await run_in_threadpool(get_benchmark_embedding, matched_q.get("id"))
 
         # Call NLP engine
-        result = nlp_evaluate_answer(
+        result = await _run_evaluation(nlp_evaluate_answer(
             user_answer=payload.answer,
             benchmark_answer=benchmark_answer,
-            question_keywords=keywords
-        ) or {}
+            question_keywords=keywords,
+            benchmark_embedding=benchmark_embedding
+        )) or {}
 
         # --- Normalize raw engine score (be defensive about key naming) ---
         # engine might return 'final_score' (0-100), 'score' (0-10), or 'final' etc.
@@ -322,7 +507,7 @@ def evaluate_answer(session_id: int, payload: models.AnswerPayload, db: Session
         # If engine didn't return a single final number, try to compute one from components
         if raw_score is None:
             # try common components (0-1)
-            sim = float(result.get("similarity_score", result.get("similarity", 0))) or 0.0
+            sim = _similarity_of(result)
             kw = float(result.get("keyword_score", result.get("keyword_match", 0))) or 0.0
             clarity = float(result.get("clarity", 0)) or 0.0
 
@@ -344,15 +529,18 @@ def evaluate_answer(session_id: int, payload: models.AnswerPayload, db: Session
         # Now normalize the raw_score into 0-10 using your normalize()
         score = normalize(raw_score)
 
-        # Build a canonical details dict (0-1 for components where possible)
+        # Build a canonical details dict (0-1 for components where possible).
+        # "similarity" was always 0 here until the engine's semantic_score was read, so
+        # evaluations stored before that carry 0 (their real value is in engine_extra)
+        # and a report's accuracy criterion (similarity x 3) differs between the two.
         canonical_details = {
-            "similarity": float(result.get("similarity_score", result.get("similarity", 0))) or 0.0,
+            "similarity": _similarity_of(result),
             "clarity": float(result.get("clarity", 0)) or 0.0,
             "keyword_match": float(result.get("keyword_score", result.get("keyword_match", 0))) or 0.0,
             # Keep engine's final raw numeric under details as well for traceability:
             "engine_raw_score": raw_score,
             # include any other engine-provided parts verbatim (non-normalized)
-            "engine_extra": {k: v for k, v in result.items() if k not in ("similarity_score", "similarity", "clarity", "keyword_score", "keyword_match", "final_score", "score", "raw_score")}
+            "engine_extra": {k: v for k, v in result.items() if k not in _SIMILARITY_KEYS + ("clarity", "keyword_score", "keyword_match", "final_score", "score", "raw_score")}
         }
 
         evaluation_result = {
@@ -365,157 +553,617 @@ def evaluate_answer(session_id: int, payload: models.AnswerPayload, db: Session
             "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
         }
 
-        # Append to interview_results
-        current_results = session.interview_results or []
-        current_results.append(evaluation_result)
-        session.interview_results = current_results
-
-        db.commit()
-        db.refresh(session)
+        await run_in_threadpool(_store, db, answer_store.add_evaluation, session_id, evaluation_result)
 
         return evaluation_result
 
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
         logger.exception("evaluate_answer failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # ---------------------- Evaluate All Raw Answers (bulk evaluation) ----------------------
-@app.post("/api/sessions/{session_id}/evaluate-all", tags=["Interview Sessions"])
-def evaluate_all(session_id: int, db: Session = Depends(get_db)):
-    session = db.query(sql_models.InterviewSession).filter(sql_models.InterviewSession.id == session_id).first()
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+def _build_batch_items(session: sql_models.InterviewSession, raw_entries: list) -> list:
+    """Benchmark text, precomputed embedding and keyword matcher for each raw answer."""
+    batch_items = []
+    for raw in raw_entries:
+        question_text = raw.get("question", "")
+        user_answer = raw.get("answer", "")
+
+        # Extract benchmark + keywords
+        benchmark_answer = ""
+        benchmark_embedding = None
+        question_keywords = None
+
+        for q in (session.generated_questions or []):
+            if q.get("question") == question_text:
+                benchmark_answer = q.get("question", "")
+                benchmark_embedding = get_benchmark_embedding(q.get("id"))
+                question_keywords = get_question_keyword_matcher(q)
+                break
+
+        batch_items.append({
+            "user_answer": user_answer,
+            "benchmark_answer": benchmark_answer,
+            "benchmark_embedding": benchmark_embedding,
+            "question_keywords": question_keywords
+        })
+    return batch_items
+
+def _build_evaluated_entry(raw: dict, eval_result: dict) -> dict:
+    """Turn one engine result into the stored / returned "evaluated" entry (0–10 score + feedback)."""
+    question_text = raw.get("question", "")
+    user_answer = raw.get("answer", "")
+
+    # Extract NLP Components
+    sim = _similarity_of(eval_result)  # 0–1
+    relevance = float(eval_result.get("relevance", 0))    # 0–1
+    clarity = float(eval_result.get("clarity", 0))        # 0–1
+    keyword_match = float(eval_result.get("keyword_score", 0))  # 0–1
+
+    # -------- Length Score (0–1) --------
+    wc = len(user_answer.split())
+    if wc < 8:
+        length_score = 0.1
+    elif wc < 15:
+        length_score = 0.4
+    elif wc < 25:
+        length_score = 0.7
+    elif wc < 60:
+        length_score = 1.0
+    else:
+        length_score = 0.6  # too long, reduce score
+
+    # -------- Final Weighted Score (0–10) --------
+    weighted_sum = (
+        sim * 0.40 +
+        keyword_match * 0.25 +
+        length_score * 0.20 +
+        clarity * 0.15
+    )
+
+    # Theoretical max (1 * each weight)
+    max_possible = 0.40 + 0.25 + 0.20 + 0.15  # = 1.0 exactly
+
+    normalized = weighted_sum / max_possible   # always 0–1
+    final_score = round(normalized * 10, 2)    # convert to 0–10
+
+
+    # -------- Custom Human-like Feedback --------
+    feedback_parts = []
+    if final_score >= 8:
+        feedback_parts.append("Very strong answer. You covered key points with clarity and depth.")
+    elif final_score >= 6:
+        feedback_parts.append("Good answer, but you can increase depth and provide real examples.")
+    elif final_score >= 4:
+        feedback_parts.append("Average answer. Add more structure and include relevant concepts.")
+    else:
+        feedback_parts.append("Weak response. Revise fundamentals and give more elaborate explanations.")
+
+    if keyword_match < 0.4:
+        feedback_parts.append("You missed several important keywords from the expected answer.")
+
+    if clarity < 0.5:
+        feedback_parts.append("Your explanation lacked clarity or proper flow.")
+
+    if length_score < 0.3:
+        feedback_parts.append("Your answer was too short. Add more explanation.")
+
+    final_feedback = " ".join(feedback_parts)
+
+    evaluated_entry = {
+        "type": "evaluated",
+        "raw_id": raw.get("id"),
+        "engine_version": nlp_engine_version(),
+        "question": question_text,
+        "answer": user_answer,
+        "score": final_score,
+        "details": {
+            "similarity": sim,
+            "clarity": clarity,
+            "keyword_match": keyword_match,
+            "length_score": length_score,
+            "feedback": final_feedback
+        },
+        "evaluated_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+    return evaluated_entry
+
+def _evaluation_state(db: Session, session_id: int):
+    """(evaluations already collected, answers still pending) of a session."""
+    return answer_store.collected_evaluations(db, session_id), answer_store.pending_answers(db, session_id)
+
+async def _prepare_for_evaluation(db: Session, session: sql_models.InterviewSession):
+    """Let eager scoring land, then return (collected evaluations, pending answers)."""
+    await _wait_for_eager_scoring(session.id)
+    return await run_in_threadpool(_evaluation_state, db, session.id)
+
+def _error_detail(e: Exception) -> str:
+    detail = e.detail if isinstance(e, HTTPException) else str(e)
+    return detail or type(e).__name__
+
+async def _iter_evaluated_chunks(db: Session, session: sql_models.InterviewSession, raw_entries: list, chunk_size: int = None):
+    """
+    Shared core of evaluate-all (inline, background job, streaming, eager and re-evaluate).
+
+    Raw entries are scored in chunks of chunk_size (default
+    EVALUATE_ALL_CHUNK_SIZE) that run concurrently on the evaluation executor.
+    Each chunk is persisted, in input order, as soon as it and every chunk
+    before it are done, and yielded as (evaluations, failures). A chunk that
+    fails marks its answers "failed" and the rest carry on; a disconnect
+    midway keeps the work already committed.
+    """
+    batch_items = await run_in_threadpool(_build_batch_items, session, raw_entries)
+    size = max(1, chunk_size or EVALUATE_ALL_CHUNK_SIZE)
+    chunks = [(raw_entries[i:i + size], batch_items[i:i + size]) for i in range(0, len(raw_entries), size)]
+    # Bounded so one large session can't fill the executor queue on its own
+    limit = asyncio.Semaphore(max(1, EVALUATE_ALL_CONCURRENCY))
+
+    async def score(items):
+        async with limit:
+            return await _run_evaluation(nlp_evaluate_answers_batch(items))
+
+    tasks = [asyncio.ensure_future(score(items)) for _, items in chunks]
 
     try:
-        all_results = session.interview_results or []
-        raw_entries = [r for r in all_results if r.get("type") == "raw"]
+        for (raws, _), task in zip(chunks, tasks):
+            try:
+                batch_results = await task
+            except Exception as e:
+                logger.warning("Scoring %d answer(s) of session %s failed: %s", len(raws), session.id, e)
+                detail = _error_detail(e)
+                failures = await run_in_threadpool(
+                    _store, db, answer_store.record_failures, session.id, {r["id"]: detail for r in raws}
+                )
+                yield [], failures
+                continue
+
+            entries = [_build_evaluated_entry(raw, res) for raw, res in zip(raws, batch_results)]
+            # Another task (eager scoring, another worker) may have scored some of these meanwhile
+            recorded = await run_in_threadpool(_store, db, answer_store.record_evaluations, session.id, entries)
+            yield recorded, []
+    finally:
+        for task in tasks:
+            task.cancel()
 
-        if not raw_entries:
-            return {"message": "No raw answers to evaluate.", "evaluations": []}
+async def _evaluate_raw_entries(db: Session, session: sql_models.InterviewSession, raw_entries: list, on_chunk=None):
+    """
+    Run the whole core; returns (evaluations, failures).
+    on_chunk(evaluations, failures) is awaited after each persisted chunk, for progress reporting.
+    """
+    evaluations, failures = [], []
+    async for entries, failed in _iter_evaluated_chunks(db, session, raw_entries):
+        evaluations.extend(entries)
+        failures.extend(failed)
+        if on_chunk is not None:
+            await on_chunk(entries, failed)
+    return evaluations, failures
+
+async def _run_evaluate_all_job(job_id: str, session_id: int) -> None:
+    """Background evaluate-all: own DB session, progress + partial results go to the job store."""
+    jobs = get_job_store()
+    db = SessionLocal()
+    try:
+        session = await run_in_threadpool(_get_session_or_404, db, session_id)
+        collected, pending = await _prepare_for_evaluation(db, session)
+        await run_in_threadpool(jobs.start, job_id, len(collected) + len(pending))
+        if collected:
+            await run_in_threadpool(jobs.add_results, job_id, collected)
 
-        evaluations = []
+        async def on_chunk(entries, failed):
+            await run_in_threadpool(jobs.add_results, job_id, entries, failed)
 
-        for raw in raw_entries:
-            question_text = raw.get("question", "")
-            user_answer = raw.get("answer", "")
+        await _evaluate_raw_entries(db, session, pending, on_chunk=on_chunk)
+        await run_in_threadpool(jobs.finish, job_id)
+    except Exception as e:
+        logger.exception("evaluate-all job %s failed: %s", job_id, e)
+        await run_in_threadpool(db.rollback)
+        await run_in_threadpool(jobs.finish, job_id, _error_detail(e))
+    finally:
+        await run_in_threadpool(db.close)
 
-            # Extract benchmark + keywords
-            benchmark_answer = ""
-            question_keywords = []
+@app.post("/api/sessions/{session_id}/evaluate-all", tags=["Interview Sessions"], dependencies=[Depends(_require_evaluation_ready)])
+async def evaluate_all(session_id: int, background: bool = False, db: Session = Depends(get_db)):
+    """
+    Score every raw answer of the session. Idempotent: answers already scored
+    (by an earlier call or eagerly on save-answer) are returned as-is, and only
+    pending or failed answers go through the engine.
+    ?background=true returns 202 with a job id immediately; poll GET /api/jobs/{job_id}
+    for progress and partial results.
+    """
+    session = await run_in_threadpool(_get_session_or_404, db, session_id)
+
+    if background:
+        total = await run_in_threadpool(answer_store.count_answers, db, session_id)
+        job_id = await run_in_threadpool(get_job_store().create, "evaluate-all", session_id, total)
+        task = asyncio.create_task(_run_evaluate_all_job(job_id, session_id))
+        # Keep a reference so the task isn't garbage-collected mid-run
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        return JSONResponse(
+            status_code=202,
+            content={"job_id": job_id, "status": JOB_QUEUED, "status_url": f"/api/jobs/{job_id}"},
+        )
 
-            for q in (session.generated_questions or []):
-                if q.get("question") == question_text:
-                    benchmark_answer = q.get("question", "")
-                    question_keywords = q.get("keywords_str", "").split(",")
-                    break
+    try:
+        if not await run_in_threadpool(answer_store.count_answers, db, session_id):
+            return {"message": "No raw answers to evaluate.", "evaluations": []}
 
-            # -------- NLP ENGINE RAW OUTPUT --------
-            eval_result = nlp_evaluate_answer(
-                user_answer=user_answer,
-                benchmark_answer=benchmark_answer,
-                question_keywords=question_keywords
-            )
+        collected, pending = await _prepare_for_evaluation(db, session)
+        new_evaluations, failures = await _evaluate_raw_entries(db, session, pending)
+        evaluations = collected + new_evaluations
 
-            # Extract NLP Components
-            sim = float(eval_result.get("similarity_score", 0))  # 0–1
-            relevance = float(eval_result.get("relevance", 0))    # 0–1
-            clarity = float(eval_result.get("clarity", 0))        # 0–1
-            keyword_match = float(eval_result.get("keyword_score", 0))  # 0–1
+        message = f"Evaluated {len(evaluations)} answers."
+        if failures:
+            message += f" {len(failures)} could not be scored; call evaluate-all again to retry them."
+        return {"message": message, "evaluations": evaluations, "failed": failures}
 
-            # -------- Length Score (0–1) --------
-            wc = len(user_answer.split())
-            if wc < 8:
-                length_score = 0.1
-            elif wc < 15:
-                length_score = 0.4
-            elif wc < 25:
-                length_score = 0.7
-            elif wc < 60:
-                length_score = 1.0
-            else:
-                length_score = 0.6  # too long, reduce score
-
-            # -------- Final Weighted Score (0–10) --------
-            weighted_sum = (
-                sim * 0.40 +
-                keyword_match * 0.25 +
-                length_score * 0.20 +
-                clarity * 0.15
-            )
+    except Exception:
+        await run_in_threadpool(db.rollback)
+        raise
 
-            # Theoretical max (1 * each weight)
-            max_possible = 0.40 + 0.25 + 0.20 + 0.15  # = 1.0 exactly
+@app.post("/api/sessions/{session_id}/re-evaluate", tags=["Interview Sessions"], dependencies=[Depends(_require_evaluation_ready)])
+async def re_evaluate(session_id: int, scope: str = "stale", db: Session = Depends(get_db)):
+    """
+    Re-score answers whose evaluation came from a different engine version
+    (model, spaCy mode or scoring logic changed). scope=all re-scores every answer.
+    """
+    if scope not in ("stale", "all"):
+        raise HTTPException(status_code=400, detail="scope must be 'stale' or 'all'")
+    session = await run_in_threadpool(_get_session_or_404, db, session_id)
+    try:
+        await _wait_for_eager_scoring(session_id)
+        current_version = nlp_engine_version()
+        if scope == "all":
+            targets = await run_in_threadpool(answer_store.all_answers, db, session_id)
+        else:
+            targets = await run_in_threadpool(answer_store.stale_answers, db, session_id, current_version)
+        if not targets:
+            return {"message": "All evaluations are up to date.", "engine_version": current_version, "evaluations": [], "failed": []}
 
-            normalized = weighted_sum / max_possible   # always 0–1
-            final_score = round(normalized * 10, 2)    # convert to 0–10
+        target_ids = {r["id"] for r in targets}
+        await run_in_threadpool(_store, db, answer_store.reset_for_reevaluation, session_id, target_ids)
 
+        pending = [r for r in await run_in_threadpool(answer_store.pending_answers, db, session_id) if r["id"] in target_ids]
+        evaluations, failures = await _evaluate_raw_entries(db, session, pending)
+        return {
+            "message": f"Re-evaluated {len(evaluations)} answers.",
+            "engine_version": current_version,
+            "evaluations": evaluations,
+            "failed": failures,
+        }
+    except Exception:
+        await run_in_threadpool(db.rollback)
+        raise
 
-            # -------- Custom Human-like Feedback --------
-            feedback_parts = []
-            if final_score >= 8:
-                feedback_parts.append("Very strong answer. You covered key points with clarity and depth.")
-            elif final_score >= 6:
-                feedback_parts.append("Good answer, but you can increase depth and provide real examples.")
-            elif final_score >= 4:
-                feedback_parts.append("Average answer. Add more structure and include relevant concepts.")
-            else:
-                feedback_parts.append("Weak response. Revise fundamentals and give more elaborate explanations.")
-
-            if keyword_match < 0.4:
-                feedback_parts.append("You missed several important keywords from the expected answer.")
-
-            if clarity < 0.5:
-                feedback_parts.append("Your explanation lacked clarity or proper flow.")
-
-            if length_score < 0.3:
-                feedback_parts.append("Your answer was too short. Add more explanation.")
-
-            final_feedback = " ".join(feedback_parts)
-
-            evaluated_entry = {
-                "type": "evaluated",
-                "question": question_text,
-                "answer": user_answer,
-                "score": final_score,
-                "details": {
-                    "similarity": sim,
-                    "clarity": clarity,
-                    "keyword_match": keyword_match,
-                    "length_score": length_score,
-                    "feedback": final_feedback
-                },
-                "evaluated_at": time.strftime("%Y-%m-%dT%H:%M:%S")
-            }
 
-            all_results.append(evaluated_entry)
-            evaluations.append(evaluated_entry)
+# ---------------------- Streaming bulk evaluation ----------------------
+def _stream_event(fmt: str, event: str, data: dict) -> str:
+    payload = json.dumps({"event": event, **data})
+    if fmt == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return payload + "\n"
 
-        # Save
-        session.interview_results = all_results
-        db.commit()
-        db.refresh(session)
+@app.post("/api/sessions/{session_id}/evaluate-all/stream", tags=["Interview Sessions"], dependencies=[Depends(_require_evaluation_ready)])
+async def evaluate_all_stream(session_id: int, format: str = "ndjson"):
+    """
+    Streaming evaluate-all: each evaluated entry is sent as soon as it is scored
+    and persisted, so the first result arrives after roughly one answer's latency.
+
+    format=ndjson (default): one JSON object per line.
+    format=sse: server-sent events (event: evaluation | failed | done | error).
+    Events: {"event": "evaluation", "index", "total", "entry"},
+    {"event": "failed", "index", "total", "failure"}, then
+    {"event": "done", "evaluated", "failed"} or {"event": "error", "detail"}.
+    """
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
 
-        return {"message": f"Evaluated {len(evaluations)} answers.", "evaluations": evaluations}
+    # The stream outlives the request's dependencies, so it owns its DB session
+    db = SessionLocal()
+    try:
+        session = await run_in_threadpool(_get_session_or_404, db, session_id)
+    except Exception:
+        db.close()
+        raise
+
+    async def events():
+        sent = failed_count = 0
+        try:
+            collected, pending = await _prepare_for_evaluation(db, session)
+            total = len(collected) + len(pending)
+            for entry in collected:
+                yield _stream_event(format, "evaluation", {"index": sent + failed_count, "total": total, "entry": entry})
+                sent += 1
+            # One answer per chunk: every result is flushed as soon as it lands
+            async for entries, failures in _iter_evaluated_chunks(db, session, pending, chunk_size=1):
+                for entry in entries:
+                    yield _stream_event(format, "evaluation", {"index": sent + failed_count, "total": total, "entry": entry})
+                    sent += 1
+                for failure in failures:
+                    yield _stream_event(format, "failed", {"index": sent + failed_count, "total": total, "failure": failure})
+                    failed_count += 1
+            yield _stream_event(format, "done", {"evaluated": sent, "failed": failed_count})
+        except Exception as e:
+            logger.exception("evaluate-all stream for session %s failed: %s", session_id, e)
+            await run_in_threadpool(db.rollback)
+            yield _stream_event(format, "error", {"detail": _error_detail(e), "evaluated": sent})
+        finally:
+            await run_in_threadpool(db.close)
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+# ---------------------- Cohort bulk processing ----------------------
+def _create_session_chunk(db: Session, specs: list, offset: int, generate_questions: bool):
+    """Create one chunk of sessions (and their questions) in a single transaction."""
+    pending = []
+    failures = []
+    for i, spec in enumerate(specs):
+        questions = []
+        if generate_questions:
+            try:
+                questions = select_questions(
+                    domain=spec.selected_domain,
+                    difficulty=spec.difficulty_level,
+                    num_questions=QUESTIONS_PER_SESSION
+                ).get("questions", [])
+            except Exception as e:
+                failures.append({"index": offset + i, "error": f"Error generating questions: {e}"})
+                continue
+        new_session = sql_models.InterviewSession(
+            selected_domain=spec.selected_domain,
+            difficulty_level=spec.difficulty_level,
+            resume_analysis_result=spec.resume_analysis_result.model_dump(),
+            generated_questions=questions,
+        )
+        if spec.user_id:
+            new_session.user_id = spec.user_id
+        pending.append((offset + i, spec, new_session, questions))
 
+    db.add_all([new_session for _, _, new_session, _ in pending])
+    try:
+        db.flush()
+        # Read ids before the commit expires the objects (saves a SELECT per session)
+        ids = [new_session.id for _, _, new_session, _ in pending]
+        db.commit()
     except Exception as e:
         db.rollback()
-        raise
+        logger.exception("Creating cohort sessions %d-%d failed: %s", offset, offset + len(specs) - 1, e)
+        return [], failures + [{"index": index, "error": _error_detail(e)} for index, _, _, _ in pending]
+
+    created = []
+    for (index, spec, _, questions), session_id in zip(pending, ids):
+        if generate_questions and not questions:
+            # The session exists, but it has nothing to ask
+            failures.append({
+                "index": index,
+                "session_id": session_id,
+                "error": f"No questions found for domain '{spec.selected_domain}' and difficulty '{spec.difficulty_level}'.",
+            })
+        else:
+            created.append({"index": index, "session_id": session_id, "questions": len(questions)})
+    return created, failures
+
+async def _iter_created_sessions(db: Session, specs: list, generate_questions: bool):
+    """Yields (created, failures) per COHORT_CHUNK_SIZE sessions."""
+    size = max(1, COHORT_CHUNK_SIZE)
+    for start in range(0, len(specs), size):
+        yield await run_in_threadpool(_create_session_chunk, db, specs[start:start + size], start, generate_questions)
+
+def _load_sessions(db: Session, session_ids: list) -> dict:
+    sessions = (
+        db.query(sql_models.InterviewSession)
+        .filter(sql_models.InterviewSession.id.in_(session_ids))
+        .populate_existing()
+        .all()
+    )
+    return {s.id: s for s in sessions}
 
+def _prepare_cohort_chunk(db: Session, session_ids: list):
+    """Load a chunk of sessions; returns (sessions by id, [(session_id, raw, batch item)] for every pending answer)."""
+    sessions = _load_sessions(db, session_ids)
+    pending_by_session = answer_store.pending_answers_by_session(db, list(sessions))
 
-# ---------------------- Final Results Endpoint for Module 5 ----------------------
-@app.get("/api/sessions/{session_id}/results", tags=["Interview Sessions"])
-def get_session_results(session_id: int, db: Session = Depends(get_db)):
-    session = db.query(sql_models.InterviewSession).filter(sql_models.InterviewSession.id == session_id).first()
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    work = []
+    for session_id in session_ids:
+        session = sessions.get(session_id)
+        if session is None:
+            continue
+        pending = pending_by_session.get(session_id, [])
+        work.extend(
+            (session_id, raw, item)
+            for raw, item in zip(pending, _build_batch_items(session, pending))
+        )
+    return sessions, work
 
-    evaluated = [
-        r for r in (session.interview_results or [])
-        if isinstance(r, dict) and r.get("type") == "evaluated"
+def _record_cohort_chunk(db: Session, session_ids: list, entries: dict, errors: dict) -> list:
+    """Record the chunk's evaluations and failures, all sessions in one transaction."""
+    existing = {
+        row.id for row in
+        db.query(sql_models.InterviewSession.id).filter(sql_models.InterviewSession.id.in_(session_ids))
+    }
+    recorded, failed = {}, {}
+    for session_id in session_ids:
+        if session_id in existing:
+            recorded[session_id] = answer_store.record_evaluations(db, session_id, entries.get(session_id, []))
+            failed[session_id] = answer_store.record_failures(db, session_id, errors.get(session_id, {}))
+    db.flush()
+    evaluated = answer_store.count_collected_by_session(db, list(existing))
+    db.commit()
+    return [
+        {
+            "session_id": session_id,
+            "evaluated": evaluated.get(session_id, 0),
+            "scored_now": len(recorded[session_id]),
+            "failed": failed[session_id],
+        }
+        for session_id in session_ids if session_id in existing
     ]
 
+async def _iter_evaluated_sessions(db: Session, session_ids: list):
+    """
+    Cohort evaluate-all. Sessions are taken COHORT_CHUNK_SIZE at a time; the
+    pending answers of the whole chunk are pooled and scored in engine batches
+    of COHORT_EVAL_BATCH_SIZE (so the embedding model sees full batches even
+    when each session has only a few answers), then the chunk is committed in
+    one transaction. Yields (per-session summaries, session-level failures).
+    """
+    size = max(1, COHORT_CHUNK_SIZE)
+    batch_size = max(1, COHORT_EVAL_BATCH_SIZE)
+    limit = asyncio.Semaphore(max(1, EVALUATE_ALL_CONCURRENCY))
+
+    async def score(batch):
+        async with limit:
+            return await _run_evaluation(nlp_evaluate_answers_batch([item for _, _, item in batch]))
+
+    for start in range(0, len(session_ids), size):
+        chunk_ids = session_ids[start:start + size]
+        for session_id in chunk_ids:
+            await _wait_for_eager_scoring(session_id)
+
+        try:
+            sessions, work = await run_in_threadpool(_prepare_cohort_chunk, db, chunk_ids)
+            batches = [work[i:i + batch_size] for i in range(0, len(work), batch_size)]
+            outcomes = await asyncio.gather(*(score(batch) for batch in batches), return_exceptions=True)
+
+            entries, errors = defaultdict(list), defaultdict(dict)
+            for batch, outcome in zip(batches, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.warning("Scoring %d cohort answer(s) failed: %s", len(batch), outcome)
+                    for session_id, raw, _ in batch:
+                        errors[session_id][raw["id"]] = _error_detail(outcome)
+                    continue
+                for (session_id, raw, _), result in zip(batch, outcome):
+                    entries[session_id].append(_build_evaluated_entry(raw, result))
+
+            summaries = await run_in_threadpool(_record_cohort_chunk, db, chunk_ids, entries, errors)
+        except Exception as e:
+            logger.exception("Evaluating cohort sessions %s failed: %s", chunk_ids, e)
+            await run_in_threadpool(db.rollback)
+            yield [], [{"session_id": session_id, "error": _error_detail(e)} for session_id in chunk_ids]
+            continue
+
+        missing = [{"session_id": session_id, "error": "Session not found"} for session_id in chunk_ids if session_id not in sessions]
+        yield summaries, missing
+
+async def _run_cohort_job(job_id: str, total: int, iter_chunks) -> None:
+    """Background cohort run: iter_chunks(db) yields (results, failures) per chunk; progress goes to the job store."""
+    jobs = get_job_store()
+    db = SessionLocal()
+    try:
+        await run_in_threadpool(jobs.start, job_id, total)
+        async for results, failures in iter_chunks(db):
+            await run_in_threadpool(jobs.add_results, job_id, results, failures)
+        await run_in_threadpool(jobs.finish, job_id)
+    except Exception as e:
+        logger.exception("Cohort job %s failed: %s", job_id, e)
+        await run_in_threadpool(db.rollback)
+        await run_in_threadpool(jobs.finish, job_id, _error_detail(e))
+    finally:
+        await run_in_threadpool(db.close)
+
+async def _run_cohort(kind: str, total: int, iter_chunks, background: bool, db: Session):
+    if background:
+        job_id = await run_in_threadpool(get_job_store().create, kind, None, total)
+        task = asyncio.create_task(_run_cohort_job(job_id, total, iter_chunks))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        return JSONResponse(
+            status_code=202,
+            content={"job_id": job_id, "status": JOB_QUEUED, "status_url": f"/api/jobs/{job_id}"},
+        )
+
+    results, failures = [], []
+    async for done, failed in iter_chunks(db):
+        results.extend(done)
+        failures.extend(failed)
+    return {"sessions": results, "failed": failures}
+
+@app.post("/api/cohorts/sessions", tags=["Cohorts"])
+async def create_cohort_sessions(payload: models.CohortSessionsCreate, background: bool = False, db: Session = Depends(get_db)):
+    """
+    Create many sessions at once (a list in `sessions`, or `count` copies of
+    `template`) and, unless generate_questions is false, pick their questions.
+    Sessions are inserted COHORT_CHUNK_SIZE per transaction.
+    ?background=true returns 202 with a job id; GET /api/jobs/{job_id} reports
+    progress and, per created session, {index, session_id, questions}.
+    """
+    if payload.sessions is not None and (payload.template is not None or payload.count is not None):
+        raise HTTPException(status_code=400, detail="Give either 'sessions' or 'template' + 'count', not both.")
+    if payload.sessions is not None:
+        specs = payload.sessions
+    elif payload.template is not None and payload.count:
+        specs = [payload.template] * payload.count
+    else:
+        raise HTTPException(status_code=400, detail="Give 'sessions', or 'template' and 'count'.")
+    if not specs:
+        raise HTTPException(status_code=400, detail="No sessions to create.")
+    if len(specs) > COHORT_MAX_SESSIONS:
+        raise HTTPException(status_code=400, detail=f"At most {COHORT_MAX_SESSIONS} sessions per call.")
+
+    def iter_chunks(job_db):
+        return _iter_created_sessions(job_db, specs, payload.generate_questions)
+
+    response = await _run_cohort("cohort-create", len(specs), iter_chunks, background, db)
+    if isinstance(response, dict):
+        response["message"] = f"Created {len(response['sessions'])} of {len(specs)} sessions."
+    return response
+
+@app.post("/api/cohorts/evaluate", tags=["Cohorts"], dependencies=[Depends(_require_evaluation_ready)])
+async def evaluate_cohort(payload: models.CohortEvaluate, background: bool = False, db: Session = Depends(get_db)):
+    """
+    evaluate-all for a list of sessions, as one pipeline: answers from many
+    sessions share engine batches and each chunk of sessions is committed once.
+    Idempotent like evaluate-all. Returns, per session,
+    {session_id, evaluated, scored_now, failed: [...]}; fetch the evaluations
+    themselves from GET /api/sessions/{id}/results.
+    ?background=true returns 202 with a job id (progress counts sessions).
+    """
+    session_ids = list(dict.fromkeys(payload.session_ids))
+    if len(session_ids) > COHORT_MAX_SESSIONS:
+        raise HTTPException(status_code=400, detail=f"At most {COHORT_MAX_SESSIONS} sessions per call.")
+
+    def iter_chunks(job_db):
+        return _iter_evaluated_sessions(job_db, session_ids)
+
+    response = await _run_cohort("cohort-evaluate", len(session_ids), iter_chunks, background, db)
+    if isinstance(response, dict):
+        response["message"] = f"Evaluated {len(response['sessions'])} of {len(session_ids)} sessions."
+    return response
+
+
+# ---------------------- Background jobs ----------------------
+@app.get("/api/jobs/{job_id}", tags=["Jobs"])
+def get_job(job_id: str):
+    """Status, progress (done / total) and partial results of a background job."""
+    job = get_job_store().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+# ---------------------- Final Results Endpoint for Module 5 ----------------------
+# Bump when the report shape or feedback.generate_feedback output changes, so cached copies and ETags roll over
+RESULTS_REPORT_VERSION = 1
+
+def _results_etag(session_id: int, revision: int) -> str:
+    return f'"s{session_id}-r{revision or 0}-v{RESULTS_REPORT_VERSION}"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+def _build_results_report(evaluated: list) -> dict:
+    """Feedback report for the session's evaluations (answer_store.evaluations)."""
+
     to_feedback_engine = []
     for e in evaluated:
         normalized_score = normalize(e.get("score", 0))  # ← only this is needed
@@ -536,3 +1184,196 @@ def get_session_results(session_id: int, db: Session = Depends(get_db)):
         fe["your_answer"] = e.get("answer", "Not provided")
 
     return final_feedback
+
+@app.get("/api/sessions/{session_id}/results", tags=["Interview Sessions"])
+async def get_session_results(session_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Final report for the session. It is built once per change of its
+    answers / evaluations and stored on the session; repeat fetches are a lookup,
+    and a matching If-None-Match gets 304 without loading the report at all.
+    """
+    revision = (await db.execute(
+        select(sql_models.InterviewSession.results_revision).where(sql_models.InterviewSession.id == session_id)
+    )).scalar()
+    if revision is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    etag = _results_etag(session_id, revision)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    session = await _get_session_or_404_async(db, session_id)
+
+    built_from = session.results_revision
+    report = session.results_report
+    if report is None or session.results_report_revision != built_from:
+        evaluated = await db.run_sync(answer_store.evaluations, session_id)
+        # Building the feedback is CPU work; keep it off the event loop
+        report = await run_in_threadpool(_build_results_report, evaluated)
+        try:
+            # Labelled with the revision it was built from; a concurrent answer write just bumps past it
+            session.results_report = report
+            session.results_report_revision = built_from
+            await db.commit()
+        except StaleDataError:
+            # Another request stored a report first (version compare-and-swap); serve ours anyway
+            await db.rollback()
+        except Exception as e:
+            await db.rollback()
+            logger.warning("Could not store results report for session %s: %s", session_id, e)
+
+    headers["ETag"] = _results_etag(session_id, built_from)
+    return JSONResponse(content=report, headers=headers)
+
+
+# ---------------------- User history & progress ----------------------
+USER_SESSIONS_PAGE_SIZE = 20
+USER_SESSIONS_MAX_PAGE_SIZE = 100
+
+def _summary_columns():
+    S = sql_models.InterviewSession
+    # Summary columns only: the JSON columns (questions, report, legacy results) are never loaded
+    return (S.id, S.selected_domain, S.difficulty_level, S.session_date,
+            S.answer_count, S.evaluated_count, S.score_sum, S.average_score)
+
+def _session_summary(row) -> dict:
+    return {
+        "session_id": row.id,
+        "selected_domain": row.selected_domain,
+        "difficulty_level": row.difficulty_level,
+        "session_date": row.session_date.isoformat() if row.session_date else None,
+        "answer_count": row.answer_count or 0,
+        "evaluated_count": row.evaluated_count or 0,
+        "average_score": round(row.average_score, 2) if row.average_score is not None else None,
+    }
+
+def _encode_cursor(session_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"after": session_id}).encode("utf-8")).decode("ascii")
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["after"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+@app.get("/api/users/{user_id}/sessions", tags=["Users"])
+async def list_user_sessions(
+    user_id: str,
+    limit: int = Query(USER_SESSIONS_PAGE_SIZE, ge=1, le=USER_SESSIONS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    The user's sessions, newest first, with their answer / evaluation counts and
+    average score. Keyset-paginated on (session_date, id) over the
+    (user_id, session_date) index: pass next_cursor back as ?cursor= for the
+    next page; it is null on the last one.
+    """
+    S = sql_models.InterviewSession
+    stmt = select(*_summary_columns()).where(S.user_id == user_id)
+    if cursor:
+        after_id = _decode_cursor(cursor)
+        # Compared with the cursor row's stored session_date, so timestamp formats never matter
+        after_date = select(S.session_date).where(S.id == after_id, S.user_id == user_id).scalar_subquery()
+        stmt = stmt.where(or_(S.session_date < after_date, and_(S.session_date == after_date, S.id < after_id)))
+    rows = (await db.execute(stmt.order_by(S.session_date.desc(), S.id.desc()).limit(limit + 1))).all()
+
+    page = rows[:limit]
+    return {
+        "user_id": user_id,
+        "sessions": [_session_summary(row) for row in page],
+        "next_cursor": _encode_cursor(page[-1].id) if len(rows) > limit else None,
+    }
+
+def _domain_progress(domain: str, rows: list) -> dict:
+    """Trend of one domain's session averages, rows oldest first."""
+    scores = [row.average_score for row in rows]
+    evaluated = sum(row.evaluated_count for row in rows)
+    n = len(scores)
+    # Least-squares slope of the session averages: score points gained per session
+    slope = 0.0
+    if n > 1:
+        mean_x, mean_y = (n - 1) / 2.0, sum(scores) / n
+        slope = sum((i - mean_x) * (y - mean_y) for i, y in enumerate(scores)) / sum((i - mean_x) ** 2 for i in range(n))
+    return {
+        "domain": domain,
+        "sessions": n,
+        "evaluated_answers": evaluated,
+        "average_score": round(sum(row.score_sum for row in rows) / evaluated, 2) if evaluated else None,
+        "first_score": round(scores[0], 2),
+        "latest_score": round(scores[-1], 2),
+        "best_score": round(max(scores), 2),
+        "change": round(scores[-1] - scores[0], 2),
+        "trend_per_session": round(slope, 3),
+        "points": [_session_summary(row) for row in rows],
+    }
+
+@app.get("/api/users/{user_id}/progress", tags=["Users"])
+async def get_user_progress(user_id: str, domain: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    """
+    Per-domain score trends over the user's sessions that have evaluations:
+    overall average, first / latest / best session average, change, the
+    least-squares trend per session and the points themselves (oldest first).
+    Read from the summary columns via the (user_id, session_date) index.
+    """
+    S = sql_models.InterviewSession
+    stmt = select(*_summary_columns()).where(S.user_id == user_id, S.evaluated_count > 0, S.average_score.isnot(None))
+    if domain:
+        stmt = stmt.where(S.selected_domain == domain)
+    rows = (await db.execute(stmt.order_by(S.session_date, S.id))).all()
+
+    by_domain = defaultdict(list)
+    for row in rows:
+        by_domain[row.selected_domain].append(row)
+    return {
+        "user_id": user_id,
+        "sessions": len(rows),
+        "domains": [_domain_progress(name, domain_rows) for name, domain_rows in by_domain.items()],
+    }
+
+
+# ---------------------- Diagnostics ----------------------
+@app.get("/api/diagnostics/evaluation-cache", tags=["Diagnostics"])
+def get_evaluation_cache_stats():
+    """Hit / miss / eviction counters of this worker's evaluation cache."""
+    return evaluation_cache_stats()
+
+@app.get("/api/diagnostics/evaluation-executor", tags=["Diagnostics"])
+def get_evaluation_executor_stats():
+    """Pool size, tasks in flight and limits of the evaluation executor."""
+    return evaluation_executor.executor_stats()
+
+@app.get("/api/diagnostics/database", tags=["Diagnostics"])
+def get_database_stats():
+    """Backend, connection-pool usage and SQLite pragmas of this worker's database engines."""
+    stats = pool_metrics.stats()
+    # None until the first request that uses the async engine
+    stats["async_engine"] = async_pool_stats()
+    return stats
+
+
+# ---------------------- Health ----------------------
+@app.get("/health/live", tags=["Health"])
+def health_live():
+    """Liveness: the process is up and serving requests. No dependencies are checked."""
+    return {"status": "alive"}
+
+@app.get("/health/ready", tags=["Health"])
+def health_ready():
+    """
+    Readiness: 200 once the question bank is loaded and the evaluation models
+    are loaded and warmed up, 503 (with what is missing) until then. With
+    MODEL_LOADING=background, resume and question endpoints work before this
+    reports ready; only evaluation waits for it. A full evaluation queue
+    (including timed-out tasks still running) also reports 503 ("saturated").
+    """
+    evaluation = evaluation_executor.readiness()
+    questions = question_count()
+    ready = evaluation["ready"] and questions > 0 and not evaluation["saturated"]
+    if evaluation["ready"] and questions > 0:
+        status = "saturated" if evaluation["saturated"] else "ready"
+    else:
+        status = "failed" if evaluation["error"] and not evaluation["loading"] else "loading"
+    body = {"status": status, "question_bank": {"questions": questions}, "evaluation": evaluation}
+    return JSONResponse(status_code=200 if ready else 503, content=body)
@@ -21,6 +21,8 @@ class SessionCreate(BaseModel):
     selected_domain: str
     difficulty_level: str
     resume_analysis_result: DomainResponse = Field(...)
+    # Whose history the session belongs to (GET /api/users/{user_id}/...); default_user if omitted
+    user_id: Optional[str] = None
 
 class SessionResponse(BaseModel):
     """Response returned after creating a session."""
@@ -33,6 +35,23 @@ class SessionResponse(BaseModel):
     class Config:
         from_attributes = True  # enables direct mapping from SQLAlchemy models
 
+# ----------------------------------------------------------
+# 👥 Models for cohort (bulk) processing
+# ----------------------------------------------------------
+class CohortSessionsCreate(BaseModel):
+    """
+    Sessions to create in one call: either an explicit list, or `count`
+    copies of `template`. Questions are generated for each by default.
+    """
+    sessions: Optional[List[SessionCreate]] = None
+    template: Optional[SessionCreate] = None
+    count: Optional[int] = Field(default=None, ge=1)
+    generate_questions: bool = True
+
+class CohortEvaluate(BaseModel):
+    """Sessions whose saved answers should be scored (evaluate-all for each)."""
+    session_ids: List[int] = Field(..., min_length=1)
+
 # ----------------------------------------------------------
 # 🧠 NEW FOR PHASE 4 — Answer Evaluation
 # ----------------------------------------------------------
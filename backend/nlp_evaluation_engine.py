@@ -3,47 +3,155 @@ NLP Evaluation Engine - Phase 2 (Content + Delivery)
 Improved: gibberish detection + safer semantic scoring
 """
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Any, Union, Iterable, Callable
+from contextlib import contextmanager
+from dataclasses import dataclass
 import logging
+import os
+import time
 from functools import lru_cache
 import re
+from pathlib import Path
+import numpy as np
+import textstat  # safe to import at module scope; lightweight compared to models
 # Minimum number of words for scoring content
 MIN_WORDS_FOR_SCORE = 8
 
+# Sentence embedding model + how many texts go through it per forward pass
+SEMANTIC_MODEL_NAME = "paraphrase-MiniLM-L6-v2"
+SEMANTIC_BATCH_SIZE = 32
+
+# Inference backend for the sentence embedding model (CPU-oriented):
+#   "torch"     - PyTorch fp32 (default)
+#   "onnx"      - ONNX Runtime, exported once and cached under MODEL_CACHE_DIR
+#   "onnx-int8" - ONNX Runtime with dynamic int8 quantization (needs optimum[onnxruntime])
+SEMANTIC_ENGINES = ("torch", "onnx", "onnx-int8")
+SEMANTIC_ENGINE = os.getenv("NLP_SEMANTIC_ENGINE", "torch")
+# Target instruction set for int8 quantization: arm64, avx2, avx512 or avx512_vnni
+ONNX_QUANTIZATION_CONFIG = os.getenv("NLP_ONNX_QUANTIZATION", "avx2")
+MODEL_CACHE_DIR = Path("cache") / "models"
+
+# spaCy is only used for sentence boundaries (coherence). Modes:
+#   "full"        - the whole en_core_web_sm pipeline (tagger, parser, NER, lemmatizer)
+#   "parser"      - en_core_web_sm with only tok2vec + parser loaded (same boundaries as "full")
+#   "sentencizer" - rule-based punctuation splitter, no statistical model at all
+SPACY_MODES = ("full", "parser", "sentencizer")
+SPACY_MODE = os.getenv("NLP_SPACY_MODE", "parser")
+SPACY_BATCH_SIZE = int(os.getenv("NLP_SPACY_BATCH_SIZE", "64"))
+SPACY_N_PROCESS = int(os.getenv("NLP_SPACY_N_PROCESS", "1"))
+
 # Delay heavy imports until init
 semantic_model = None
 nlp = None
 _util = None
 _models_initialized = False
+_spacy_mode = None
+_semantic_engine = None
 
 # Setup module logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("nlp_eval_engine")
 
+# Optional per-stage timing hook for benchmarks; a no-op unless a callback is installed
+_stage_timer: Optional[Callable[[str, float], None]] = None
+
+def set_stage_timer(callback: Optional[Callable[[str, float], None]]) -> None:
+    """Install callback(stage_name, seconds) to receive stage timings, or None to disable."""
+    global _stage_timer
+    _stage_timer = callback
+
+@contextmanager
+def _timed(stage: str):
+    if _stage_timer is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stage_timer(stage, time.perf_counter() - t0)
+
 # -----------------------------
 # Lazy model initialization
 # -----------------------------
-def init_models(force: bool = False):
+def _load_spacy(mode: str):
+    import spacy
+
+    if mode == "full":
+        return spacy.load("en_core_web_sm")
+    if mode == "parser":
+        # Excluded components are never loaded, so they cost neither time nor memory
+        return spacy.load("en_core_web_sm", exclude=["tagger", "attribute_ruler", "lemmatizer", "ner"])
+    if mode == "sentencizer":
+        blank = spacy.blank("en")
+        blank.add_pipe("sentencizer")
+        return blank
+    raise ValueError(f"Unknown spaCy mode {mode!r}; expected one of {SPACY_MODES}")
+
+def _onnx_export_dir() -> Path:
+    return MODEL_CACHE_DIR / f"{SEMANTIC_MODEL_NAME}-onnx"
+
+def _load_semantic_model(engine: str):
+    from sentence_transformers import SentenceTransformer
+
+    if engine == "torch":
+        # compact paraphrase model — fast and good for semantic similarity
+        return SentenceTransformer(SEMANTIC_MODEL_NAME)
+    if engine not in SEMANTIC_ENGINES:
+        raise ValueError(f"Unknown semantic engine {engine!r}; expected one of {SEMANTIC_ENGINES}")
+
+    try:
+        import onnxruntime  # noqa: F401  (fail early with a clear message)
+    except ImportError as e:
+        raise RuntimeError(f"NLP_SEMANTIC_ENGINE={engine} needs `pip install optimum[onnxruntime]`") from e
+
+    # Export once; later starts load the cached ONNX graph directly
+    export_dir = _onnx_export_dir()
+    if not (export_dir / "onnx" / "model.onnx").exists():
+        logger.info("Exporting %s to ONNX at %s ...", SEMANTIC_MODEL_NAME, export_dir)
+        exported = SentenceTransformer(SEMANTIC_MODEL_NAME, backend="onnx")
+        exported.save_pretrained(str(export_dir))
+
+    if engine == "onnx":
+        return SentenceTransformer(str(export_dir), backend="onnx")
+
+    # The exporter derives its default suffix from the weight dtype (qint8 / quint8,
+    # depending on the config); naming the file ourselves keeps the cache check exact
+    file_suffix = f"int8_{ONNX_QUANTIZATION_CONFIG}"
+    file_name = f"onnx/model_{file_suffix}.onnx"
+    if not (export_dir / file_name).exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        logger.info("Quantizing ONNX model to int8 (%s) ...", ONNX_QUANTIZATION_CONFIG)
+        fp32 = SentenceTransformer(str(export_dir), backend="onnx")
+        export_dynamic_quantized_onnx_model(fp32, ONNX_QUANTIZATION_CONFIG, str(export_dir), file_suffix=file_suffix)
+    return SentenceTransformer(str(export_dir), backend="onnx", model_kwargs={"file_name": file_name})
+
+def init_models(force: bool = False, spacy_mode: Optional[str] = None, semantic_engine: Optional[str] = None):
     """
     Initialize heavy NLP models. Safe to call multiple times.
     Call this from FastAPI startup or before the first evaluation.
+    spacy_mode overrides NLP_SPACY_MODE (see SPACY_MODES);
+    semantic_engine overrides NLP_SEMANTIC_ENGINE (see SEMANTIC_ENGINES).
     """
-    global semantic_model, nlp, _util, _models_initialized
+    global semantic_model, nlp, _util, _models_initialized, _spacy_mode, _semantic_engine
     if _models_initialized and not force:
         return
+    mode = spacy_mode or SPACY_MODE
+    engine = semantic_engine or SEMANTIC_ENGINE
 
     try:
         # Local imports to avoid import-time failures
-        from sentence_transformers import SentenceTransformer, util
-        import spacy
+        from sentence_transformers import util
 
-        logger.info("Loading SentenceTransformer model (compact)...")
-        # compact paraphrase model — fast and good for semantic similarity
-        semantic_model = SentenceTransformer("paraphrase-MiniLM-L6-v2")
+        logger.info("Loading SentenceTransformer model (compact, engine=%s)...", engine)
+        semantic_model = _load_semantic_model(engine)
+        _semantic_engine = engine
         _util = util
 
-        logger.info("Loading spaCy model en_core_web_sm...")
-        nlp = spacy.load("en_core_web_sm")
+        logger.info("Loading spaCy pipeline (mode=%s)...", mode)
+        nlp = _load_spacy(mode)
+        _spacy_mode = mode
 
         _models_initialized = True
         logger.info("NLP models initialized successfully.")
@@ -56,6 +164,75 @@ def _ensure_models():
     if not _models_initialized:
         init_models()
 
+def freeze_models() -> None:
+    """
+    Put the loaded models in inference-only mode before worker processes are
+    forked from this one (see serve.py): no autograd state, no dropout, so
+    nothing writes to the weight pages and they stay shared copy-on-write.
+    """
+    _ensure_models()
+    if hasattr(semantic_model, "eval"):
+        semantic_model.eval()
+    if hasattr(semantic_model, "parameters"):
+        for param in semantic_model.parameters():
+            param.requires_grad_(False)
+
+_WARM_UP_ANSWER = (
+    "I built a REST API with Flask and PostgreSQL. I designed the endpoints, added input "
+    "validation and tests, and we deployed it with Docker through a CI/CD pipeline."
+)
+_WARM_UP_BENCHMARK = "Design REST endpoints, validate input, persist to a database, containerize and deploy with CI/CD."
+
+def warm_up() -> float:
+    """
+    Run throwaway evaluations through every stage (embedding, spaCy, readability,
+    keyword matching), single and batched, so lazy initialization inside the
+    libraries happens now rather than in the first real request. Returns seconds taken.
+    """
+    _ensure_models()
+    t0 = time.perf_counter()
+    keywords = ["REST API", "Flask", "PostgreSQL", "Docker", "CI/CD"]
+    evaluate_answer(_WARM_UP_ANSWER, _WARM_UP_BENCHMARK, question_keywords=keywords)
+    evaluate_answers_batch([
+        {"user_answer": _WARM_UP_ANSWER, "benchmark_answer": _WARM_UP_BENCHMARK, "question_keywords": keywords},
+        {"user_answer": "Containers package an app with its dependencies.", "benchmark_answer": _WARM_UP_BENCHMARK},
+    ])
+    return time.perf_counter() - t0
+
+def parse_sentences_batch(
+    texts: List[str],
+    n_process: int = SPACY_N_PROCESS,
+    batch_size: int = SPACY_BATCH_SIZE
+) -> List[Any]:
+    """
+    Run the spaCy pipeline over many texts with nlp.pipe and return the Docs
+    in input order. Use this instead of calling nlp() once per answer.
+    """
+    _ensure_models()
+    if not texts:
+        return []
+    return list(nlp.pipe(texts, n_process=n_process, batch_size=batch_size))
+
+def model_fingerprint() -> str:
+    """
+    Identifies which embedding space vectors come from. Precomputed
+    embeddings are only reusable while this value is unchanged.
+    """
+    engine = _semantic_engine or SEMANTIC_ENGINE
+    fingerprint = f"sentence-transformers/{SEMANTIC_MODEL_NAME}"
+    if engine == "onnx":
+        fingerprint += "@onnx"
+    elif engine == "onnx-int8":
+        fingerprint += f"@onnx-int8-{ONNX_QUANTIZATION_CONFIG}"
+    return fingerprint
+
+# Bump whenever scoring logic / thresholds change so cached or stored scores are recomputed
+SCORING_VERSION = "2"
+
+def engine_version() -> str:
+    """Everything that can change a score for the same inputs: scoring code, embedding model, spaCy mode."""
+    return f"scoring-v{SCORING_VERSION}|{model_fingerprint()}|spacy-{_spacy_mode or SPACY_MODE}"
+
 # -----------------------------
 # Utility / Helpers
 # -----------------------------
@@ -70,120 +247,306 @@ def _map_cosine_to_01(cos_val: float) -> float:
     v = max(0.0, min(1.0, v))
     return round(v, 3)
 
+# -----------------------------
+# Single-pass answer analysis
+# -----------------------------
+_ALPHA_RUN_RE = re.compile(r"[a-zA-Z]{3,}")
+_CHAR_RUN_RE = re.compile(r"(.)\1{3,}")
+_NON_KEYWORD_CHARS_RE = re.compile(r"[^a-zA-Z0-9\s]")
+_SENTENCE_RE = re.compile(r"\b[^.!?]+[.!?]*")
+# textstat's word split: drop apostrophes that are not part of a contraction, then all other punctuation
+_NON_CONTRACTION_APOSTROPHE_RE = re.compile(r"'(?![tsd]|ve|ll|re)")
+_LEXICON_PUNCT_RE = re.compile(r"[^\w\s']")
+
+@dataclass
+class AnalyzedAnswer:
+    """
+    Everything the sub-scorers need from one answer, computed in one pass.
+    Scorers read these fields instead of re-splitting / re-lowercasing the text.
+    """
+    text: str
+    stripped: str
+    lower: str
+    words: List[str]            # whitespace tokens
+    clean_words: List[str]      # lowercase alphanumeric tokens (keyword matching)
+    sentences: List[str]
+    lexicon_count: int          # words as textstat splits them (punctuation removed)
+    syllable_count: int
+    difficult_word_count: int   # 3+ syllables and not on the easy-word list (Gunning fog)
+    alpha_run_count: int        # runs of 3+ ASCII letters
+    letter_count: int
+    has_char_run: bool          # same character 4+ times in a row
+    doc: Any = None             # spaCy Doc, parsed on first use (or filled in by a batch)
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @property
+    def readable_sentence_count(self) -> int:
+        # Same convention as textstat: fragments of two words or fewer don't count
+        return max(1, sum(1 for sent in self.sentences if len(_lexicon_words(sent)) > 2))
+
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+
+@lru_cache(maxsize=65536)
+def _syllables(word: str) -> int:
+    try:
+        return textstat.syllable_count(word)
+    except Exception:
+        # textstat's dictionary backend is unavailable: fall back to vowel groups
+        return max(1, len(_VOWEL_GROUP_RE.findall(word)))
+
+# textstat's syllable threshold for English "difficult" words
+FOG_SYLLABLE_THRESHOLD = 3
+
+@lru_cache(maxsize=65536)
+def _is_difficult(word: str) -> bool:
+    try:
+        return textstat.is_difficult_word(word, FOG_SYLLABLE_THRESHOLD)
+    except Exception:
+        return _syllables(word) >= FOG_SYLLABLE_THRESHOLD
+
+def _lexicon_words(text: str) -> List[str]:
+    return _LEXICON_PUNCT_RE.sub("", _NON_CONTRACTION_APOSTROPHE_RE.sub("", text)).split()
+
+def analyze_answer(text: str) -> AnalyzedAnswer:
+    text = text if isinstance(text, str) else ""
+    stripped = text.strip()
+    lower = stripped.lower()
+
+    lexicon = [w.lower() for w in _lexicon_words(stripped)]
+    syllables = [_syllables(w) for w in lexicon]
+
+    return AnalyzedAnswer(
+        text=text,
+        stripped=stripped,
+        lower=lower,
+        words=stripped.split(),
+        clean_words=_NON_KEYWORD_CHARS_RE.sub(" ", lower).split(),
+        sentences=_SENTENCE_RE.findall(stripped),
+        lexicon_count=len(lexicon),
+        syllable_count=sum(syllables),
+        difficult_word_count=sum(1 for w in lexicon if _is_difficult(w)),
+        alpha_run_count=len(_ALPHA_RUN_RE.findall(stripped)),
+        letter_count=sum(1 for c in stripped if c.isascii() and c.isalpha()),
+        has_char_run=_CHAR_RUN_RE.search(lower) is not None,
+    )
+
+def _as_analysis(answer: Union[str, AnalyzedAnswer]) -> AnalyzedAnswer:
+    return answer if isinstance(answer, AnalyzedAnswer) else analyze_answer(answer)
+
 # -----------------------------
 # Gibberish guard
 # -----------------------------
-def is_gibberish(text: str) -> bool:
-    if not text or not isinstance(text, str):
+def is_gibberish(text: Union[str, AnalyzedAnswer]) -> bool:
+    if not isinstance(text, AnalyzedAnswer) and (not text or not isinstance(text, str)):
         return True
+    return _is_gibberish(_as_analysis(text))
 
-    s = text.strip()
-
+def _is_gibberish(a: AnalyzedAnswer) -> bool:
     # TOO SHORT
-    if len(s) < 5:
+    if len(a.stripped) < 5:
         return True
 
     # WORD COUNT
-    words = re.findall(r"[a-zA-Z]{3,}", s)
-    if len(words) < 3:
+    if a.alpha_run_count < 3:
         return True
 
     # REPEATED CHARACTERS (aaaaffffjjj)
-    if re.search(r"(.)\1{3,}", s.lower()):
+    if a.has_char_run:
         return True
 
     # HIGH NON-LETTER RATIO
-    letters = re.findall(r"[a-zA-Z]", s)
-    ratio = len(letters) / max(1, len(s))
+    ratio = a.letter_count / max(1, len(a.stripped))
     if ratio < 0.35:
         return True
 
     return False
 
 # -----------------------------
-# PhraseMatcher cache / builder
+# Keyword matcher
 # -----------------------------
-@lru_cache(maxsize=1024)
-def _build_phrase_matcher_cached(keywords_tuple: Tuple[str, ...]):
+# Keywords shorter than this cause false matches ("ai", "go", "r", ...)
+MIN_KEYWORD_LENGTH = 4
+
+def normalize_keywords(keywords: Union[str, Iterable[str], None]) -> List[str]:
     """
-    Build and cache a PhraseMatcher for a tuple of keywords.
-    Must be called only after models are initialized.
+    Lowercase keywords and replace non-alphanumerics with spaces, exactly like
+    answers are cleaned, so 'CI/CD' and 'ci/cd' both become 'ci cd'.
+    Accepts a list or a comma-separated string; duplicates are dropped.
     """
-    # Ensure models are loaded
-    _ensure_models()
-    from spacy.matcher import PhraseMatcher  # local import
+    if not keywords:
+        return []
+    if isinstance(keywords, str):
+        keywords = keywords.split(",")
+    out = []
+    for k in keywords:
+        if not isinstance(k, str):
+            continue
+        norm = " ".join(_NON_KEYWORD_CHARS_RE.sub(" ", k.lower()).split())
+        if norm and norm not in out:
+            out.append(norm)
+    return out
 
-    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-    patterns = [nlp.make_doc(k) for k in keywords_tuple if k]
-    if patterns:
-        matcher.add("KEYWORDS", patterns)
-    return matcher
+_TRIE_END = ""  # split() never yields an empty token; a plain key keeps matchers picklable
 
-def _normalize_keywords(keywords: List[str]) -> Tuple[str, ...]:
-    return tuple(sorted({k.strip().lower() for k in (keywords or []) if isinstance(k, str) and k.strip()}))
+class KeywordMatcher:
+    """
+    Precompiled matcher for one question's keyword set.
+
+    Keywords are stored as a token trie, so scoring an answer is one walk over
+    its tokens regardless of how many keywords the question has. Matching is
+    on whole tokens only, which keeps the old "full word match" behaviour.
+    """
+
+    __slots__ = ("keywords", "source_count", "_trie")
+
+    def __init__(self, keywords: Union[str, Iterable[str], None]):
+        normalized = normalize_keywords(keywords)
+        self.source_count = len(normalized)
+        self.keywords: Tuple[str, ...] = tuple(k for k in normalized if len(k) >= MIN_KEYWORD_LENGTH)
+        self._trie: Dict = {}
+        for idx, kw in enumerate(self.keywords):
+            node = self._trie
+            for token in kw.split():
+                node = node.setdefault(token, {})
+            node[_TRIE_END] = idx
+
+    def matched(self, tokens: List[str]) -> set:
+        """Indices (into self.keywords) of every keyword present in tokens."""
+        found = set()
+        n = len(tokens)
+        for start in range(n):
+            node = self._trie.get(tokens[start])
+            pos = start + 1
+            while node is not None:
+                if _TRIE_END in node:
+                    found.add(node[_TRIE_END])
+                if pos >= n:
+                    break
+                node = node.get(tokens[pos])
+                pos += 1
+        return found
+
+@lru_cache(maxsize=1024)
+def _keyword_matcher_cached(keywords_tuple: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords_tuple)
+
+def get_keyword_matcher(keywords: Union[KeywordMatcher, str, Iterable[str], None]) -> KeywordMatcher:
+    """Return keywords as a KeywordMatcher, reusing a cached one for plain lists."""
+    if isinstance(keywords, KeywordMatcher):
+        return keywords
+    return _keyword_matcher_cached(tuple(normalize_keywords(keywords)))
 
 # -----------------------------
 # Keyword matching score
 # -----------------------------
-def keyword_match_score(user_answer: str, target_keywords: List[str]) -> float:
+def keyword_match_score(
+    user_answer: Union[str, AnalyzedAnswer],
+    target_keywords: Union[KeywordMatcher, List[str]]
+) -> float:
      # ---------- Strong Full-Word Keyword Match ----------
-    if not target_keywords:
+    matcher = get_keyword_matcher(target_keywords)
+    if not matcher.source_count:
         return 1.0
 
-    # Clean text
-    clean_answer = re.sub(r'[^a-zA-Z0-9\s]', ' ', (user_answer or "").lower()).strip()
-    answer_words = clean_answer.split()
+    # Clean text (already tokenized by the analysis pass)
+    answer_words = _as_analysis(user_answer or "").clean_words
 
     # Very short answers → no keyword score
     if len(answer_words) < 3:
         return 0.0
 
-    # Normalize expected keywords
-    keywords = [k.lower().strip() for k in target_keywords if isinstance(k, str)]
-
-    # Ignore 1–3 letter keywords that cause false matches
-    keywords = [k for k in keywords if len(k) >= 4]
-
-    if not keywords:
+    if not matcher.keywords:
         return 0.0
 
-    matched = 0
-    for k in keywords:
-        # FULL WORD MATCH ONLY → prevents random matching
-        if re.search(rf"\b{k}\b", clean_answer):
-            matched += 1
-
-    score = matched / len(keywords)
+    # FULL WORD MATCH ONLY → prevents random matching
+    score = len(matcher.matched(answer_words)) / len(matcher.keywords)
     return round(score, 3)
 
 
 # -----------------------------
 # Semantic similarity
 # -----------------------------
-def semantic_similarity_score(user_answer: str, benchmark_answer: str) -> float:
+def encode_texts(texts: List[str], batch_size: int = SEMANTIC_BATCH_SIZE) -> np.ndarray:
     """
-    Compute embedding cosine similarity and map to [0,1].
-    Returns float in [0,1].
+    Encode texts in padded batches. Rows are L2-normalized float32,
+    so a plain dot product between two rows is their cosine similarity.
     """
+    _ensure_models()
+    emb = semantic_model.encode(
+        list(texts),
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+    return np.asarray(emb, dtype=np.float32)
 
+def _semantic_eligible(a: AnalyzedAnswer, benchmark_answer: str) -> bool:
     # 1️⃣ Reject very short answers early (less than 8 words)
-    if not user_answer or len(user_answer.split()) < MIN_WORDS_FOR_SCORE:
-        return 0.0
+    if a.word_count < MIN_WORDS_FOR_SCORE:
+        return False
 
     # 2️⃣ Reject gibberish
-    if is_gibberish(user_answer):
-        return 0.0
+    if _is_gibberish(a):
+        return False
 
     # 3️⃣ Reject empty benchmark
     if not benchmark_answer or not benchmark_answer.strip():
+        return False
+
+    return True
+
+def batch_semantic_similarity(
+    user_answers: List[str],
+    benchmark_answers: List[str],
+    benchmark_embeddings: List[Optional[np.ndarray]] = None
+) -> List[float]:
+    """
+    Pairwise similarity for (user_answers[i], benchmark_answers[i]), mapped to [0,1].
+    Every distinct text is encoded exactly once, in one batched call, and the
+    cosines are computed as a single row-wise dot product.
+
+    benchmark_embeddings[i], when given, is a precomputed normalized vector for
+    benchmark_answers[i]; that benchmark is then not encoded at all.
+    """
+    if not user_answers:
+        return []
+    precomputed = list(benchmark_embeddings or [None] * len(user_answers))
+
+    to_encode = list(user_answers) + [b for b, e in zip(benchmark_answers, precomputed) if e is None]
+    # Sorted, so what goes into each padded batch never depends on the input order
+    unique_texts = sorted(set(to_encode))
+    position = {t: i for i, t in enumerate(unique_texts)}
+    emb = encode_texts(unique_texts)
+
+    a = emb[[position[t] for t in user_answers]]
+    b = np.stack([
+        e if e is not None else emb[position[t]]
+        for t, e in zip(benchmark_answers, precomputed)
+    ]).astype(np.float32, copy=False)
+    cos = np.einsum("ij,ij->i", a, b)
+    return [_map_cosine_to_01(float(c)) for c in cos]
+
+def semantic_similarity_score(
+    user_answer: Union[str, AnalyzedAnswer],
+    benchmark_answer: str,
+    benchmark_embedding: Optional[np.ndarray] = None
+) -> float:
+    """
+    Compute embedding cosine similarity and map to [0,1].
+    Returns float in [0,1]. With a precomputed benchmark_embedding only the
+    user's answer is encoded.
+    """
+    a = _as_analysis(user_answer or "")
+    if not _semantic_eligible(a, benchmark_answer):
         return 0.0
 
     # 4️⃣ Compute semantic similarity safely
-    _ensure_models()
     try:
-        emb = semantic_model.encode([user_answer, benchmark_answer], convert_to_tensor=True, show_progress_bar=False)
-        cos = _util.cos_sim(emb[0], emb[1]).item()
-        return _map_cosine_to_01(cos)
+        return batch_semantic_similarity([a.text], [benchmark_answer], [benchmark_embedding])[0]
     except Exception as e:
         logger.exception("Semantic similarity computation failed: %s", e)
         return 0.0
@@ -191,109 +554,251 @@ def semantic_similarity_score(user_answer: str, benchmark_answer: str) -> float:
 # -----------------------------
 # Delivery analysis
 # -----------------------------
-import textstat  # safe to import at module scope; lightweight compared to models
+def _readability_grades(a: AnalyzedAnswer) -> Tuple[float, float]:
+    """
+    Flesch-Kincaid grade and Gunning fog from the analysis counts
+    (textstat's formulas, without re-splitting sentences and syllables per metric).
+    """
+    words = max(1, a.lexicon_count)
+    avg_sent_len = a.lexicon_count / a.readable_sentence_count
+    fk = 0.39 * avg_sent_len + 11.8 * (a.syllable_count / words) - 15.59
+    fog = 0.4 * (avg_sent_len + 100.0 * a.difficult_word_count / words)
+    return round(fk, 2), round(fog, 2)
 
-def analyze_delivery(user_answer: str) -> Dict[str, float]:
+def analyze_delivery(user_answer: Union[str, AnalyzedAnswer]) -> Dict[str, float]:
     """
     Returns clarity, conciseness, confidence in 0..1
     """
-    if not (user_answer and user_answer.strip()):
+    a = _as_analysis(user_answer or "")
+    if not a.stripped:
         return {"clarity": 0.0, "conciseness": 0.0, "confidence": 0.0}
 
     try:
-        fk = _safe_float(textstat.flesch_kincaid_grade(user_answer))
-        fog = _safe_float(textstat.gunning_fog(user_answer))
+        fk, fog = _readability_grades(a)
         clarity = 1.0 - min((fk + fog) / 30.0, 1.0)
         clarity = round(max(0.0, min(1.0, clarity)), 3)
     except Exception:
         clarity = 0.5
 
-    words = len(user_answer.split())
-    avg_sent_len = _safe_float(textstat.avg_sentence_length(user_answer) or 0.0)
+    words = a.word_count
+    avg_sent_len = a.lexicon_count / a.readable_sentence_count
     length_score = 1.0 - min(1.0, max(0.0, (words - 40) / 200.0))
     sentence_score = 1.0 - min(1.0, max(0.0, (avg_sent_len - 18) / 30.0))
     conciseness = round(max(0.0, min(1.0, 0.6 * length_score + 0.4 * sentence_score)), 3)
 
-    lower = user_answer.lower()
+    lower = a.lower
     hedge_words = ["maybe", "perhaps", "i think", "i feel", "sort of", "kind of", "probably", "might", "could"]
     assertive_words = ["i led", "i implemented", "i designed", "i developed", "we built", "ensured", "delivered", "achieved", "confident"]
     hedges = sum(lower.count(h) for h in hedge_words)
-    asserts = sum(lower.count(a) for a in assertive_words)
+    asserts = sum(lower.count(p) for p in assertive_words)
     confidence = (asserts + 0.5) / (hedges + asserts + 1.0)
     confidence = round(max(0.0, min(1.0, confidence)), 3)
 
     return {"clarity": clarity, "conciseness": conciseness, "confidence": confidence}
 
-# Minimum number of words for scoring content
-MIN_WORDS_FOR_SCORE = 8
-def is_meaningless_strict(answer: str) -> bool:
+def is_meaningless_strict(answer: Union[str, AnalyzedAnswer]) -> bool:
     """
     Returns True for:
     - Single letters/numbers
     - Short sequences (like 'd', '2', '8i', 's', 'x')
     - Mostly gibberish
     """
-    if not answer or not answer.strip():
+    if not isinstance(answer, AnalyzedAnswer) and (not answer or not answer.strip()):
         return True
+    return _is_meaningless(_as_analysis(answer))
 
-    answer = answer.strip()
+def _is_meaningless(a: AnalyzedAnswer) -> bool:
+    if not a.stripped:
+        return True
 
     # 1️⃣ Reject very short answers by word count
-    words = answer.split()
+    words = a.words
     if len(words) < 2:   # even 1 word → zero
         return True
 
     # 2️⃣ Reject single letters or digits
-    if all(re.fullmatch(r'[a-zA-Z0-9]{1,2}', w) for w in words):
+    if all(len(w) <= 2 and w.isascii() and w.isalnum() for w in words):
         return True
 
     # 3️⃣ Reject answers that are only numbers or symbols
-    if re.fullmatch(r'[\d\W]+', answer):
+    if re.fullmatch(r'[\d\W]+', a.stripped):
         return True
 
     # 4️⃣ Reject mostly random short words
-    short_alpha_words = [w for w in words if re.fullmatch(r'[a-zA-Z]{1,4}', w)]
-    if len(short_alpha_words) == len(words):
+    if all(len(w) <= 4 and w.isascii() and w.isalpha() for w in words):
         return True
 
     # 5️⃣ Use existing gibberish function
-    if is_gibberish(answer):
+    if _is_gibberish(a):
         return True
 
     return False
 
+# -----------------------------
+# Structure / coherence
+# -----------------------------
+def structure_match_score(user_answer: Union[str, AnalyzedAnswer]) -> float:
+    """Definition → Explanation → Example markers, 0..1."""
+    a = _as_analysis(user_answer or "")
+    structure_score = 0.0
+
+    if any(w in a.lower for w in ["is defined as", "refers to", "means"]):
+        structure_score += 0.33
+    if any(w in a.lower for w in ["for example", "for instance", "e.g"]):
+        structure_score += 0.33
+    if a.word_count > 25:
+        structure_score += 0.34
+
+    return min(1.0, round(structure_score, 3))
+
+def coherence_score(user_answer: Union[str, AnalyzedAnswer]) -> float:
+    """Logical flow: rewards multi-sentence answers with real sentence boundaries."""
+    a = _as_analysis(user_answer or "")
+    coherence = 0.0
+    try:
+        if a.doc is None:
+            a.doc = nlp(a.text)
+        if len(list(a.doc.sents)) >= 2:
+            coherence = 1.0 if a.doc.has_annotation("SENT_START") else 0.7
+    except:
+        coherence = 0.5
+
+    return round(coherence, 3)
+
 # -----------------------------
 # Unified evaluation
 # -----------------------------
+def _rejected_result() -> Dict:
+    return {
+        "semantic_score": 0.0,
+        "keyword_score": 0.0,
+        "content_score": 0.0,
+        "clarity": 0.0,
+        "conciseness": 0.0,
+        "confidence": 0.0,
+        "coherence": 0.0,
+        "structure_score": 0.0,
+        "final_score": 0.0,
+        "feedback": (
+            "Answer is too short or lacks meaningful content. "
+            "Write 2–4 complete sentences explaining the concept clearly."
+        )
+    }
+
 def evaluate_answer(
     user_answer: str,
     benchmark_answer: str,
-    question_keywords: List[str] = None,
-    weights: Dict[str, float] = None
+    question_keywords: Union[KeywordMatcher, List[str]] = None,
+    weights: Dict[str, float] = None,
+    benchmark_embedding: Optional[np.ndarray] = None
 ) -> Dict:
 
+    # Single analysis pass shared by every scorer below
+    with _timed("analyze"):
+        analysis = analyze_answer(user_answer)
+
     # --------------------------------------------------
     # 0. HARD REJECT: meaningless, one-word, low-effort
     # --------------------------------------------------
-    if is_meaningless_strict(user_answer):
-        return {
-            "semantic_score": 0.0,
-            "keyword_score": 0.0,
-            "content_score": 0.0,
-            "clarity": 0.0,
-            "conciseness": 0.0,
-            "confidence": 0.0,
-            "coherence": 0.0,
-            "structure_score": 0.0,
-            "final_score": 0.0,
-            "feedback": (
-                "Answer is too short or lacks meaningful content. "
-                "Write 2–4 complete sentences explaining the concept clearly."
-            )
-        }
+    if _is_meaningless(analysis):
+        return _rejected_result()
 
     # --------------------------------------------------
-    # 1. Default weights (balanced for technical Q&A)
+    # 1. Semantic similarity (0–1)
+    # --------------------------------------------------
+    with _timed("semantic"):
+        semantic = semantic_similarity_score(analysis, benchmark_answer, benchmark_embedding)
+
+    return _score_answer(analysis, semantic, question_keywords, weights)
+
+def _prepare_batch(answers: List[str], benchmarks: List[Optional[str]]) -> Tuple[List[AnalyzedAnswer], List[Optional[Dict]], List[int]]:
+    """
+    First half of the batch entry points: analyze every answer once, fill in the
+    rejected results and parse sentences for the rest in one nlp.pipe run.
+    Returns (analyses, results with only the rejections set, indices to embed).
+    """
+    results: List[Optional[Dict]] = [None] * len(answers)
+    eligible: List[int] = []
+    with _timed("analyze"):
+        analyses = [analyze_answer(answer or "") for answer in answers]
+
+    for i, a in enumerate(analyses):
+        if _is_meaningless(a):
+            results[i] = _rejected_result()
+        elif _semantic_eligible(a, benchmarks[i]):
+            eligible.append(i)
+
+    # Sentence boundaries for every answer that will be scored, in one nlp.pipe run
+    to_parse = [i for i in range(len(answers)) if results[i] is None]
+    try:
+        with _timed("spacy_parse"):
+            docs = parse_sentences_batch([analyses[i].text for i in to_parse])
+        for i, doc in zip(to_parse, docs):
+            analyses[i].doc = doc
+    except Exception as e:
+        logger.exception("Batched spaCy parsing failed: %s", e)
+    return analyses, results, eligible
+
+def _score_batch(
+    analyses: List[AnalyzedAnswer],
+    results: List[Optional[Dict]],
+    eligible: List[int],
+    benchmarks: List[Optional[str]],
+    benchmark_embeddings: List[Optional[np.ndarray]],
+    keywords: List[Union[KeywordMatcher, List[str], None]],
+    weights: List[Optional[Dict[str, float]]]
+) -> List[Dict]:
+    """Second half: one embedding pass for the eligible answers, then score every answer not yet rejected."""
+    semantic = [0.0] * len(analyses)
+    if eligible:
+        try:
+            with _timed("semantic"):
+                sims = batch_semantic_similarity(
+                    [analyses[i].text for i in eligible],
+                    [benchmarks[i] for i in eligible],
+                    [benchmark_embeddings[i] for i in eligible],
+                )
+            for i, sim in zip(eligible, sims):
+                semantic[i] = sim
+        except Exception as e:
+            logger.exception("Batched semantic similarity computation failed: %s", e)
+
+    for i, a in enumerate(analyses):
+        if results[i] is None:
+            results[i] = _score_answer(a, semantic[i], keywords[i], weights[i])
+    return results
+
+def evaluate_answers_batch(items: List[Dict], weights: Dict[str, float] = None) -> List[Dict]:
+    """
+    Evaluate many answers with one embedding pass.
+
+    items: [{"user_answer": ..., "benchmark_answer": ..., "question_keywords": [...]}, ...]
+    "question_keywords" may be a list or a prebuilt KeywordMatcher. An item may
+    also carry "benchmark_embedding" (precomputed, normalized).
+    Returns one result per item, in input order, shaped exactly like evaluate_answer().
+    """
+    benchmarks = [item.get("benchmark_answer") for item in items]
+    analyses, results, eligible = _prepare_batch([item.get("user_answer") for item in items], benchmarks)
+    return _score_batch(
+        analyses,
+        results,
+        eligible,
+        benchmarks,
+        [item.get("benchmark_embedding") for item in items],
+        [item.get("question_keywords") for item in items],
+        [item.get("weights", weights) for item in items],
+    )
+
+def _score_answer(
+    analysis: AnalyzedAnswer,
+    semantic: float,
+    question_keywords: Union[KeywordMatcher, List[str]] = None,
+    weights: Dict[str, float] = None
+) -> Dict:
+    """Everything after the embedding step: keyword, structure, coherence, delivery."""
+
+    # --------------------------------------------------
+    # 2. Default weights (balanced for technical Q&A)
     # --------------------------------------------------
     W = {
         "semantic": 0.45,
@@ -306,48 +811,29 @@ def evaluate_answer(
     if weights:
         W.update(weights)
 
-    # --------------------------------------------------
-    # 2. Semantic similarity (0–1)
-    # --------------------------------------------------
-    semantic = semantic_similarity_score(user_answer, benchmark_answer)
-
     # --------------------------------------------------
     # 3. Keyword coverage score (0–1)
     # --------------------------------------------------
-    keyword = keyword_match_score(user_answer, question_keywords or [])
+    with _timed("keyword"):
+        keyword = keyword_match_score(analysis, question_keywords)
 
     # --------------------------------------------------
     # 4. Structural score (Definition → Explanation → Example)
     # --------------------------------------------------
-    structure_score = 0.0
-    ua_lower = user_answer.lower()
-
-    if any(w in ua_lower for w in ["is defined as", "refers to", "means"]):
-        structure_score += 0.33
-    if any(w in ua_lower for w in ["for example", "for instance", "e.g"]):
-        structure_score += 0.33
-    if len(user_answer.split()) > 25:
-        structure_score += 0.34
-
-    structure_score = min(1.0, round(structure_score, 3))
+    with _timed("structure"):
+        structure_score = structure_match_score(analysis)
 
     # --------------------------------------------------
     # 5. Coherence Score (logical flow)
     # --------------------------------------------------
-    coherence = 0.0
-    try:
-        doc = nlp(user_answer)
-        if len(list(doc.sents)) >= 2:
-            coherence = 1.0 if doc.has_annotation("SENT_START") else 0.7
-    except:
-        coherence = 0.5
-
-    coherence = round(coherence, 3)
+    with _timed("coherence"):
+        coherence = coherence_score(analysis)
 
     # --------------------------------------------------
     # 6. Delivery scoring (clarity, conciseness, confidence)
     # --------------------------------------------------
-    delivery = analyze_delivery(user_answer)
+    with _timed("delivery"):
+        delivery = analyze_delivery(analysis)
 
     # Combine
     delivery_score = round(
@@ -429,6 +915,43 @@ def evaluate_answer(
     }
 
 
+# --------------------------------------------------------
+# Bias-Free Multi-Answer Evaluation (Order-Independent)
+# --------------------------------------------------------
+def evaluate_answers_bias_free(
+    answers: List[str],
+    benchmark_answer: str,
+    question_keywords: Union[KeywordMatcher, List[str]] = None,
+    weights: Dict[str, float] = None,
+    benchmark_embedding: Optional[np.ndarray] = None
+) -> List[Dict]:
+    """
+    Score many answers to the same question (e.g. a cohort) without ordering bias.
+
+    Every answer is scored only against the benchmark, never against the other
+    answers, so the result cannot depend on submission order. Same pipeline as
+    evaluate_answers_batch (_prepare_batch / _score_batch):
+    1. The benchmark is encoded once (or taken from benchmark_embedding).
+    2. All distinct answers are encoded in one batched pass, in sorted order, so
+       even the padded batches the model sees do not depend on submission order.
+    3. Results are returned by index, so duplicate answers each get their own entry.
+    """
+    n = len(answers)
+    if n == 0:
+        return []
+    benchmarks = [benchmark_answer] * n
+    analyses, results, eligible = _prepare_batch(answers, benchmarks)
+    return _score_batch(
+        analyses,
+        results,
+        eligible,
+        benchmarks,
+        [benchmark_embedding] * n,
+        [get_keyword_matcher(question_keywords)] * n,
+        [weights] * n,
+    )
+
+
 # -----------------------------
 # Example usage (for quick local test)
 # -----------------------------
@@ -451,42 +974,3 @@ if __name__ == "__main__":
         print("INPUT:", user_text)
         print(res)
         print("-" * 60)
-
-# --------------------------------------------------------
-# Bias-Free Multi-Answer Evaluation (Order-Independent)
-# --------------------------------------------------------
-import random
-
-def evaluate_answers_bias_free(
-    answers: List[str],
-    benchmark_answer: str,
-    question_keywords: List[str]
-):
-    """
-    Removes ordering bias:
-    1. Shuffle answers randomly.
-    2. Evaluate each with your existing evaluate_answer().
-    3. Restore original order.
-    4. Return scores in original order.
-    """
-
-    # 1. copy original list
-    original_order = answers[:]
-
-    # 2. shuffle for unbiased scoring
-    shuffled = answers[:]
-    random.shuffle(shuffled)
-
-    # 3. evaluate all shuffled answers
-    temp_results = {}
-    for ans in shuffled:
-        temp_results[ans] = evaluate_answer(
-            user_answer=ans,
-            benchmark_answer=benchmark_answer,
-            question_keywords=question_keywords
-        )
-
-    # 4. restore original order
-    final_scores = [temp_results[a] for a in original_order]
-
-    return final_scores
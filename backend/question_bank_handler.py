@@ -6,6 +6,11 @@ from pathlib import Path
 from difflib import get_close_matches
 from typing import List, Dict, Optional
 
+import numpy as np
+
+from embedding_store import BenchmarkEmbeddingStore
+from nlp_evaluation_engine import KeywordMatcher, normalize_keywords, get_keyword_matcher
+
 LOG = logging.getLogger("question_bank_handler")
 logging.basicConfig(level=logging.INFO)
 
@@ -14,6 +19,12 @@ QUESTION_BANK_PATH = Path("question_bank.json")
 # In-memory question store
 _question_bank: List[Dict] = []
 
+# Precomputed benchmark embeddings for _question_bank (built / mapped on first use)
+_benchmark_store: Optional[BenchmarkEmbeddingStore] = None
+
+# Compiled keyword matcher per question id, built once at load time
+_keyword_matchers: Dict[str, KeywordMatcher] = {}
+
 
 # -------------------- Loading Utilities --------------------
 def load_questions_from_file(path: Optional[Path] = None) -> None:
@@ -22,8 +33,11 @@ def load_questions_from_file(path: Optional[Path] = None) -> None:
       - top-level list of question dicts
       - dict with "questions": [...]
       - list of JSON strings
+
+    Benchmark embeddings are attached lazily: nothing is encoded here, the
+    store is mapped (or rebuilt if the bank/model changed) on first lookup.
     """
-    global _question_bank
+    global _question_bank, _benchmark_store, _keyword_matchers
     p = path or QUESTION_BANK_PATH
     try:
         with open(p, "r", encoding="utf-8") as f:
@@ -50,6 +64,69 @@ def load_questions_from_file(path: Optional[Path] = None) -> None:
         LOG.exception("Failed to load question bank: %s", e)
         _question_bank = []
 
+    # Normalize keyword sets once; every question carries a plain list from here on
+    _keyword_matchers = {}
+    for q in _question_bank:
+        q["keywords"] = normalize_keywords(q.get("keywords") or q.get("keywords_list") or q.get("keywords_str"))
+        if q.get("id"):
+            _keyword_matchers[str(q["id"])] = KeywordMatcher(q["keywords"])
+
+    _benchmark_store = BenchmarkEmbeddingStore(_question_bank)
+
+
+def question_count() -> int:
+    """Questions currently loaded (0 before load_questions_from_file, or if loading failed)."""
+    return len(_question_bank)
+
+
+def get_benchmark_embedding(question_id) -> Optional[np.ndarray]:
+    """
+    Precomputed embedding of a bank question's benchmark text (the question
+    itself), or None if the id is unknown or the store can't be built.
+    """
+    if _benchmark_store is None:
+        return None
+    try:
+        return _benchmark_store.get(question_id)
+    except Exception as e:
+        LOG.exception("Benchmark embedding lookup failed: %s", e)
+        return None
+
+
+def warm_benchmark_embeddings(build: bool = True) -> bool:
+    """
+    Map the benchmark embedding store now, so no request pays for it. With
+    build=False nothing is encoded: returns False if the artifact is missing.
+    """
+    if _benchmark_store is None or not len(_benchmark_store):
+        return False
+    try:
+        if not build and not _benchmark_store.is_built():
+            return False
+        _benchmark_store.load()
+        return True
+    except Exception as e:
+        LOG.exception("Benchmark embedding warm-up failed: %s", e)
+        return False
+
+
+def build_benchmark_embeddings() -> bool:
+    """Load the bank and make sure its embedding artifact exists (for a helper process)."""
+    load_questions_from_file()
+    return warm_benchmark_embeddings()
+
+
+def get_question_keyword_matcher(question: Dict) -> KeywordMatcher:
+    """
+    Compiled keyword matcher for a question object (as emitted by select_questions
+    or stored on a session). Bank questions resolve by id; anything else is
+    compiled from its own keywords and cached by keyword set.
+    """
+    matcher = _keyword_matchers.get(str(question.get("id"))) if question.get("id") else None
+    if matcher is not None:
+        return matcher
+    return get_keyword_matcher(question.get("keywords") or question.get("keywords_list") or question.get("keywords_str"))
+
 
 # -------------------- Helper Utils --------------------
 def _normalize(s: Optional[str]) -> Optional[str]:
@@ -197,7 +274,7 @@ def select_questions(
             "domain": q.get("domain"),
             "difficulty": q.get("difficulty"),
             "question": q.get("question"),
-            "keywords": q.get("keywords") or q.get("keywords_list") or q.get("keywords_str") or []
+            "keywords": list(q.get("keywords") or [])
         })
 
     return {"questions": questions_out, "meta": meta}
@@ -0,0 +1,243 @@
+"""
+Resume upload handling for /api/get-domains, off the event loop.
+
+  - the request body is counted while it streams in (UploadSizeLimit, an ASGI
+    middleware) and refused with 413 as soon as it passes RESUME_MAX_BYTES, so
+    an oversized upload is never spooled whole, with or without Content-Length;
+    the handler's read then checks the file part itself (ResumeTooLarge -> 413)
+  - text extraction + domain ranking run on a small bounded thread pool
+  - extraction walks the document page by page (paragraph by paragraph for docx)
+    and stops at RESUME_MAX_PAGES / RESUME_MAX_CHARS
+  - results are cached by content: SHA-256 of the uploaded bytes plus the
+    DOMAIN_SKILL_MAP version, in a persistent LRU (disk_cache.DiskCache), so a
+    re-uploaded resume skips parsing entirely; hashing and cache I/O are
+    blocking, so callers run them on a thread (lookup_cached_domains / store_domains)
+
+Configuration (environment):
+    RESUME_MAX_BYTES       largest accepted upload              (default 10 MiB)
+    RESUME_MAX_PAGES       PDF pages read at most               (default 20)
+    RESUME_MAX_CHARS       characters of text kept at most      (default 100000)
+    RESUME_PARSE_WORKERS   concurrent parses per API process    (default 2)
+    RESUME_CACHE_PATH      SQLite file for cached results, empty disables it (default cache/resumes.db)
+    RESUME_CACHE_SIZE      max cached resumes                   (default 5000)
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+from disk_cache import DiskCache
+
+LOG = logging.getLogger("resume_extraction")
+
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+RESUME_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", "100000"))
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", "2"))
+RESUME_CACHE_PATH = os.getenv("RESUME_CACHE_PATH", str(Path("cache") / "resumes.db"))
+RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", "5000"))
+
+PDF_MIMETYPE = "application/pdf"
+DOCX_MIMETYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+_READ_CHUNK = 64 * 1024
+# Room for the multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class ResumeTooLarge(ValueError):
+    """The upload exceeds RESUME_MAX_BYTES."""
+
+
+def too_large_message(max_bytes: int = RESUME_MAX_BYTES) -> str:
+    return f"Resume exceeds the {round(max_bytes / (1024 * 1024), 2):g} MB upload limit."
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware capping the request body of the given paths while it streams
+    in. A declared Content-Length over the limit is refused before anything is
+    read; a chunked (or understated) body fails with 413 as soon as the bytes
+    received pass it, before Starlette has spooled the rest of the upload.
+    """
+
+    def __init__(self, app, paths: Iterable[str], max_bytes: int = RESUME_MAX_BYTES):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_body = max_bytes + MULTIPART_OVERHEAD
+        self.detail = too_large_message(max_bytes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        length = Headers(scope=scope).get("content-length")
+        if length and length.isdigit() and int(length) > self.max_body:
+            await JSONResponse({"detail": self.detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body:
+                    # Raised inside body parsing; FastAPI passes HTTPExceptions through to the handler
+                    raise HTTPException(status_code=413, detail=self.detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def read_upload_limited(upload, max_bytes: int = RESUME_MAX_BYTES) -> bytes:
+    """Read an UploadFile chunk by chunk, failing as soon as it grows past max_bytes."""
+    buf = bytearray()
+    while True:
+        chunk = await upload.read(_READ_CHUNK)
+        if not chunk:
+            return bytes(buf)
+        buf.extend(chunk)
+        if len(buf) > max_bytes:
+            raise ResumeTooLarge(too_large_message(max_bytes))
+
+
+# -----------------------------
+# Extraction (runs on the pool)
+# -----------------------------
+def _extract_pdf(data: bytes, max_pages: int, max_chars: int) -> Tuple[str, Dict]:
+    import fitz
+
+    parts, chars = [], 0
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        total_pages = doc.page_count
+        pages_read = 0
+        for page in doc:
+            if pages_read >= max_pages or chars >= max_chars:
+                break
+            text = page.get_text()
+            parts.append(text)
+            chars += len(text)
+            pages_read += 1
+    text = "".join(parts)
+    return text[:max_chars], {
+        "pages_read": pages_read,
+        "total_pages": total_pages,
+        "truncated": pages_read < total_pages or len(text) > max_chars,
+    }
+
+
+def _extract_docx(data: bytes, max_chars: int) -> Tuple[str, Dict]:
+    import docx
+
+    parts, chars, truncated = [], 0, False
+    for p in docx.Document(io.BytesIO(data)).paragraphs:
+        if chars >= max_chars:
+            truncated = True
+            break
+        parts.append(p.text)
+        chars += len(p.text) + 1
+    text = "\n".join(parts)
+    return text[:max_chars], {"truncated": truncated or len(text) > max_chars}
+
+
+def _parse_resume(data: bytes, content_type: str, max_pages: int, max_chars: int) -> Tuple[list, Dict]:
+    from resume_parser import get_ranked_domains
+
+    t0 = time.perf_counter()
+    if content_type == PDF_MIMETYPE:
+        text, info = _extract_pdf(data, max_pages, max_chars)
+    else:
+        text, info = _extract_docx(data, max_chars)
+    t1 = time.perf_counter()
+    top_domains = get_ranked_domains(text)
+    t2 = time.perf_counter()
+
+    info.update({
+        "chars": len(text),
+        "extract_ms": round((t1 - t0) * 1000, 1),
+        "rank_ms": round((t2 - t1) * 1000, 1),
+    })
+    return top_domains, info
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=max(1, RESUME_PARSE_WORKERS), thread_name_prefix="resume-parse")
+    return _pool
+
+
+async def analyze_resume(data: bytes, content_type: str,
+                         max_pages: int = RESUME_MAX_PAGES, max_chars: int = RESUME_MAX_CHARS) -> Tuple[list, Dict]:
+    """Extract text and rank domains on the parse pool. Returns (top_domains, stage info)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), _parse_resume, data, content_type, max_pages, max_chars)
+
+
+# -----------------------------
+# Content-addressed result cache
+# -----------------------------
+_cache: Optional[DiskCache] = None
+_cache_failed = False
+
+
+def _get_cache() -> Optional[DiskCache]:
+    global _cache, _cache_failed
+    if _cache is None and RESUME_CACHE_PATH and not _cache_failed:
+        try:
+            _cache = DiskCache(RESUME_CACHE_PATH, max_entries=RESUME_CACHE_SIZE)
+        except Exception as e:
+            _cache_failed = True
+            LOG.warning("Resume cache disabled (%s): %s", RESUME_CACHE_PATH, e)
+    return _cache
+
+
+def resume_cache_key(data: bytes, max_pages: int = RESUME_MAX_PAGES, max_chars: int = RESUME_MAX_CHARS) -> str:
+    """SHA-256 of the file plus everything else the ranking depends on: the skill map and the extraction caps."""
+    from resume_parser import skill_map_version
+
+    digest = hashlib.sha256(data).hexdigest()
+    return f"{digest}:{skill_map_version()}:{max_pages}:{max_chars}"
+
+
+def cached_domains(key: str) -> Optional[List[Dict]]:
+    cache = _get_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(key)
+    except Exception as e:
+        LOG.warning("Resume cache read failed: %s", e)
+        return None
+
+
+def lookup_cached_domains(data: bytes) -> Tuple[str, Optional[List[Dict]]]:
+    """Cache key for an upload and its cached domains (None on a miss). Blocking: hashes the whole file."""
+    key = resume_cache_key(data)
+    return key, cached_domains(key)
+
+
+def store_domains(key: str, top_domains: List[Dict]) -> None:
+    cache = _get_cache()
+    if cache is None:
+        return
+    try:
+        cache.set(key, top_domains)
+    except Exception as e:
+        LOG.warning("Resume cache write failed: %s", e)
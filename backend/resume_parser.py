@@ -1,5 +1,15 @@
 from config import DOMAIN_SKILL_MAP
 from collections import defaultdict
+from functools import lru_cache
+import hashlib
+import json
+
+
+@lru_cache(maxsize=None)
+def skill_map_version() -> str:
+    """Short hash of DOMAIN_SKILL_MAP; changes whenever a domain or skill is edited (computed once per process)."""
+    payload = json.dumps(DOMAIN_SKILL_MAP, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
 
 # Renamed function for clarity
 def get_ranked_domains(text: str) -> list:
@@ -0,0 +1,161 @@
+"""
+Multi-worker launcher that loads the NLP models once, before forking.
+
+    python serve.py [--workers 4] [--host 0.0.0.0] [--port 8000]
+
+`uvicorn main:app --workers N` starts N independent interpreters and each one
+loads the SentenceTransformer and spaCy models itself: N x the memory and N x
+the load time. Here the parent process imports the app, loads the question
+bank and the models, puts the models in inference mode, moves everything it
+allocated out of the garbage collector's reach (gc.freeze) and only then forks
+the workers. The model pages are shared copy-on-write between all of them.
+The parent binds the socket, the workers accept on it, and the parent
+restarts any worker that dies.
+
+Workers score answers in-process, so EVAL_POOL_WORKERS defaults to 0 here: a
+spawned evaluation pool would load private copies of the models again.
+Nothing is encoded in the parent before the fork (inference thread pools do
+not survive fork); each worker runs the engine warm-up at startup instead.
+The parent does map the benchmark embedding store, so the workers share it;
+if its artifact is missing, a short-lived spawned process builds it first.
+
+--no-preload forks first and lets each worker load its own models, which is
+what `uvicorn --workers` does; benchmarks/preload_memory.py compares the two.
+
+Needs os.fork (Linux / macOS). Configuration (environment):
+    SERVE_WORKERS   default for --workers (default 2)
+"""
+
+import argparse
+import gc
+import logging
+import multiprocessing as mp
+import os
+import random
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("EVAL_POOL_WORKERS", "0")
+
+import uvicorn
+
+LOG = logging.getLogger("serve")
+
+SERVE_WORKERS = int(os.getenv("SERVE_WORKERS", "2"))
+
+
+def _map_benchmark_embeddings() -> None:
+    import question_bank_handler
+
+    if question_bank_handler.warm_benchmark_embeddings(build=False):
+        return
+    # Building the artifact runs the model, which must not happen in this process
+    LOG.info("Building benchmark embeddings in a helper process.")
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+            pool.submit(question_bank_handler.build_benchmark_embeddings).result()
+    except Exception as e:
+        LOG.exception("Building benchmark embeddings failed: %s", e)
+    if not question_bank_handler.warm_benchmark_embeddings(build=False):
+        LOG.warning("Benchmark embeddings unavailable; workers will build them on first use.")
+
+
+def _preload(main) -> None:
+    t0 = time.perf_counter()
+    main.load_questions_from_file()
+    main.nlp_init_models()
+    main.nlp_freeze_models()
+    _map_benchmark_embeddings()
+    main.PRELOADED = True
+    # Objects that exist now live as long as the process; keeping the collector
+    # off them stops it from touching (and so copying) their pages in the workers
+    gc.collect()
+    gc.freeze()
+    LOG.info("Preloaded question bank and NLP models in %.2fs.", time.perf_counter() - t0)
+
+
+def _run_worker(main, config: uvicorn.Config, sock, launched_at: float) -> None:
+    # Fresh RNG (question selection), and no database connections shared with the parent
+    random.seed()
+    main.engine.dispose(close=False)
+
+    def _ready():
+        LOG.info("Worker %d ready %.2fs after launch.", os.getpid(), time.time() - launched_at)
+
+    main.app.router.add_event_handler("startup", _ready)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(workers: int, host: str, port: int, preload: bool = True, log_level: str = "info") -> None:
+    logging.basicConfig(level=logging.INFO)
+    launched_at = time.time()
+
+    import main
+
+    if preload:
+        _preload(main)
+
+    config = uvicorn.Config(main.app, host=host, port=port, log_level=log_level)
+    sock = config.bind_socket()
+    children = set()
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                _run_worker(main, config, sock, launched_at)
+            except BaseException:
+                LOG.exception("Worker %d crashed.", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+        children.add(pid)
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    LOG.info("Starting %d workers on %s:%d (preload=%s).", workers, host, port, preload)
+    for _ in range(workers):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            LOG.warning("Worker %d exited (status %d); starting a replacement.", pid, status)
+            spawn()
+    sock.close()
+    LOG.info("All workers stopped.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=SERVE_WORKERS)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                        help="fork first and load the models in every worker (for comparison)")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        sys.exit("serve.py needs os.fork; use `uvicorn main:app` on this platform.")
+    serve(args.workers, args.host, args.port, preload=args.preload, log_level=args.log_level)
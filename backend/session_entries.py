@@ -0,0 +1,106 @@
+"""
+The entry dicts a session's answers and evaluations are exchanged as.
+
+Every saved answer is a "raw" entry with an id and a state:
+
+    pending    saved, not scored yet
+    evaluated  scored; an "evaluated" entry with raw_id == id holds the result
+    failed     the last scoring attempt failed ("error" says why); retried by evaluate-all
+
+Evaluated entries are stamped with the engine_version that produced them, so
+results from an older engine can be found and re-scored.
+
+They are stored as rows by answer_store. The list helpers below are for the
+old InterviewSession.interview_results lists, which answer_store migrates.
+"""
+
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+
+STATE_PENDING = "pending"
+STATE_EVALUATED = "evaluated"
+STATE_FAILED = "failed"
+
+
+def new_raw_entry(question: str, answer: str) -> Dict:
+    return {
+        "type": "raw",
+        "id": uuid.uuid4().hex,
+        "state": STATE_PENDING,
+        "question": question,
+        "answer": answer,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def raw_entries(results: Optional[List[Dict]]) -> List[Dict]:
+    return [r for r in (results or []) if r.get("type") == "raw"]
+
+
+def adopt_legacy_entries(results: List[Dict]) -> bool:
+    """
+    Give raw entries saved before ids / states existed an id and a state, and link
+    them to a matching unlinked evaluation (same question and answer) if there is one.
+    Returns True if anything changed.
+    """
+    changed = False
+    unlinked = [r for r in results if r.get("type") == "evaluated" and not r.get("raw_id")]
+    for raw in raw_entries(results):
+        if raw.get("id"):
+            continue
+        raw["id"] = uuid.uuid4().hex
+        match = next(
+            (e for e in unlinked if e.get("question") == raw.get("question") and e.get("answer") == raw.get("answer")),
+            None,
+        )
+        if match is not None:
+            unlinked.remove(match)
+            match["raw_id"] = raw["id"]
+            raw["state"] = STATE_EVALUATED
+        else:
+            raw["state"] = STATE_PENDING
+        changed = True
+    return changed
+
+
+def drop_duplicate_evaluations(results: List[Dict]) -> int:
+    """
+    Remove repeated "evaluated" entries for the same answer, keeping the last one.
+    Old versions of evaluate-all re-scored answers that were already evaluated
+    and appended another entry each time.
+
+    An evaluation belongs to an answer through raw_id or, before ids existed, by
+    question and answer text: per text, as many id-less evaluations are kept as
+    there are raw entries with that text still unlinked (one if there is no raw
+    entry at all, as for evaluate-answer results). Run before adopt_legacy_entries
+    so the entries it links are the latest. Returns the number of entries removed.
+    """
+    linked_ids = {e.get("raw_id") for e in results if e.get("type") == "evaluated" and e.get("raw_id")}
+    raws_per_text = Counter((r.get("question"), r.get("answer")) for r in raw_entries(results))
+    unlinked_per_text = Counter(
+        (r.get("question"), r.get("answer")) for r in raw_entries(results) if r.get("id") not in linked_ids
+    )
+
+    keep, seen_ids, seen_texts = set(), set(), Counter()
+    for idx in range(len(results) - 1, -1, -1):
+        entry = results[idx]
+        if entry.get("type") != "evaluated":
+            continue
+        raw_id = entry.get("raw_id")
+        if raw_id:
+            if raw_id in seen_ids:
+                continue
+            seen_ids.add(raw_id)
+        else:
+            text = (entry.get("question"), entry.get("answer"))
+            quota = unlinked_per_text[text] if raws_per_text[text] else 1
+            if seen_texts[text] >= quota:
+                continue
+            seen_texts[text] += 1
+        keep.add(idx)
+
+    before = len(results)
+    results[:] = [e for i, e in enumerate(results) if e.get("type") != "evaluated" or i in keep]
+    return before - len(results)
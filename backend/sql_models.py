@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.ext.mutable import MutableList   # ✅ ADD THIS
 from database import Base
@@ -16,5 +16,88 @@ class InterviewSession(Base):
     # Store generated questions
     generated_questions = Column(MutableList.as_mutable(JSON), nullable=True)   # ✅ FIXED
 
-    # Store ALL answers (multiple entries)
+    # Legacy store of ALL answers (multiple entries). Answers and evaluations now live in
+    # the answers / evaluations tables; answer_store.migrate_legacy_results moves old
+    # blobs there and clears this column.
     interview_results = Column(MutableList.as_mutable(JSON), nullable=True)    # ✅ FIXED
+
+    # Bumped on every write to the session's answers / evaluations (see answer_store)
+    results_revision = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Materialized GET /results report and the results_revision it was built from
+    results_report = Column(JSON, nullable=True)
+    results_report_revision = Column(Integer, nullable=True)
+
+    # Optimistic concurrency: every ORM update of the session row is a compare-and-swap
+    # on this column (UPDATE ... WHERE version = <read version>) and raises StaleDataError
+    # when another request changed the row first; see database.retry_on_conflict
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Per-session summary kept up to date by answer_store on every answer / evaluation
+    # write, so history and progress queries never read the answers themselves.
+    # NULL on sessions from before these columns; filled in at startup
+    # (answer_store.backfill_session_summaries).
+    answer_count = Column(Integer, nullable=True, default=0)
+    evaluated_count = Column(Integer, nullable=True, default=0)
+    score_sum = Column(Float, nullable=True, default=0.0)        # sum of the 0-10 evaluation scores
+    average_score = Column(Float, nullable=True)                 # score_sum / evaluated_count
+
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (
+        # A user's sessions, newest first (history pages, progress trends)
+        Index("ix_interview_sessions_user_id_session_date", "user_id", "session_date"),
+    )
+
+
+class Answer(Base):
+    """One saved (raw) answer. Appended by save-answer; only state / error change afterwards."""
+    __tablename__ = "answers"
+
+    id = Column(Integer, primary_key=True)
+    # The entry "id" clients see (uuid hex); evaluations point back to it as "raw_id"
+    entry_id = Column(String(64), nullable=False, unique=True)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id", ondelete="CASCADE"), nullable=False)
+    question = Column(Text, nullable=False, default="")
+    answer = Column(Text, nullable=False, default="")
+    state = Column(String(16), nullable=False)
+    error = Column(Text, nullable=True)
+    timestamp = Column(String(32), nullable=True)
+
+    __table_args__ = (Index("ix_answers_session_id_id", "session_id", "id"),)
+
+    def to_entry(self) -> dict:
+        """The "raw" entry dict, as stored in interview_results before."""
+        entry = {
+            "type": "raw",
+            "id": self.entry_id,
+            "state": self.state,
+            "question": self.question,
+            "answer": self.answer,
+            "timestamp": self.timestamp,
+        }
+        if self.error:
+            entry["error"] = self.error
+        return entry
+
+
+class Evaluation(Base):
+    """
+    One scored answer. answer_id links it to its Answer (at most one evaluation
+    each); evaluate-answer results and some migrated entries have none.
+    """
+    __tablename__ = "evaluations"
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id", ondelete="CASCADE"), nullable=False)
+    answer_id = Column(Integer, ForeignKey("answers.id", ondelete="CASCADE"), nullable=True, unique=True)
+    question = Column(Text, nullable=False, default="")
+    engine_version = Column(String(255), nullable=True)
+    # The entry's score on the 0-10 scale (feedback.normalize), for aggregation
+    score = Column(Float, nullable=True)
+    # The full "evaluated" entry returned to clients (shape varies by endpoint)
+    data = Column(JSON, nullable=False)
+
+    __table_args__ = (Index("ix_evaluations_session_id_id", "session_id", "id"),)
+
+    def to_entry(self) -> dict:
+        return dict(self.data)
@@ -0,0 +1,52 @@
+import os
+import shutil
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Modules read these at import: point every database and cache at a scratch
+# directory, so no test (or an import of main) ever touches the real files
+_SCRATCH = Path(tempfile.mkdtemp(prefix="interview-coach-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_SCRATCH / 'interview_sessions.db'}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["JOB_STORE_PATH"] = str(_SCRATCH / "jobs.db")
+os.environ["RESUME_CACHE_PATH"] = str(_SCRATCH / "resumes.db")
+os.environ["EVAL_CACHE_DISK_PATH"] = ""
+
+# The backend modules are imported flat (`import answer_store`), as main.py does
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_SCRATCH, ignore_errors=True)
+
+
+class _BagOfWordsEncoder:
+    """Deterministic stand-in for the sentence embedding model."""
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False):
+        out = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                out[row, zlib.crc32(token.encode("utf-8")) % 64] += 1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms == 0, 1.0, norms)
+
+
+@pytest.fixture
+def models(monkeypatch):
+    """Score with a bag-of-words encoder and a spaCy sentencizer instead of the real models."""
+    import spacy
+
+    import nlp_evaluation_engine as engine
+
+    sentencizer = spacy.blank("en")
+    sentencizer.add_pipe("sentencizer")
+    monkeypatch.setattr(engine, "semantic_model", _BagOfWordsEncoder())
+    monkeypatch.setattr(engine, "nlp", sentencizer)
+    monkeypatch.setattr(engine, "_models_initialized", True)
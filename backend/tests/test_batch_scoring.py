@@ -0,0 +1,45 @@
+import random
+
+import nlp_evaluation_engine as engine
+
+BENCHMARK = (
+    "A queue is a first-in, first-out data structure: elements are added at the rear and removed "
+    "from the front. It is used for scheduling, breadth-first search and buffering requests."
+)
+KEYWORDS = ["queue", "FIFO", "first-in first-out", "enqueue", "dequeue"]
+ANSWERS = [
+    "A queue is a FIFO structure. You enqueue at the back and dequeue at the front, for example in BFS.",
+    "Queues hold items in arrival order, so the first element added is the first element removed.",
+    "x",
+    "I think it is maybe a list of things that you could use sometimes for stuff.",
+    "A queue is a FIFO structure. You enqueue at the back and dequeue at the front, for example in BFS.",
+    "asdf qwer zxcv",
+    "It means first in first out. For example a printer queue processes jobs in the order they arrive.",
+    "Stacks are LIFO, queues are FIFO; a queue is what a scheduler uses to run tasks in arrival order.",
+]
+
+
+def test_bias_free_scoring_is_order_independent(models):
+    results = engine.evaluate_answers_bias_free(ANSWERS, BENCHMARK, question_keywords=KEYWORDS)
+    assert len(results) == len(ANSWERS)
+    assert results[0] == results[4]  # duplicates each get their own, identical, entry
+
+    rng = random.Random(7)
+    for _ in range(5):
+        order = list(range(len(ANSWERS)))
+        rng.shuffle(order)
+        permuted = engine.evaluate_answers_bias_free([ANSWERS[i] for i in order], BENCHMARK, question_keywords=KEYWORDS)
+        assert permuted == [results[i] for i in order]
+
+
+def test_batch_entry_points_score_like_single_evaluation(models):
+    bias_free = engine.evaluate_answers_bias_free(ANSWERS, BENCHMARK, question_keywords=KEYWORDS)
+    batch = engine.evaluate_answers_batch([
+        {"user_answer": answer, "benchmark_answer": BENCHMARK, "question_keywords": KEYWORDS}
+        for answer in ANSWERS
+    ])
+    single = [engine.evaluate_answer(answer, BENCHMARK, question_keywords=KEYWORDS) for answer in ANSWERS]
+
+    assert bias_free == batch == single
+    assert single[2]["final_score"] == 0.0  # rejected as meaningless
+    assert single[0]["semantic_score"] > 0.0
@@ -0,0 +1,51 @@
+import pytest
+
+import evaluation_cache
+import nlp_evaluation_engine as engine
+from disk_cache import DiskCache
+
+BENCHMARK = (
+    "A hash map stores key-value pairs in buckets chosen by hashing the key, "
+    "giving average constant-time lookups. Collisions are handled by chaining or open addressing."
+)
+KEYWORDS = ["hash", "bucket", "collision", "chaining", "open addressing"]
+COLLAPSED = (
+    "A hash map hashes each key to pick a bucket. Lookups are constant time on average. "
+    "Collisions are resolved by chaining entries in a list or by open addressing."
+)
+INDENTED = COLLAPSED.replace("bucket. ", "bucket.\n    ")
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = evaluation_cache.EvaluationCache(disk_path=str(tmp_path / "eval_cache.db"))
+    monkeypatch.setattr(evaluation_cache, "_cache", cache)
+    return cache
+
+
+def test_whitespace_variants_are_cached_separately(models, cache):
+    indented = engine.evaluate_answer(INDENTED, BENCHMARK, question_keywords=KEYWORDS)
+    collapsed = engine.evaluate_answer(COLLAPSED, BENCHMARK, question_keywords=KEYWORDS)
+    # The indent is a run of four spaces, which the engine treats as gibberish
+    assert indented["final_score"] != collapsed["final_score"]
+
+    assert evaluation_cache.evaluation_cache_key(INDENTED, BENCHMARK, KEYWORDS) != \
+        evaluation_cache.evaluation_cache_key(COLLAPSED, BENCHMARK, KEYWORDS)
+    assert evaluation_cache.cached_evaluate_answer(INDENTED, BENCHMARK, question_keywords=KEYWORDS) == indented
+    assert evaluation_cache.cached_evaluate_answer(COLLAPSED, BENCHMARK, question_keywords=KEYWORDS) == collapsed
+
+    # A fresh process sees the same results through the disk tier
+    cache.clear()
+    assert evaluation_cache.cached_evaluate_answer(COLLAPSED, BENCHMARK, question_keywords=KEYWORDS) == collapsed
+    assert evaluation_cache.cached_evaluate_answer(INDENTED, BENCHMARK, question_keywords=KEYWORDS) == indented
+    assert cache.stats()["disk_hits"] == 2
+
+
+def test_disk_cache_enforces_its_size_every_few_writes(tmp_path):
+    disk = DiskCache(tmp_path / "cache.db", max_entries=200)
+    assert disk.prune_every == 2
+
+    evicted = sum(disk.set(f"k{i}", i) for i in range(250))
+    # Pruned on every second write, so the file never holds more than one extra entry
+    assert evicted == 50
+    assert len(disk) == disk.max_entries
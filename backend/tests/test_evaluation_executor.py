@@ -0,0 +1,95 @@
+import asyncio
+import threading
+
+import pytest
+
+import evaluation_executor as executor
+from evaluation_executor import EvaluationQueueFull, EvaluationTimeout
+
+
+@pytest.fixture
+def inline_executor(monkeypatch):
+    # Scoring runs in the loop's thread executor; no models are needed for plain callables
+    monkeypatch.setattr(executor, "EVAL_POOL_WORKERS", 0)
+    monkeypatch.setattr(executor, "EVAL_QUEUE_DEPTH", 1)
+    monkeypatch.setattr(executor, "EVAL_TASK_TIMEOUT", 0.05)
+    monkeypatch.setattr(executor, "_in_flight", 0)
+    monkeypatch.setattr(executor, "_abandoned", 0)
+    monkeypatch.setattr(executor, "_ready", threading.Event())
+    executor._ready.set()
+    return executor
+
+
+def test_timed_out_task_keeps_its_slot_until_it_finishes(inline_executor):
+    release = threading.Event()
+
+    async def scenario():
+        with pytest.raises(EvaluationTimeout):
+            await executor._submit(release.wait, 5)
+
+        # The abandoned task is still running: it counts against the queue depth
+        assert executor.executor_stats()["in_flight"] == 1
+        assert executor.executor_stats()["abandoned"] == 1
+        assert executor.readiness()["saturated"]
+        with pytest.raises(EvaluationQueueFull):
+            await executor._submit(lambda: "never runs")
+
+        release.set()
+        for _ in range(100):
+            if executor._in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.executor_stats()["abandoned"] == 0
+        assert not executor.readiness()["saturated"]
+        return await executor._submit(lambda: "scored")
+
+    assert asyncio.run(scenario()) == "scored"
+
+
+def test_failed_task_releases_its_slot(inline_executor):
+    def boom():
+        raise ValueError("scoring failed")
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await executor._submit(boom)
+        await asyncio.sleep(0)
+        return executor._in_flight
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_disk_cache_lookups_run_off_the_event_loop(inline_executor, monkeypatch, tmp_path):
+    import evaluation_cache
+
+    # Memory tier disabled, so every lookup reaches the SQLite file
+    cache = evaluation_cache.EvaluationCache(max_entries=0, disk_path=str(tmp_path / "eval_cache.db"))
+    monkeypatch.setattr(evaluation_cache, "_cache", cache)
+    key = evaluation_cache.evaluation_cache_key("answer", "benchmark")
+    cache.put(key, {"final_score": 0.5})
+
+    disk_threads = []
+    disk_get = cache._disk.get
+    monkeypatch.setattr(cache._disk, "get", lambda k: disk_threads.append(threading.get_ident()) or disk_get(k))
+
+    async def scenario():
+        result = await executor.evaluate_answer("answer", "benchmark")
+        return result, threading.get_ident()
+
+    result, loop_thread = asyncio.run(scenario())
+    assert result == {"final_score": 0.5}
+    assert disk_threads and loop_thread not in disk_threads
+
+
+def test_inline_prepare_maps_the_benchmark_store(monkeypatch):
+    import question_bank_handler
+
+    warmed = []
+    monkeypatch.setattr(executor, "EVAL_POOL_WORKERS", 0)
+    monkeypatch.setattr(executor, "_ready", threading.Event())
+    monkeypatch.setattr(executor.nlp_engine, "init_models", lambda: None)
+    monkeypatch.setattr(question_bank_handler, "warm_benchmark_embeddings", lambda build=True: warmed.append(build) or True)
+
+    executor.prepare(warm_up=False)
+    assert executor.is_ready()
+    assert warmed == [True]
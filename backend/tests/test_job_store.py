@@ -0,0 +1,80 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+import job_store
+from job_store import JOB_COMPLETED, JOB_FAILED, JOB_RUNNING, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(tmp_path / "jobs.db")
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def test_results_are_appended_per_chunk_in_order(store):
+    job_id = store.create("evaluate-all", session_id=1, total=5)
+    store.start(job_id, 5)
+    store.add_results(job_id, [{"n": 0}, {"n": 1}])
+    store.add_results(job_id, [{"n": 2}], [{"raw_id": "x", "error": "boom"}])
+    store.add_results(job_id, [])
+    store.add_results(job_id, [{"n": 3}])
+    store.finish(job_id)
+
+    job = store.get(job_id)
+    assert job["status"] == JOB_COMPLETED
+    assert job["done"] == 5
+    assert job["progress"] == 1.0
+    assert [r["n"] for r in job["results"]] == [0, 1, 2, 3]
+    assert job["failures"] == [{"raw_id": "x", "error": "boom"}]
+
+
+def test_jobs_of_a_dead_worker_are_marked_interrupted(store):
+    job_id = store.create("evaluate-all", total=3)
+    store.start(job_id, 3)
+    store._connect().execute("UPDATE jobs SET worker_pid = ? WHERE id = ?", (_dead_pid(), job_id))
+
+    assert store.recover_interrupted() == 1
+    job = store.get(job_id)
+    assert job["status"] == JOB_FAILED
+    assert job["error"] == job_store.JOB_INTERRUPTED_ERROR
+
+
+def test_live_jobs_survive_recovery_but_not_a_poll_once_stale(store, monkeypatch):
+    job_id = store.create("evaluate-all", total=3)
+    store.start(job_id, 3)
+    # Another live process owns it: left alone at startup
+    store._connect().execute("UPDATE jobs SET worker_pid = 1 WHERE id = ?", (job_id,))
+    assert store.recover_interrupted() == 0
+    assert store.get(job_id)["status"] == JOB_RUNNING
+
+    # ...until it stops reporting progress
+    monkeypatch.setattr(job_store, "JOB_STALE_SECONDS", 60)
+    store._connect().execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (time.time() - 120, job_id))
+    assert store.get(job_id)["status"] == JOB_FAILED
+
+
+def test_prune_removes_only_expired_finished_jobs(store):
+    old_done = store.create("evaluate-all", total=1)
+    store.add_results(old_done, [{"n": 0}])
+    store.finish(old_done)
+    recent_done = store.create("evaluate-all", total=1)
+    store.finish(recent_done)
+    old_running = store.create("evaluate-all", total=1)
+    store.start(old_running, 1)
+    store._connect().execute(
+        "UPDATE jobs SET updated_at = ? WHERE id IN (?, ?)", (time.time() - 7200, old_done, old_running)
+    )
+
+    assert store.prune(ttl=3600) == 1
+    assert store.get(old_done) is None
+    assert store._connect().execute("SELECT COUNT(*) FROM job_items WHERE job_id = ?", (old_done,)).fetchone()[0] == 0
+    assert store.get(recent_done) is not None
+    assert store._connect().execute("SELECT status FROM jobs WHERE id = ?", (old_running,)).fetchone()[0] == JOB_RUNNING
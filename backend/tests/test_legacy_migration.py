@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import answer_store
+import sql_models
+from database import make_engine
+from session_entries import drop_duplicate_evaluations
+
+
+def _raw(question, answer, **extra):
+    return {"type": "raw", "question": question, "answer": answer, **extra}
+
+
+def _evaluated(question, answer, score, **extra):
+    return {"type": "evaluated", "question": question, "answer": answer, "score": score, "details": {}, **extra}
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'sessions.db'}")
+    sql_models.Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    engine.dispose()
+
+
+def _legacy_session(factory, results) -> int:
+    db = factory()
+    session = sql_models.InterviewSession(selected_domain="Data Science", difficulty_level="Easy", interview_results=results)
+    db.add(session)
+    db.commit()
+    session_id = session.id
+    db.close()
+    return session_id
+
+
+def test_duplicated_evaluations_migrate_as_one_linked_row_per_answer(session_factory):
+    # The old evaluate-all re-scored already evaluated answers: each run appended another entry
+    results = [
+        _raw("Q1", "first answer"),
+        _raw("Q2", "second answer"),
+        _evaluated("Q1", "first answer", 2.0),
+        _evaluated("Q2", "second answer", 4.0),
+        _evaluated("Q1", "first answer", 3.0),
+        _evaluated("Q2", "second answer", 4.0),
+        _evaluated("Q1", "first answer", 6.0),
+    ]
+    session_id = _legacy_session(session_factory, results)
+
+    assert answer_store.migrate_legacy_results(session_factory) == 1
+
+    db = session_factory()
+    answers = db.query(sql_models.Answer).filter_by(session_id=session_id).order_by(sql_models.Answer.id).all()
+    evaluations = db.query(sql_models.Evaluation).filter_by(session_id=session_id).all()
+    assert [a.state for a in answers] == ["evaluated", "evaluated"]
+    assert len(evaluations) == 2
+    by_answer = {e.answer_id: e.score for e in evaluations}
+    assert by_answer == {answers[0].id: 6.0, answers[1].id: 4.0}  # the latest evaluation of each
+
+    session = db.get(sql_models.InterviewSession, session_id)
+    assert (session.answer_count, session.evaluated_count) == (2, 2)
+    assert session.score_sum == pytest.approx(10.0)
+    assert session.average_score == pytest.approx(5.0)
+    assert session.interview_results is None
+    db.close()
+
+
+def test_repeated_answers_keep_one_evaluation_each():
+    results = [
+        _raw("Q", "same text"),
+        _raw("Q", "same text"),
+        _evaluated("Q", "same text", 1.0),
+        _evaluated("Q", "same text", 2.0),
+        _evaluated("Q", "same text", 3.0),
+        _evaluated("Standalone", "evaluate-answer result", 5.0),
+        _evaluated("Standalone", "evaluate-answer result", 7.0),
+    ]
+    assert drop_duplicate_evaluations(results) == 2
+    assert [e["score"] for e in results if e["type"] == "evaluated"] == [2.0, 3.0, 7.0]
+
+
+def test_id_linked_evaluations_win_over_stale_unlinked_copies():
+    results = [
+        _raw("Q", "text", id="a", state="evaluated"),
+        _evaluated("Q", "text", 1.0),
+        _evaluated("Q", "text", 2.0, raw_id="a"),
+        _evaluated("Q", "text", 3.0, raw_id="a"),
+    ]
+    assert drop_duplicate_evaluations(results) == 2
+    assert [(e["score"], e.get("raw_id")) for e in results if e["type"] == "evaluated"] == [(3.0, "a")]
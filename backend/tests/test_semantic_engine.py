@@ -0,0 +1,91 @@
+"""
+Loading the semantic model with the ONNX engines. The fake sentence_transformers
+module below writes files where the real library writes them, so the cache
+checks in _load_semantic_model are exercised as they run in production.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+import nlp_evaluation_engine as engine
+
+
+class _FakeSentenceTransformer:
+    loads = []
+
+    def __init__(self, name_or_path, backend="torch", model_kwargs=None):
+        self.path = Path(name_or_path)
+        self.backend = backend
+        self.model_kwargs = model_kwargs or {}
+        file_name = self.model_kwargs.get("file_name")
+        if file_name and not (self.path / file_name).exists():
+            raise FileNotFoundError(self.path / file_name)
+        _FakeSentenceTransformer.loads.append(self)
+
+    def save_pretrained(self, path):
+        target = Path(path) / "onnx" / "model.onnx"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(b"fp32")
+
+
+def _fake_quantize(model, quantization_config, model_name_or_path, push_to_hub=False, create_pr=False, file_suffix=None):
+    _fake_quantize.calls.append(quantization_config)
+    # Like sentence-transformers: the default suffix is the weight dtype (quint8 for avx2) + config
+    suffix = file_suffix or f"quint8_{quantization_config}"
+    (Path(model_name_or_path) / "onnx" / f"model_{suffix}.onnx").write_bytes(b"int8")
+
+
+@pytest.fixture
+def fake_sentence_transformers(monkeypatch, tmp_path):
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = _FakeSentenceTransformer
+    module.export_dynamic_quantized_onnx_model = _fake_quantize
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    monkeypatch.setitem(sys.modules, "onnxruntime", types.ModuleType("onnxruntime"))
+    monkeypatch.setattr(engine, "MODEL_CACHE_DIR", tmp_path)
+    _FakeSentenceTransformer.loads = []
+    _fake_quantize.calls = []
+    return module
+
+
+def test_onnx_engine_exports_once(fake_sentence_transformers):
+    first = engine._load_semantic_model("onnx")
+    second = engine._load_semantic_model("onnx")
+
+    assert (engine._onnx_export_dir() / "onnx" / "model.onnx").exists()
+    assert first.backend == second.backend == "onnx"
+    assert first.path == engine._onnx_export_dir()
+
+
+@pytest.mark.parametrize("config", ["avx2", "arm64"])
+def test_int8_engine_quantizes_once_and_loads_the_written_file(fake_sentence_transformers, monkeypatch, config):
+    monkeypatch.setattr(engine, "ONNX_QUANTIZATION_CONFIG", config)
+
+    model = engine._load_semantic_model("onnx-int8")
+    assert _fake_quantize.calls == [config]
+    file_name = model.model_kwargs["file_name"]
+    assert (engine._onnx_export_dir() / file_name).exists()
+
+    # A second start finds the quantized graph and loads it without quantizing again
+    again = engine._load_semantic_model("onnx-int8")
+    assert _fake_quantize.calls == [config]
+    assert again.model_kwargs["file_name"] == file_name
+
+
+def test_int8_engine_end_to_end_with_onnxruntime(tmp_path, monkeypatch):
+    pytest.importorskip("optimum.onnxruntime")
+    pytest.importorskip("sentence_transformers")
+    monkeypatch.setattr(engine, "MODEL_CACHE_DIR", tmp_path)
+
+    model = engine._load_semantic_model("onnx-int8")
+    quantized = engine._onnx_export_dir() / "onnx" / f"model_int8_{engine.ONNX_QUANTIZATION_CONFIG}.onnx"
+    assert quantized.exists()
+    written_at = quantized.stat().st_mtime_ns
+    engine._load_semantic_model("onnx-int8")
+    assert quantized.stat().st_mtime_ns == written_at
+
+    emb = model.encode(["A queue is first in, first out.", "A queue is FIFO."], normalize_embeddings=True)
+    assert float(emb[0] @ emb[1]) > 0.5
@@ -0,0 +1,129 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import BACKEND_DIR
+
+
+@pytest.fixture(scope="module")
+def main():
+    # Imported here, after conftest pointed DATABASE_URL at a scratch file
+    import main
+    import question_bank_handler
+
+    question_bank_handler.load_questions_from_file(BACKEND_DIR / "question_bank.json")
+    return main
+
+
+@pytest.fixture
+def client(main):
+    # No `with`: startup (model loading) is not needed by these endpoints
+    return TestClient(main.app)
+
+
+def _new_session(client, user_id="candidate", difficulty="Easy"):
+    r = client.post("/api/sessions", json={
+        "selected_domain": "Data Science",
+        "difficulty_level": difficulty,
+        "user_id": user_id,
+        "resume_analysis_result": {"filename": "cv.pdf", "top_domains": []},
+    })
+    assert r.status_code == 200
+    return r.json()["id"]
+
+
+def test_generate_questions_retries_a_lost_version_race(main, client, monkeypatch):
+    session_id = _new_session(client)
+    select_questions = main.select_questions
+    calls = []
+
+    def racing_select_questions(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            # Another request commits to the same session between our read and our write
+            db = main.SessionLocal()
+            try:
+                db.get(main.sql_models.InterviewSession, session_id).difficulty_level = "Medium"
+                db.commit()
+            finally:
+                db.close()
+        return select_questions(**kwargs)
+
+    monkeypatch.setattr(main, "select_questions", racing_select_questions)
+    r = client.post(f"/api/sessions/{session_id}/generate-questions")
+    assert r.status_code == 200
+
+    # Exactly one retry, and it re-read the row: the competing write is kept, not overwritten
+    assert len(calls) == 2
+    assert [c["difficulty"] for c in calls] == ["Easy", "Medium"]
+    db = main.SessionLocal()
+    try:
+        session = db.get(main.sql_models.InterviewSession, session_id)
+        assert session.difficulty_level == "Medium"
+        assert [q["question"] for q in session.generated_questions] == [q["question"] for q in r.json()["questions"]]
+        assert session.version == 3
+    finally:
+        db.close()
+
+
+def test_user_sessions_pages_through_equal_dates_without_gaps(main, client):
+    user_id = "same-second"
+    ids = [_new_session(client, user_id=user_id) for _ in range(7)]
+    same, earlier = datetime(2026, 5, 1, 9, 30, tzinfo=timezone.utc), datetime(2026, 4, 1, tzinfo=timezone.utc)
+    db = main.SessionLocal()
+    try:
+        for n, session_id in enumerate(ids):
+            db.get(main.sql_models.InterviewSession, session_id).session_date = earlier if n == 3 else same
+        db.commit()
+    finally:
+        db.close()
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get(f"/api/users/{user_id}/sessions", params=params).json()
+        seen += [s["session_id"] for s in page["sessions"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    newest_first = sorted((i for i in ids if i != ids[3]), reverse=True) + [ids[3]]
+    assert seen == newest_first
+
+
+def _add_evaluation(main, session_id, question):
+    db = main.SessionLocal()
+    try:
+        main.answer_store.add_evaluation(db, session_id, {
+            "type": "evaluated", "question": question, "answer": "An answer.", "score": 6.5,
+            "details": {"similarity": 0.7, "clarity": 0.6, "keyword_match": 0.5, "feedback": "Good."},
+        })
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_results_etag_holds_until_answers_or_evaluations_change(main, client):
+    session_id = _new_session(client)
+    _add_evaluation(main, session_id, "What is overfitting?")
+
+    first = client.get(f"/api/sessions/{session_id}/results")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    for _ in range(2):
+        r = client.get(f"/api/sessions/{session_id}/results", headers={"If-None-Match": etag})
+        assert r.status_code == 304 and r.headers["etag"] == etag
+
+    # A saved answer changes the results...
+    client.post(f"/api/sessions/{session_id}/save-answer", json={"question": "What is bias?", "answer": "Systematic error."})
+    r = client.get(f"/api/sessions/{session_id}/results", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["etag"] != etag
+    etag = r.headers["etag"]
+    assert client.get(f"/api/sessions/{session_id}/results", headers={"If-None-Match": etag}).status_code == 304
+
+    # ...and so does a new evaluation
+    _add_evaluation(main, session_id, "What is variance?")
+    r = client.get(f"/api/sessions/{session_id}/results", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["etag"] != etag
+    assert [e["question"] for e in r.json()["evaluations"]] == ["What is overfitting?", "What is variance?"]
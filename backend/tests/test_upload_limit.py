@@ -0,0 +1,78 @@
+import pytest
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from resume_extraction import MULTIPART_OVERHEAD, ResumeTooLarge, UploadSizeLimit, read_upload_limited
+
+MAX_BYTES = 1024
+BOUNDARY = "resume-boundary"
+
+
+def _multipart(payload: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="resume"; filename="cv.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + payload + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def _chunked(body: bytes, size: int = 4096):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.state.handled = 0
+
+    @app.post("/api/get-domains")
+    async def upload(resume: UploadFile = File(...)):
+        # Like main.get_domains_from_resume
+        app.state.handled += 1
+        try:
+            return {"size": len(await read_upload_limited(resume, MAX_BYTES))}
+        except ResumeTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+    app.add_middleware(UploadSizeLimit, paths=("/api/get-domains",), max_bytes=MAX_BYTES)
+    with TestClient(app) as c:
+        yield c
+
+
+def _post(client, body, **headers):
+    return client.post(
+        "/api/get-domains",
+        content=body,
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}", **headers},
+    )
+
+
+def test_chunked_upload_without_content_length_is_cut_off(client):
+    body = _multipart(b"x" * (MAX_BYTES + 2 * MULTIPART_OVERHEAD))
+    response = _post(client, _chunked(body))
+
+    assert response.request.headers.get("transfer-encoding") == "chunked"
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413
+    assert "upload limit" in response.json()["detail"]
+    assert client.app.state.handled == 0
+
+
+def test_declared_oversized_length_is_refused_before_reading(client):
+    response = _post(client, _multipart(b"x" * (MAX_BYTES + 2 * MULTIPART_OVERHEAD)))
+    assert response.status_code == 413
+    assert client.app.state.handled == 0
+
+
+def test_upload_within_the_limit_is_read(client):
+    response = _post(client, _chunked(_multipart(b"x" * MAX_BYTES), size=100))
+    assert response.status_code == 200
+    assert response.json() == {"size": MAX_BYTES}
+
+
+def test_file_part_over_the_limit_still_fails_in_the_handler(client):
+    # Within the body allowance (which includes multipart overhead), but the file itself is too big
+    response = _post(client, _multipart(b"x" * (MAX_BYTES + 10)))
+    assert client.app.state.handled == 1
+    assert response.status_code == 413